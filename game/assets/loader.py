@@ -0,0 +1,149 @@
+import sys
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+from game.assets.pack import open_pack, pack_path_for
+from game.attacks.registry import MIRROR_ATTACK_TYPES
+from game.utils import load_scaled
+
+
+def get_base_path():
+    """Resolve the correct base path for source runs and bundled executable runs."""
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS)
+    return Path(__file__).resolve().parent.parent.parent
+
+
+BASE_PATH = get_base_path()
+ASSET_PATH = BASE_PATH / "game" / "assets" / "images"
+PLAYER_ICON_SIZE = (26, 26)
+PEN_SIZE = (130, 130)
+
+# Every sprite the game draws: file, target size, and the attack (or UI element) that reads it.
+# Attack sprites are decoded lazily through LazyAssets; UI entries are loaded up front by game.main.
+ASSET_MANIFEST = {
+    "gun_img": {"file": "gun.png", "size": (110, 110), "owner": "GunAttack"},
+    "bullet_img": {"file": "bullet.png", "size": (20, 20), "owner": "GunAttack"},
+    "grenade_img": {"file": "grenade.png", "size": (42, 42), "owner": "GrenadeAttack"},
+    "explosion_img": {"file": "explosion.png", "size": (160, 160), "owner": "GrenadeAttack"},
+    "sword_img": {"file": "sword.png", "size": (80, 80), "owner": "SwordAttack"},
+    "slash_img": {"file": "slash.png", "size": (200, 30), "owner": "SwordAttack"},
+    "shotgun_img": {"file": "shotgun.png", "size": (150, 90), "owner": "ShotgunAttack"},
+    "mirror_img": {"file": "mirror.png", "size": (110, 110), "owner": "MirrorAttack"},
+    "sniper_img": {"file": "sniper.png", "size": (150, 85), "owner": "SniperAttack"},
+    "boomerang_img": {"file": "boomerang.png", "size": (95, 95), "owner": "BoomerangAttack"},
+    "shuriken_img": {"file": "shuriken.png", "size": (78, 78), "owner": "ShurikenAttack"},
+    "shuriken_projectile_img": {"file": "shuriken.png", "size": (62, 62), "owner": "ShurikenAttack"},
+    "stuff_img": {"file": "stuff.png", "size": (120, 120), "owner": "StuffAttack"},
+    "fireball_img": {"file": "fireball.png", "size": (54, 54), "owner": "StuffAttack"},
+    "pool_ball_img": {"file": "poolBall.png", "size": (42, 42), "owner": "PoolAttack"},
+    "pool_cue_img": {"file": "poolCue.png", "size": (124, 124), "owner": "PoolAttack"},
+    "checkbox_icon": {"file": "Checkbox.png", "size": PLAYER_ICON_SIZE, "owner": "ui"},
+    "checkbox_icon_1": {"file": "Checkbox1.png", "size": PLAYER_ICON_SIZE, "owner": "ui"},
+    "checkbox_icon_2": {"file": "Checkbox2.png", "size": PLAYER_ICON_SIZE, "owner": "ui"},
+    "checkbox_icon_3": {"file": "Checkbox3.png", "size": PLAYER_ICON_SIZE, "owner": "ui"},
+    "pen_img": {"file": "pen.png", "size": PEN_SIZE, "owner": "ui"},
+    "audio_icon": {"file": "audio.png", "size": (56, 56), "owner": "ui"},
+    "settings_icon": {"file": "settings.png", "size": (56, 56), "owner": "ui"},
+}
+
+
+def manifest_keys(owner=None, exclude_owner=None):
+    """Manifest keys in declaration order, optionally limited to one owner or excluding one."""
+    return [
+        key
+        for key, entry in ASSET_MANIFEST.items()
+        if (owner is None or entry["owner"] == owner) and entry["owner"] != exclude_owner
+    ]
+
+
+def load_image(file_name, size, asset_path=ASSET_PATH):
+    return load_scaled(str(asset_path / file_name), size)
+
+
+_open_packs = {}
+
+
+def get_pack(asset_path=ASSET_PATH):
+    """The pre-baked pack beside asset_path, opened once per process, or None when it has not been built."""
+    asset_path = Path(asset_path)
+    if asset_path not in _open_packs:
+        _open_packs[asset_path] = open_pack(pack_path_for(asset_path))
+    return _open_packs[asset_path]
+
+
+def load_asset(key, asset_path=ASSET_PATH):
+    """Return one manifest entry, from the pack when it holds a current copy, otherwise decoded and scaled."""
+    entry = ASSET_MANIFEST[key]
+    pack = get_pack(asset_path)
+    if pack is not None and pack.entry_matches(key, entry["size"], Path(asset_path) / entry["file"]):
+        return pack.surface(key)
+    return load_image(entry["file"], entry["size"], asset_path)
+
+
+class LazyAssets(Mapping):
+    """
+    Read-only mapping over manifest sprites that decodes each one the first time it is read.
+    warm() decodes pending sprites within a time budget, so idle frames can load ahead of the first run.
+    """
+
+    def __init__(self, keys, asset_path=ASSET_PATH, extras=None):
+        self.keys_in_order = list(keys)
+        self.asset_path = asset_path
+        # Static entries (such as the mirror's attack classes) are served as-is.
+        self.extras = dict(extras or {})
+        self.loaded = {}
+        self.decode_seconds = 0.0
+
+    def _load(self, key):
+        started = time.perf_counter()
+        surface = load_asset(key, self.asset_path)
+        self.decode_seconds += time.perf_counter() - started
+        self.loaded[key] = surface
+        return surface
+
+    def __getitem__(self, key):
+        surface = self.loaded.get(key)
+        if surface is not None:
+            return surface
+        if key in self.extras:
+            return self.extras[key]
+        if key not in ASSET_MANIFEST or key not in self.keys_in_order:
+            raise KeyError(key)
+        return self._load(key)
+
+    def __iter__(self):
+        yield from self.keys_in_order
+        yield from self.extras
+
+    def __len__(self):
+        return len(self.keys_in_order) + len(self.extras)
+
+    def pending(self):
+        return [key for key in self.keys_in_order if key not in self.loaded]
+
+    def warm(self, budget_seconds=0.004):
+        """Decode pending sprites until the budget is spent; returns True once everything is loaded."""
+        deadline = time.perf_counter() + budget_seconds
+        for key in self.pending():
+            self._load(key)
+            if time.perf_counter() >= deadline:
+                break
+        return not self.pending()
+
+    def load_all(self):
+        for key in self.pending():
+            self._load(key)
+
+    def stats(self):
+        return {"loaded": len(self.loaded), "total": len(self.keys_in_order), "decode_seconds": self.decode_seconds}
+
+
+def load_attack_assets(asset_path=ASSET_PATH):
+    """Lazy attack sprites plus the classes the mirror may re-cast."""
+    return LazyAssets(
+        manifest_keys(exclude_owner="ui"),
+        asset_path,
+        extras={"attack_classes": list(MIRROR_ATTACK_TYPES)},
+    )
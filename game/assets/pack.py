@@ -0,0 +1,168 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+PACK_MAGIC = b"UNCKPAK1"
+# Magic, then the byte length of the JSON index that follows it.
+PACK_HEADER = struct.Struct("<8sI")
+PACK_ALIGN = 16
+PACK_FILE = "sprites.pack"
+
+
+def pack_path_for(asset_path):
+    """The pack lives next to the images folder it was built from."""
+    return Path(asset_path).parent / PACK_FILE
+
+
+def source_signature(path):
+    """Size and mtime of a source PNG, so a pack entry can tell it has gone stale."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _align(offset):
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+
+
+def surface_entry(key, surface, signature):
+    """A write_pack entry holding a surface's pixels."""
+    return key, surface.get_size(), pygame.image.tobytes(surface, "RGBA"), signature
+
+
+def write_pack(path, entries):
+    """
+    Write a pack from (key, size, rgba_pixels, source_signature) entries.
+    Layout: header, JSON index, then each entry's RGBA pixels at a 16-byte aligned offset.
+    """
+    blobs = []
+    index = {}
+    offset = 0
+    for key, size, pixels, signature in entries:
+        offset = _align(offset)
+        index[key] = {"offset": offset, "size": list(size), "source": signature}
+        blobs.append((offset, pixels))
+        offset += len(pixels)
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    data_start = _align(PACK_HEADER.size + len(index_bytes))
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as handle:
+        handle.write(PACK_HEADER.pack(PACK_MAGIC, len(index_bytes)))
+        handle.write(index_bytes)
+        for blob_offset, pixels in blobs:
+            handle.seek(data_start + blob_offset)
+            handle.write(pixels)
+    os.replace(temp_path, path)
+    return data_start + offset
+
+
+class AssetPack:
+    """A memory-mapped pack; surfaces are views over its pixels, with no PNG decode or scaling."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self.map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(self.map, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self.map.madvise(mmap.MADV_SEQUENTIAL)
+
+        magic, index_length = PACK_HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC:
+            self.map.close()
+            raise ValueError(f"{self.path} is not an asset pack")
+        index_end = PACK_HEADER.size + index_length
+        self.index = json.loads(self.map[PACK_HEADER.size : index_end])
+        self.data_start = _align(index_end)
+        self.view = memoryview(self.map)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def entry_matches(self, key, size, source_path=None):
+        """True when the pack holds key at this size and, in a source checkout, its PNG has not changed since the build."""
+        entry = self.index.get(key)
+        if entry is None or tuple(entry["size"]) != tuple(size):
+            return False
+        # A frozen build's pack was made from the very PNGs bundled with it, and a one-file bundle unpacks
+        # them with fresh mtimes on every launch, so there the packed pixels are authoritative.
+        if source_path is None or getattr(sys, "frozen", False):
+            return True
+        # A missing source, as in a build that ships only the pack, also leaves the pack authoritative.
+        signature = source_signature(source_path)
+        return signature is None or signature == entry["source"]
+
+    def pixels(self, key):
+        """A read-only view of key's RGBA pixels inside the mapping."""
+        entry = self.index[key]
+        width, height = entry["size"]
+        start = self.data_start + entry["offset"]
+        return self.view[start : start + width * height * 4]
+
+    def surface(self, key):
+        width, height = self.index[key]["size"]
+        pixels = self.pixels(key)
+        surface = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+        if pygame.display.get_surface() is not None:
+            # Copies into the display's pixel format once; the mmap view itself stays read-only.
+            return surface.convert_alpha()
+        return surface.copy()
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+
+
+def open_pack(path):
+    """Open a pack if one exists and is readable, otherwise return None so callers fall back to PNGs."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    try:
+        return AssetPack(path)
+    except (OSError, ValueError, struct.error, json.JSONDecodeError):
+        return None
+
+
+def build_pack(asset_path, output=None):
+    """Decode and scale every manifest sprite once and write them to a pack."""
+    # Imported here because the loader itself opens packs through this module.
+    from game.assets.loader import ASSET_MANIFEST
+
+    output = Path(output) if output else pack_path_for(asset_path)
+    entries = []
+    for key, entry in ASSET_MANIFEST.items():
+        source = Path(asset_path) / entry["file"]
+        surface = pygame.transform.scale(pygame.image.load(str(source)), entry["size"])
+        entries.append(surface_entry(key, surface, source_signature(source)))
+    return output, write_pack(output, entries), len(entries)
+
+
+def main():
+    from game.assets.loader import ASSET_PATH
+
+    parser = argparse.ArgumentParser(description="Bake the scaled game sprites into one memory-mapped pack")
+    parser.add_argument("--asset-path", default=str(ASSET_PATH), help="folder holding the source PNGs")
+    parser.add_argument("--output", default=None, help=f"pack file to write (default: {PACK_FILE} beside the images)")
+    args = parser.parse_args()
+
+    pygame.init()
+    started = time.perf_counter()
+    output, size, count = build_pack(Path(args.asset_path), args.output)
+    print(f"wrote {count} sprites, {size / (1024 * 1024):.1f} MiB, to {output} in {time.perf_counter() - started:.2f}s")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
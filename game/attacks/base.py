@@ -1,29 +1,43 @@
 import math
-import pygame
 from game import utils
+from game.rng import UNSEEDED_RANDOM
+from game.timing import WALL_CLOCK
 
 
 class AttackBase:
-    """Base class for attacks. Subclass and implement update() and draw()."""
+    """Base class for attacks. Subclass and implement update() and draw(queue)."""
 
-    def __init__(self, pen_rect, player_rect, assets):
+    def __init__(self, pen_rect, player_rect, assets, clock=None, rng=None):
         self.pen_rect = pen_rect
         self.player_rect = player_rect
         self.assets = assets
+        # The run's SimClock drives lifetimes and pulses; spawned projectiles and attacks share it.
+        self.clock = clock or WALL_CLOCK
+        # The run's RunRandom; layouts draw from rng.gameplay, purely visual variation from rng.cosmetic.
+        self.rng = rng or UNSEEDED_RANDOM
         self.finished = False
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = self.clock.get_ticks()
 
     def update(self, dt, projectiles, player):
         """Override in subclasses; append spawned projectiles to projectiles."""
         return []
 
-    def draw(self, surface):
+    def draw(self, queue):
+        """Submit this attack's sprites and primitives to the frame's RenderQueue."""
         raise NotImplementedError
 
     def get_debug_hitboxes(self):
         """Return debug collision shapes for the current attack state."""
         return []
 
+    def get_collision_shapes(self):
+        """Return the shapes that can hurt the player this step, each tagged with a "key" for on_player_hit()."""
+        return []
+
+    def on_player_hit(self, key, player):
+        """Called by the collision stage when the shape tagged key touched the player."""
+        player.take_damage(self.damage)
+
     @staticmethod
     def angle_to(target_from, target_to):
         dx, dy, _ = utils.vector_to(target_from, target_to)
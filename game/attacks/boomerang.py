@@ -8,8 +8,8 @@ from game.attacks.base import AttackBase
 class BoomerangAttack(AttackBase):
     """A two-pass boomerang that launches, dives off-screen, then returns for one final upward pass."""
 
-    def __init__(self, pen_rect, player_rect, assets, damage=10):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, damage=10, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         # The boomerang starts exactly where the pen finished drawing it.
         self.position = pygame.Vector2(pen_rect.center)
@@ -107,13 +107,17 @@ class BoomerangAttack(AttackBase):
             return []
         return [{"type": "rect", "rect": hitbox, "label": "boomerang"}]
 
-    def _update_damage(self, dt, player):
-        """Deal damage once on body contact, then remove this boomerang."""
+    def get_collision_shapes(self):
         hitbox = self.get_hitbox()
-        if hitbox and hitbox.colliderect(player.get_hitbox()):
-            player.take_damage(self.damage)
-            self.visible = False
-            self.finished = True
+        if hitbox is None:
+            return []
+        return [{"type": "rect", "rect": hitbox, "key": "body"}]
+
+    def on_player_hit(self, key, player):
+        """Deal damage once on body contact, then remove this boomerang."""
+        player.take_damage(self.damage)
+        self.visible = False
+        self.finished = True
 
     def _start_downward_curve(self, player):
         """Switch from the opening straight line to the first limited-curvature chase leg."""
@@ -180,13 +184,12 @@ class BoomerangAttack(AttackBase):
             if self.position.y + self.rect.height * 0.5 < 0:
                 self.finished = True
 
-        self.image = pygame.transform.rotate(self.base_image, -self.rotation)
+        self.image = utils.get_rotated(self.base_image, -self.rotation)
         self.rect = self.image.get_rect(center=(int(self.position.x), int(self.position.y)))
-        self._update_damage(dt, player)
         return []
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Draw the rotating boomerang only while it is on-screen and active."""
         if self.finished or not self.visible:
             return
-        surface.blit(self.image, self.rect)
+        queue.submit(self.image, self.rect)
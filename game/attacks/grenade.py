@@ -1,5 +1,4 @@
 import math
-import random
 import pygame
 from game.attacks.base import AttackBase
 from game import utils
@@ -8,12 +7,12 @@ from game import utils
 class GrenadeAttack(AttackBase):
     """Grenade attack behavior with pulsing preview and timed explosion."""
 
-    def __init__(self, pen_rect, player_rect, assets, speed=520, explosion_radius=120, fuse_after_land=0.45):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, speed=520, explosion_radius=120, fuse_after_land=0.45, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
         self.grenade_img = assets["grenade_img"]
         scale = 1.2
         w, h = self.grenade_img.get_width(), self.grenade_img.get_height()
-        self.grenade_img = pygame.transform.scale(self.grenade_img, (int(w * scale), int(h * scale)))
+        self.grenade_img = utils.get_scaled(self.grenade_img, (int(w * scale), int(h * scale)))
         self.explosion_img = assets.get("explosion_img")
         self.spawn_x, self.spawn_y = self.pen_rect.center
         self.target = player_rect.center
@@ -24,9 +23,11 @@ class GrenadeAttack(AttackBase):
         self.vel_x = (dx / dist) * speed
         self.vel_y = (dy / dist) * speed
         self.angle = 0.0
-        self.rotation_speed = random.uniform(180.0, 360.0)
+        # Spin only changes the sprite, never the blast, so it comes from the cosmetic stream.
+        self.rotation_speed = self.rng.cosmetic.uniform(180.0, 360.0)
         self.rect = self.grenade_img.get_rect(center=(int(self.x), int(self.y)))
         self.landed = False
+        self.blast_pending = False
         self.explosion_radius = explosion_radius
         self.damage = 20
         self.preview_alpha = 90
@@ -38,6 +39,7 @@ class GrenadeAttack(AttackBase):
         if self.finished:
             return []
 
+        self.blast_pending = False
         if not self.landed:
             self.x += self.vel_x * dt
             self.y += self.vel_y * dt
@@ -46,7 +48,8 @@ class GrenadeAttack(AttackBase):
 
             if math.hypot(self.x - self.target[0], self.y - self.target[1]) < max(12, self.speed * dt):
                 self.landed = True
-                self.explode(player)
+                # The blast only counts on the step it lands; the collision stage picks it up next.
+                self.blast_pending = True
                 self.explosion_show_time = self.explosion_duration
         else:
             if self.explosion_show_time > 0:
@@ -62,11 +65,10 @@ class GrenadeAttack(AttackBase):
             self.preview_pulse_dir = 1
         return []
 
-    def explode(self, player):
-        dx = player.get_rect().centerx - self.target[0]
-        dy = player.get_rect().centery - self.target[1]
-        if math.hypot(dx, dy) <= self.explosion_radius:
-            player.take_damage(self.damage)
+    def get_collision_shapes(self):
+        if not self.blast_pending:
+            return []
+        return [{"type": "circle", "center": self.target, "radius": self.explosion_radius, "key": "blast"}]
 
     def get_debug_hitboxes(self):
         if self.finished:
@@ -80,23 +82,23 @@ class GrenadeAttack(AttackBase):
             }
         ]
 
-    def draw(self, surface):
+    def draw(self, queue):
         if not self.landed:
-            radius = int(self.explosion_radius * (0.9 + 0.15 * math.sin(pygame.time.get_ticks() / 200)))
+            radius = int(self.explosion_radius * (0.9 + 0.15 * math.sin(self.clock.get_ticks() / 200)))
             s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
             alpha = max(20, min(220, int(self.preview_alpha)))
             pygame.draw.circle(s, (200, 0, 0, alpha), (radius, radius), radius)
-            surface.blit(s, (self.target[0] - radius, self.target[1] - radius))
+            queue.submit(s, (self.target[0] - radius, self.target[1] - radius))
 
-        rotated = pygame.transform.rotate(self.grenade_img, self.angle)
+        rotated = utils.get_rotated(self.grenade_img, self.angle)
         rect = rotated.get_rect(center=self.rect.center)
-        surface.blit(rotated, rect)
+        queue.submit(rotated, rect)
 
         if self.landed and self.explosion_show_time > 0:
             if self.explosion_img:
-                ex = pygame.transform.scale(
+                ex = utils.get_scaled(
                     self.explosion_img,
                     (int(self.explosion_radius * 2) + 100, int(self.explosion_radius * 2) + 100),
                 )
                 rect = ex.get_rect(center=self.target)
-                surface.blit(ex, rect)
+                queue.submit(ex, rect)
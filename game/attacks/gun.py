@@ -5,8 +5,8 @@ from game.projectiles.bullet import BulletProjectile
 
 
 class GunAttack(AttackBase):
-    def __init__(self, pen_rect, player_rect, assets, shots=3, delay_seconds=0.35):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, shots=3, delay_seconds=0.35, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         self.fire_delay = delay_seconds
         self.cooldown = 0.0
@@ -35,9 +35,9 @@ class GunAttack(AttackBase):
         angle_deg = utils.angle_from_vector(dx, dy)
 
         screen_width = pygame.display.get_surface().get_width()
-        base_img = pygame.transform.flip(self.gun_orig, False, True) if self.spawn_pos[0] > screen_width / 2 else self.gun_orig
+        base_img = utils.get_flipped(self.gun_orig, False, True) if self.spawn_pos[0] > screen_width / 2 else self.gun_orig
 
-        self.gun_img = pygame.transform.rotate(base_img, -angle_deg)
+        self.gun_img = utils.get_rotated(base_img, -angle_deg)
         self.gun_rect = self.gun_img.get_rect(center=self.spawn_pos)
 
         if self.recoiling:
@@ -65,6 +65,7 @@ class GunAttack(AttackBase):
                 ndx,
                 ndy,
                 self.bullet_img,
+                clock=self.clock,
             )
             spawned.append(bullet)
 
@@ -78,5 +79,5 @@ class GunAttack(AttackBase):
 
         return spawned
 
-    def draw(self, surface):
-        surface.blit(self.gun_img, self.gun_rect)
+    def draw(self, queue):
+        queue.submit(self.gun_img, self.gun_rect)
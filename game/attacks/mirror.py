@@ -1,4 +1,3 @@
-import random
 import pygame
 from game.attacks.base import AttackBase
 
@@ -9,8 +8,8 @@ class MirrorAttack(AttackBase):
     Uses a simple square as its visual placeholder.
     """
 
-    def __init__(self, pen_rect, player_rect, assets, draw_delay=1.1):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, draw_delay=1.1, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
         # The mirror is larger than the other props and never rotates.
         self.image = assets["mirror_img"]
         self.rect = self.image.get_rect(center=pen_rect.center)
@@ -32,9 +31,9 @@ class MirrorAttack(AttackBase):
         while self.spawns_done < self.max_spawns and self.timer >= self.spawn_times[self.spawns_done]:
             if not self.attack_classes:
                 break
-            cls = random.choice(self.attack_classes)
+            cls = self.rng.gameplay.choice(self.attack_classes)
             try:
-                attack = cls(self.rect, player.get_rect(), self.assets)
+                attack = cls(self.rect, player.get_rect(), self.assets, clock=self.clock, rng=self.rng)
                 spawned.append(attack)
             except Exception:
                 pass
@@ -47,6 +46,6 @@ class MirrorAttack(AttackBase):
 
         return spawned
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Draw the non-rotating mirror sprite at the original pen location."""
-        surface.blit(self.image, self.rect)
+        queue.submit(self.image, self.rect)
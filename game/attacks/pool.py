@@ -9,8 +9,8 @@ from game.attacks.base import AttackBase
 class PoolAttack(AttackBase):
     """A pool cue lines up a shot, strikes a spinning ball, and lets it bounce three times."""
 
-    def __init__(self, pen_rect, player_rect, assets, damage=12):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, damage=12, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         self.origin = pygame.Vector2(pen_rect.center)
         self.ball_position = pygame.Vector2(pen_rect.center)
@@ -22,7 +22,7 @@ class PoolAttack(AttackBase):
         self.ball_radius = max(8, self.ball_img_raw.get_width() * 0.42)
 
         self.cue_img_raw = assets["pool_cue_img"]
-        self.cue_img_raw = pygame.transform.scale(
+        self.cue_img_raw = utils.get_scaled(
             self.cue_img_raw,
             (int(self.cue_img_raw.get_width() * 1.18), self.cue_img_raw.get_height()),
         )
@@ -134,10 +134,14 @@ class PoolAttack(AttackBase):
         if bounced:
             self.bounce_count += 1
 
-    def _update_ball_damage(self, player):
-        if self.get_hitbox().colliderect(player.get_hitbox()):
-            player.take_damage(self.damage)
-            self.finished = True
+    def get_collision_shapes(self):
+        if not self.launched or self.finished:
+            return []
+        return [{"type": "rect", "rect": self.get_hitbox(), "key": "ball"}]
+
+    def on_player_hit(self, key, player):
+        player.take_damage(self.damage)
+        self.finished = True
 
     def get_hitbox(self):
         rect = pygame.Rect(0, 0, int(self.ball_radius * 1.55), int(self.ball_radius * 1.55))
@@ -185,9 +189,8 @@ class PoolAttack(AttackBase):
         if self.entered_table:
             self._bounce_against_table()
 
-        self.ball_img = pygame.transform.rotate(self.ball_img_raw, -self.spin_angle)
+        self.ball_img = utils.get_rotated(self.ball_img_raw, -self.spin_angle)
         self.ball_rect = self.ball_img.get_rect(center=(int(self.ball_position.x), int(self.ball_position.y)))
-        self._update_ball_damage(player)
 
         screen_rect = pygame.display.get_surface().get_rect().inflate(180, 180)
         if not screen_rect.collidepoint(self.ball_position):
@@ -195,26 +198,26 @@ class PoolAttack(AttackBase):
 
         return []
 
-    def _draw_cue(self, surface):
+    def _draw_cue(self, queue):
         if self.launched and self.post_launch_timer > self.cue_linger_duration:
             return
 
         angle = self.fire_angle if self.aim_locked else self.current_angle
         cue_center = self._cue_center()
-        self.cue_img = pygame.transform.rotate(self.cue_img_raw, self.cue_source_angle - angle)
+        self.cue_img = utils.get_rotated(self.cue_img_raw, self.cue_source_angle - angle)
         self.cue_rect = self.cue_img.get_rect(center=(int(cue_center.x), int(cue_center.y)))
-        surface.blit(self.cue_img, self.cue_rect)
+        queue.submit(self.cue_img, self.cue_rect)
 
-    def _draw_ball(self, surface):
+    def _draw_ball(self, queue):
         if not self.launched:
             self.ball_rect = self.ball_img_raw.get_rect(center=(int(self.origin.x), int(self.origin.y)))
-            surface.blit(self.ball_img_raw, self.ball_rect)
+            queue.submit(self.ball_img_raw, self.ball_rect)
             return
-        surface.blit(self.ball_img, self.ball_rect)
+        queue.submit(self.ball_img, self.ball_rect)
 
-    def draw(self, surface):
+    def draw(self, queue):
         if self.finished:
             return
 
-        self._draw_cue(surface)
-        self._draw_ball(surface)
+        self._draw_cue(queue)
+        self._draw_ball(queue)
@@ -0,0 +1,17 @@
+from game.attacks.gun import GunAttack
+from game.attacks.grenade import GrenadeAttack
+from game.attacks.sword import SwordAttack
+from game.attacks.shotgun import ShotgunAttack
+from game.attacks.mirror import MirrorAttack
+from game.attacks.sniper import SniperAttack
+from game.attacks.boomerang import BoomerangAttack
+from game.attacks.shuriken import ShurikenAttack
+from game.attacks.stuff import StuffAttack
+from game.attacks.pool import PoolAttack
+
+
+ATTACK_TYPES = [GunAttack, GrenadeAttack, SwordAttack, ShotgunAttack, MirrorAttack, SniperAttack, BoomerangAttack, ShurikenAttack, StuffAttack, PoolAttack]
+# ATTACK_TYPES = [PoolAttack]
+
+# The mirror re-casts any attack except itself.
+MIRROR_ATTACK_TYPES = [GunAttack, GrenadeAttack, SwordAttack, ShotgunAttack, SniperAttack, BoomerangAttack, ShurikenAttack, StuffAttack, PoolAttack]
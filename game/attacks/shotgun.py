@@ -12,10 +12,10 @@ class ShotgunAttack(AttackBase):
     Wave 2: 6 projectiles, offset by +10° from the cone start.
     """
 
-    def __init__(self, pen_rect, player_rect, assets):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
         # The source shotgun art points left, so we flip it once to create a right-facing base for rotation.
-        self.gun_img_raw = pygame.transform.flip(assets["shotgun_img"], True, False)
+        self.gun_img_raw = utils.get_flipped(assets["shotgun_img"], True, False)
         self.projectile_img = assets["bullet_img"]
 
         # The shotgun remains anchored at the pen's draw position and only uses the initial player location to aim.
@@ -37,8 +37,8 @@ class ShotgunAttack(AttackBase):
         self.wave2_fired = False
         self.cleanup_time = 1.2
 
-        self.gun_img = pygame.transform.smoothscale(
-            self.gun_img_raw, (int(self.gun_img_raw.get_width() * 1.2), int(self.gun_img_raw.get_height() * 0.8))
+        self.gun_img = utils.get_scaled(
+            self.gun_img_raw, (int(self.gun_img_raw.get_width() * 1.2), int(self.gun_img_raw.get_height() * 0.8)), smooth=True
         )
 
     def _spawn_wave(self, start_angle, count, projectiles):
@@ -53,6 +53,7 @@ class ShotgunAttack(AttackBase):
                 dx,
                 dy,
                 self.projectile_img,
+                clock=self.clock,
             )
             projectiles.append(bullet)
 
@@ -78,9 +79,9 @@ class ShotgunAttack(AttackBase):
 
         return []
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Rotate the corrected base sprite so the muzzle faces the recorded target angle."""
         angle = -self.base_angle
-        img = pygame.transform.rotate(self.gun_img, angle)
+        img = utils.get_rotated(self.gun_img, angle)
         rect = img.get_rect(center=self.origin)
-        surface.blit(img, rect)
+        queue.submit(img, rect)
@@ -8,8 +8,8 @@ from game.projectiles.shuriken import ShurikenProjectile
 class ShurikenAttack(AttackBase):
     """A stationary spinning shuriken that charges, then launches three curved homing shurikens one second apart."""
 
-    def __init__(self, pen_rect, player_rect, assets):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         # The spawn point never moves with the pen after the attack is drawn.
         self.origin = pygame.Vector2(pen_rect.center)
@@ -47,6 +47,7 @@ class ShurikenAttack(AttackBase):
             direction.x,
             direction.y,
             self.projectile_image,
+            clock=self.clock,
         )
 
     def update(self, dt, projectiles, player):
@@ -60,7 +61,7 @@ class ShurikenAttack(AttackBase):
 
         self.spin_timer += dt
         self.spin_angle = (self.spin_angle + self.spin_speed * dt) % 360.0
-        self.image = pygame.transform.rotate(self.base_image, -self.spin_angle)
+        self.image = utils.get_rotated(self.base_image, -self.spin_angle)
         self.rect = self.image.get_rect(center=(int(self.origin.x), int(self.origin.y)))
 
         spawned = []
@@ -73,8 +74,8 @@ class ShurikenAttack(AttackBase):
 
         return spawned
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Draw the charging shuriken only while it is still waiting to launch its full set."""
         if self.finished:
             return
-        surface.blit(self.image, self.rect)
+        queue.submit(self.image, self.rect)
@@ -8,8 +8,8 @@ from game.attacks.base import AttackBase
 class SniperAttack(AttackBase):
     """A stationary sniper that tracks the player during a warning phase, then fires a sustained beam."""
 
-    def __init__(self, pen_rect, player_rect, assets, damage=7):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, damage=7, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         # The sniper always stays where the pen finished drawing this attack.
         self.origin = pygame.Vector2(pen_rect.center)
@@ -23,6 +23,7 @@ class SniperAttack(AttackBase):
         self.damage = damage
         self.damage_tick_interval = 0.15
         self.damage_tick_timer = 0.0
+        self.beam_live = False
 
         # Timings for the four-stage state machine: track, pause with locked aim, fire, then fade away.
         self.aim_duration = 2.0
@@ -83,29 +84,23 @@ class SniperAttack(AttackBase):
         _, end_point = min(candidates, key=lambda item: item[0])
         return end_point
 
-    def _player_touches_beam(self, player_rect):
-        """Test the actual muzzle-to-end beam segment against the player's hitbox with beam thickness."""
-        beam_start = self._get_muzzle_position(self.fire_angle)
-        hit_rect = player_rect.inflate(-8, -8)
-        clipped_segment = hit_rect.clipline(
-            (int(beam_start.x), int(beam_start.y)),
-            (int(self.fire_end.x), int(self.fire_end.y)),
-        )
-        if clipped_segment:
-            return True
-
-        # If the center line misses by less than half the beam width, still count it as a hit.
-        player_center = pygame.Vector2(hit_rect.center)
-        beam_vector = self.fire_end - beam_start
-        beam_length_sq = beam_vector.length_squared()
-        if beam_length_sq <= 1e-6:
-            return beam_start.distance_to(player_center) <= self.fire_width * 0.5
-
-        projection = (player_center - beam_start).dot(beam_vector) / beam_length_sq
-        projection = utils.clamp(projection, 0.0, 1.0)
-        closest_point = beam_start + beam_vector * projection
-        player_radius = max(hit_rect.width, hit_rect.height) * 0.35
-        return closest_point.distance_to(player_center) <= (self.fire_width * 0.5) + player_radius
+    def get_collision_shapes(self):
+        """Expose the fired beam only while a damage tick is due, so contact hurts in short pulses."""
+        if not self.beam_live:
+            return []
+        return [
+            {
+                "type": "line",
+                "start": self._get_muzzle_position(self.fire_angle),
+                "end": self.fire_end,
+                "width": self.fire_width,
+                "key": "beam",
+            }
+        ]
+
+    def on_player_hit(self, key, player):
+        player.take_damage(self.damage)
+        self.damage_tick_timer = self.damage_tick_interval
 
     def _lock_current_aim(self):
         """Freeze the tracked angle once and cache the full-screen beam endpoint."""
@@ -124,6 +119,7 @@ class SniperAttack(AttackBase):
             return []
 
         self.timer += dt
+        self.beam_live = False
         player_center = pygame.Vector2(player.get_rect().center)
         fire_start_time = self.aim_duration + self.lock_delay
         fire_end_time = fire_start_time + self.fire_duration
@@ -141,20 +137,18 @@ class SniperAttack(AttackBase):
 
             if fire_start_time <= self.timer <= fire_end_time:
                 self.damage_tick_timer -= dt
-                if self.damage_tick_timer <= 0.0 and self._player_touches_beam(player.get_rect()):
-                    player.take_damage(self.damage)
-                    self.damage_tick_timer = self.damage_tick_interval
+                self.beam_live = self.damage_tick_timer <= 0.0
 
             if self.timer >= fade_end_time:
                 self.finished = True
 
         # The sprite rotation always matches the live aim during warning, then the frozen fire angle afterwards.
         sprite_angle = self.current_angle if self.timer < self.aim_duration else self.fire_angle
-        self.sniper_img = pygame.transform.rotate(self.sniper_img_raw, -sprite_angle)
+        self.sniper_img = utils.get_rotated(self.sniper_img_raw, -sprite_angle)
         self.sniper_rect = self.sniper_img.get_rect(center=(int(self.origin.x), int(self.origin.y)))
         return []
 
-    def _draw_warning_line(self, surface):
+    def _draw_warning_line(self, queue):
         """Draw the thin telegraph from the sniper muzzle to the player's current position."""
         progress = utils.clamp(self.timer / self.aim_duration, 0.0, 1.0)
         start = self._get_muzzle_position(self.current_angle)
@@ -162,9 +156,9 @@ class SniperAttack(AttackBase):
         red = int(utils.lerp(255, 255, progress))
         green = int(utils.lerp(255, 120, progress))
         blue = int(utils.lerp(255, 145, progress))
-        pygame.draw.line(surface, (red, green, blue), start, end, self.warning_width)
+        queue.submit_call(pygame.draw.line, (red, green, blue), start, end, self.warning_width)
 
-    def _draw_fire_line(self, surface):
+    def _draw_fire_line(self, queue):
         """Draw the fired beam as a single dark red line that thins out during the fade stage."""
         fire_start_time = self.aim_duration + self.lock_delay
         elapsed_fire = self.timer - fire_start_time
@@ -174,7 +168,7 @@ class SniperAttack(AttackBase):
         beam_width = max(1, int(self.fire_width * 2 * shrink))
         start = self._get_muzzle_position(self.fire_angle)
 
-        pygame.draw.line(surface, (140, 18, 18), start, self.fire_end, beam_width)
+        queue.submit_call(pygame.draw.line, (140, 18, 18), start, self.fire_end, beam_width)
 
     def get_debug_hitboxes(self):
         if self.finished:
@@ -205,14 +199,14 @@ class SniperAttack(AttackBase):
 
         return []
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Render the sprite and whichever line phase is currently active."""
         if self.finished:
             return
 
         if self.timer < self.aim_duration:
-            self._draw_warning_line(surface)
+            self._draw_warning_line(queue)
         elif self.timer >= self.aim_duration + self.lock_delay:
-            self._draw_fire_line(surface)
+            self._draw_fire_line(queue)
 
-        surface.blit(self.sniper_img, self.sniper_rect)
+        queue.submit(self.sniper_img, self.sniper_rect)
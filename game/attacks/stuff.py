@@ -8,8 +8,8 @@ from game.attacks.base import AttackBase
 class StuffAttack(AttackBase):
     """A magic staff that sweeps toward the player, then sustains a rotating arc of expanding fireballs."""
 
-    def __init__(self, pen_rect, player_rect, assets, damage=10):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, damage=10, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
 
         # The staff remains at the pen's draw position for the entire attack.
         self.origin = pygame.Vector2(pen_rect.center)
@@ -102,7 +102,7 @@ class StuffAttack(AttackBase):
 
         # The source art's bottom-right direction is used as the forward-facing side for the tangent direction.
         source_angle = 315.0
-        return pygame.transform.rotate(self.fireball_img_raw, -(tangent_angle - source_angle))
+        return utils.get_rotated(self.fireball_img_raw, -(tangent_angle - source_angle))
 
     def _fireball_rect(self, index, elapsed_pattern):
         fireball_pos = self._fireball_position(index, elapsed_pattern)
@@ -133,16 +133,21 @@ class StuffAttack(AttackBase):
             )
         return hitboxes
 
-    def _update_damage(self, dt, player, elapsed_pattern):
-        """Apply contact damage, removing only the fireball that connected."""
-        player_hitbox = player.get_hitbox()
-        for index in range(self.fireball_count):
-            if not self.fireball_active[index]:
-                continue
+    def get_collision_shapes(self):
+        if not self.pattern_started or self.finished:
+            return []
+
+        elapsed_pattern = self.timer - self.windup_duration
+        return [
+            {"type": "rect", "rect": self._fireball_hitbox(index, elapsed_pattern), "key": index}
+            for index in range(self.fireball_count)
+            if self.fireball_active[index]
+        ]
 
-            if self._fireball_hitbox(index, elapsed_pattern).colliderect(player_hitbox):
-                player.take_damage(self.damage)
-                self.fireball_active[index] = False
+    def on_player_hit(self, key, player):
+        """Apply contact damage, removing only the fireball that connected."""
+        player.take_damage(self.damage)
+        self.fireball_active[key] = False
 
     def update(self, dt, projectiles, player):
         """Sweep the staff first, then lock into the rotating expanding fireball pattern."""
@@ -168,23 +173,22 @@ class StuffAttack(AttackBase):
                 expand_progress,
             )
             self.current_angle = self._vector_angle(self.pattern_direction)
-            self._update_damage(dt, player, elapsed_pattern)
 
             screen_rect = pygame.display.get_surface().get_rect()
             if self.orbit_center.y - self.fireball_radius > screen_rect.bottom:
                 self.finished = True
 
         # The staff image points upward, so subtract 90 degrees from the mathematical facing angle.
-        self.staff_img = pygame.transform.rotate(self.staff_img_raw, -(self.current_angle + 90.0))
+        self.staff_img = utils.get_rotated(self.staff_img_raw, -(self.current_angle + 90.0))
         self.staff_rect = self.staff_img.get_rect(center=(int(self.origin.x), int(self.origin.y)))
         return []
 
-    def draw(self, surface):
+    def draw(self, queue):
         """Draw the staff and, once active, the rotating expanding fireball arc."""
         if self.finished:
             return
 
-        surface.blit(self.staff_img, self.staff_rect)
+        queue.submit(self.staff_img, self.staff_rect)
 
         if not self.pattern_started:
             return
@@ -196,4 +200,4 @@ class StuffAttack(AttackBase):
             fireball_pos = self._fireball_position(index, elapsed_pattern)
             fireball_img = self._fireball_image(index, elapsed_pattern)
             fireball_rect = fireball_img.get_rect(center=(int(fireball_pos.x), int(fireball_pos.y)))
-            surface.blit(fireball_img, fireball_rect)
+            queue.submit(fireball_img, fireball_rect)
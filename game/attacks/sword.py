@@ -1,5 +1,4 @@
 import math
-import random
 import pygame
 from game.attacks.base import AttackBase
 from game import utils
@@ -13,8 +12,8 @@ class SwordAttack(AttackBase):
     - Red pulsing preview lines for ~2.5s, then the sword stabs along the line and disappears.
     """
 
-    def __init__(self, pen_rect, player_rect, assets, damage=15):
-        super().__init__(pen_rect, player_rect, assets)
+    def __init__(self, pen_rect, player_rect, assets, damage=15, clock=None, rng=None):
+        super().__init__(pen_rect, player_rect, assets, clock=clock, rng=rng)
         self.sword_img = assets["sword_img"]
         self.damage = damage
 
@@ -47,6 +46,7 @@ class SwordAttack(AttackBase):
             "angle": angle_deg,
             "timer": 0.0,
             "hit": False,
+            "striking": False,
             "preview_offset": preview_offset,
             "sword_pos": None,
         }
@@ -55,11 +55,12 @@ class SwordAttack(AttackBase):
         center = pygame.Vector2(player_rect.center)
         radius = 150
 
+        rng = self.rng.gameplay
         for _ in range(2):
-            offset_dir = pygame.Vector2(random.uniform(50, radius), 0).rotate(random.uniform(0, 360))
+            offset_dir = pygame.Vector2(rng.uniform(50, radius), 0).rotate(rng.uniform(0, 360))
             pos = center + offset_dir
-            angle = random.uniform(-130, 130)
-            jitter = random.uniform(-0.1, 0.1)
+            angle = rng.uniform(-130, 130)
+            jitter = rng.uniform(-0.1, 0.1)
             self.slashes.append(self._make_slash(pos, angle, jitter))
 
         for angle in (45, -45):
@@ -83,14 +84,12 @@ class SwordAttack(AttackBase):
 
         for slash in self.slashes:
             slash["timer"] += dt
+            slash["striking"] = False
             t = slash["timer"] - slash["preview_offset"]
 
-            # strike moment
+            # strike moment: each slash is live for exactly one collision pass
             if self.preview_time <= t < self.preview_time + self.strike_time and not slash["hit"]:
-                center = slash["center"]
-                ang = slash["angle"]
-                if utils.swing_hits_rect(center, ang, self.slash_length, self.slash_half_width, player.get_hitbox()):
-                    player.take_damage(self.damage)
+                slash["striking"] = True
                 slash["hit"] = True
 
             # sword position during strike
@@ -109,6 +108,22 @@ class SwordAttack(AttackBase):
 
         return []
 
+    def get_collision_shapes(self):
+        if self.finished:
+            return []
+        return [
+            {
+                "type": "swing",
+                "center": slash["center"],
+                "angle": slash["angle"],
+                "length": self.slash_length,
+                "half_width": self.slash_half_width,
+                "key": index,
+            }
+            for index, slash in enumerate(self.slashes)
+            if slash["striking"]
+        ]
+
     def get_debug_hitboxes(self):
         if self.finished or self.sword_visible:
             return []
@@ -128,24 +143,24 @@ class SwordAttack(AttackBase):
                 )
         return hitboxes
 
-    def draw(self, surface):
+    def draw(self, queue):
         if self.finished:
             return
 
         if self.sword_visible:
             origin_rect = self.sword_img.get_rect(center=self.sword_origin)
-            surface.blit(self.sword_img, origin_rect)
+            queue.submit(self.sword_img, origin_rect)
 
         for slash in self.slashes:
             t = slash["timer"] - slash["preview_offset"]
 
             # preview line pulse
             if t < self.preview_time and not self.sword_visible:
-                alpha = int(130 + 90 * (0.5 + 0.5 * math.sin(pygame.time.get_ticks() * 0.008)))
+                alpha = int(130 + 90 * (0.5 + 0.5 * math.sin(self.clock.get_ticks() * 0.008)))
                 start = slash["start"]
                 end = slash["end"]
-                pygame.draw.line(surface, (220, 40, 40, alpha), start, end, int(self.preview_thickness))
-                pygame.draw.line(surface, (255, 90, 90, alpha), start, end, max(2, int(self.preview_thickness * 0.45)))
+                queue.submit_call(pygame.draw.line, (220, 40, 40, alpha), start, end, int(self.preview_thickness))
+                queue.submit_call(pygame.draw.line, (255, 90, 90, alpha), start, end, max(2, int(self.preview_thickness * 0.45)))
 
             # sword during strike only
             if self.preview_time <= t < self.preview_time + self.strike_time:
@@ -153,7 +168,7 @@ class SwordAttack(AttackBase):
                 if pos is None:
                     continue
                 angle = -slash["angle"]
-                img = pygame.transform.rotate(self.sword_img, angle)
+                img = utils.get_rotated(self.sword_img, angle)
                 render_pos = pygame.Vector2(pos)
                 rect = img.get_rect(center=(int(render_pos.x), int(render_pos.y)))
-                surface.blit(img, rect)
+                queue.submit(img, rect)
@@ -0,0 +1,267 @@
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from game.attacks.registry import ATTACK_TYPES
+from game.replay import new_run_seed
+from game.sim import PLAYER_INPUTS, HeadlessGame
+from game.timing import SIM_HZ
+
+# Pen fields a sweep may override; each is a float read every tick, so setting it on a fresh run is enough.
+PEN_SWEEP_FIELDS = ("base_speed", "max_speed", "time_to_max_speed", "draw_duration")
+# Damage columns, one per attack class; anything else that hurts the player lands in damage_other.
+DAMAGE_SOURCES = tuple(cls.__name__ for cls in ATTACK_TYPES)
+RESULT_COLUMNS = (
+    "run",
+    "seed",
+    "player",
+    *PEN_SWEEP_FIELDS,
+    "time",
+    "died",
+    "attacks",
+    "ticks",
+    "peak_projectiles",
+    "peak_attacks",
+    *(f"damage_{source}" for source in DAMAGE_SOURCES),
+    "damage_other",
+)
+# Runs queued per worker, so results stream back steadily without queueing the whole batch at once.
+JOBS_PER_WORKER = 4
+
+# Each worker process builds one headless game in init_worker and reuses it for every run it is given.
+_game = None
+
+
+def init_worker(size, sim_hz):
+    global _game
+    _game = HeadlessGame(size, sim_hz)
+
+
+def worker_game():
+    """The headless game of the current worker process, for job functions run through run_batch."""
+    return _game
+
+
+def run_job(job):
+    """Play one seeded run in a worker and return its result row."""
+    run_state = _game.new_run(job["seed"])
+    pen = run_state["pen"]
+    for name, value in job["pen"].items():
+        setattr(pen, name, value)
+    player_input = PLAYER_INPUTS[job["player"]](job["seed"], _game.area_rect)
+    _game.play(player_input, job["seconds"], run_state)
+
+    damage = dict.fromkeys(DAMAGE_SOURCES, 0)
+    other = 0
+    for source, amount in run_state["collisions"].damage_by_source.items():
+        if source in damage:
+            damage[source] += amount
+        else:
+            other += amount
+    row = {
+        "run": job["run"],
+        "seed": job["seed"],
+        "player": job["player"],
+        **{name: getattr(pen, name) for name in PEN_SWEEP_FIELDS},
+        "time": run_state["elapsed_time"],
+        "died": not run_state["player"].alive,
+        "attacks": run_state["attack_count"],
+        "ticks": run_state["ticks"],
+        "peak_projectiles": run_state["projectiles"].peak,
+        "peak_attacks": run_state["active_attacks"].peak,
+        "damage_other": other,
+    }
+    row.update((f"damage_{source}", amount) for source, amount in damage.items())
+    return row
+
+
+def parse_sweep(text):
+    """("time_to_max_speed", [60.0, 120.0]) from "time_to_max_speed=60,120"; raises ValueError otherwise."""
+    name, _, values = text.partition("=")
+    name = name.strip()
+    if name not in PEN_SWEEP_FIELDS:
+        raise ValueError(f"can only sweep {', '.join(PEN_SWEEP_FIELDS)}, not {name!r}")
+    parsed = [float(value) for value in values.split(",") if value.strip()]
+    if not parsed:
+        raise ValueError(f"no values given for {name}")
+    return name, parsed
+
+
+def make_jobs(settings):
+    """
+    One job per seed and sweep combination. Every combination plays the same seeds, so differences
+    between them come from the swept values rather than from the luck of the draw.
+    """
+    run_seeds = random.Random(settings["seed"])
+    seeds = [run_seeds.getrandbits(63) for _ in range(settings["runs"])]
+    names = [name for name, _ in settings["sweep"]]
+    combinations = list(itertools.product(*(values for _, values in settings["sweep"])))
+    index = 0
+    for combination in combinations:
+        for seed in seeds:
+            yield {
+                "run": index,
+                "seed": seed,
+                "player": settings["player"],
+                "seconds": settings["seconds"],
+                "pen": dict(zip(names, combination)),
+            }
+            index += 1
+
+
+def run_batch(settings, on_result, job_function=run_job, job_options=None):
+    """
+    Fan the batch out over worker processes, calling on_result(result) in the parent as each run finishes.
+    job_function(job) plays one run in a worker; it must be a module-level function so it can be pickled.
+    job_options are added to every job dict.
+    """
+    workers = settings["workers"]
+    jobs = ({**job, **(job_options or {})} for job in make_jobs(settings))
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(settings["size"], settings["sim_hz"])) as executor:
+        pending = {executor.submit(job_function, job) for job in itertools.islice(jobs, workers * JOBS_PER_WORKER)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                on_result(future.result())
+            pending.update(executor.submit(job_function, job) for job in itertools.islice(jobs, len(done)))
+
+
+class CsvSink:
+    """Writes each row as it arrives, so a batch stopped overnight keeps everything finished so far."""
+
+    def __init__(self, path):
+        self.handle = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.handle, RESULT_COLUMNS)
+        self.writer.writeheader()
+
+    def add(self, row):
+        self.writer.writerow(row)
+        self.handle.flush()
+
+    def close(self):
+        self.handle.close()
+
+
+class NpzSink:
+    """Collects rows into one NumPy array per column and saves them, sorted by run, as a compressed .npz."""
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = {name: [] for name in RESULT_COLUMNS}
+
+    def add(self, row):
+        for name, column in self.columns.items():
+            column.append(row[name])
+
+    def close(self):
+        order = np.argsort(self.columns["run"], kind="stable")
+        arrays = {name: np.asarray(column)[order] for name, column in self.columns.items()}
+        np.savez_compressed(self.path, **arrays)
+
+
+class Summary:
+    """Per-combination totals for the report printed at the end."""
+
+    def __init__(self):
+        self.groups = {}
+        self.runs = 0
+
+    def add(self, row):
+        key = tuple(row[name] for name in PEN_SWEEP_FIELDS)
+        group = self.groups.setdefault(key, {"runs": 0, "deaths": 0, "time": 0.0, "attacks": 0, "peak_projectiles": 0})
+        group["runs"] += 1
+        group["deaths"] += row["died"]
+        group["time"] += row["time"]
+        group["attacks"] += row["attacks"]
+        group["peak_projectiles"] = max(group["peak_projectiles"], row["peak_projectiles"])
+        self.runs += 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Play many seeded headless runs across CPU cores and collect per-run results")
+    parser.add_argument("--runs", type=int, default=100, help="seeded runs per sweep combination")
+    parser.add_argument("--player", choices=sorted(PLAYER_INPUTS), default="dodge", help="scripted or bot player")
+    parser.add_argument("--seconds", type=float, default=300.0, help="longest gameplay time a run may last")
+    parser.add_argument("--seed", type=int, default=None, help="seed the run seeds are drawn from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per core)")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="FIELD=V1,V2",
+        help=f"play every run once per value of a pen field ({', '.join(PEN_SWEEP_FIELDS)}); repeat to sweep a grid",
+    )
+    parser.add_argument("--out", metavar="PATH", help="per-run results: .csv streams rows, .npz saves NumPy columns")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="fixed gameplay simulation rate")
+    parser.add_argument("--width", type=int, default=1280, help="virtual screen width")
+    parser.add_argument("--height", type=int, default=850, help="virtual screen height")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        sweep = [parse_sweep(text) for text in args.sweep]
+    except ValueError as error:
+        raise SystemExit(f"--sweep: {error}")
+    settings = {
+        "runs": max(1, args.runs),
+        "player": args.player,
+        "seconds": args.seconds,
+        "seed": new_run_seed() if args.seed is None else args.seed,
+        "workers": max(1, args.workers),
+        "sweep": sweep,
+        "size": (args.width, args.height),
+        "sim_hz": max(1, args.sim_hz),
+    }
+    sinks = [Summary()]
+    if args.out:
+        suffix = Path(args.out).suffix.lower()
+        if suffix not in (".csv", ".npz"):
+            raise SystemExit("--out must end in .csv or .npz")
+        sinks.append(CsvSink(args.out) if suffix == ".csv" else NpzSink(args.out))
+    summary = sinks[0]
+    total = settings["runs"] * int(np.prod([len(values) for _, values in sweep]))
+    print(f"seed: {settings['seed']}  runs: {total}  workers: {settings['workers']}")
+
+    started = time.perf_counter()
+
+    def on_result(row):
+        for sink in sinks:
+            sink.add(row)
+        if summary.runs % 100 == 0 or summary.runs == total:
+            elapsed = time.perf_counter() - started
+            print(f"\r{summary.runs}/{total} runs  {summary.runs / max(elapsed, 1e-9):.1f} runs/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        run_batch(settings, on_result)
+    finally:
+        for sink in sinks[1:]:
+            sink.close()
+    wall = time.perf_counter() - started
+    print(file=sys.stderr)
+
+    names = [name for name, _ in sweep]
+    for key, group in sorted(summary.groups.items()):
+        label = "  ".join(f"{name}={value:g}" for name, value in zip(PEN_SWEEP_FIELDS, key) if name in names) or "defaults"
+        runs = group["runs"]
+        print(
+            f"{label}: {runs} runs  deaths {group['deaths']}  mean time {group['time'] / runs:.1f}s  "
+            f"mean attacks {group['attacks'] / runs:.1f}  peak projectiles {group['peak_projectiles']}"
+        )
+    print(f"wall: {wall:.1f}s  {summary.runs / max(wall, 1e-9):.1f} runs/s")
+    if args.out:
+        print(f"wrote {summary.runs} runs to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import io
+import pickle
+import zlib
+from bisect import bisect_right
+
+import pygame
+
+from game.simulation import RUN_STATE_KEYS
+
+# Seconds of gameplay between checkpoints; a seek never re-simulates more than this.
+CHECKPOINT_INTERVAL = 5.0
+# Compressed bytes all of a replay's checkpoints may use before every other one is dropped.
+CHECKPOINT_BUDGET = 16 * 1024 * 1024
+
+
+class _WorldPickler(pickle.Pickler):
+    """Pickles a run's world, leaving sprites and shared objects out as references to the live objects."""
+
+    def __init__(self, file, external, shared):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.external = external
+        self.shared = {id(obj) for obj in shared}
+        self.indices = {}
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, pygame.Surface) and id(obj) not in self.shared:
+            return None
+        index = self.indices.get(id(obj))
+        if index is None:
+            index = self.indices[id(obj)] = len(self.external)
+            self.external.append(obj)
+        return index
+
+
+class _WorldUnpickler(pickle.Unpickler):
+    def __init__(self, file, external):
+        super().__init__(file)
+        self.external = external
+
+    def persistent_load(self, index):
+        return self.external[index]
+
+
+class Checkpoint:
+    """The world at one tick: compressed pickle bytes plus the sprites and shared objects they point at."""
+
+    __slots__ = ("tick", "data", "external")
+
+    def __init__(self, tick, data, external):
+        self.tick = tick
+        self.data = data
+        self.external = external
+
+    @property
+    def size(self):
+        # Referenced sprites are shared with the live game, so only the references are charged.
+        return len(self.data) + 8 * len(self.external)
+
+
+def capture(run_state, shared=()):
+    """
+    Checkpoint the gameplay part of a run: player, pen, clock, random streams, attacks with their
+    timers and phases, projectiles and collision state. Surfaces are never copied.
+    """
+    external = []
+    buffer = io.BytesIO()
+    _WorldPickler(buffer, external, shared).dump({key: run_state[key] for key in RUN_STATE_KEYS})
+    return Checkpoint(run_state["ticks"], zlib.compress(buffer.getvalue(), 6), external)
+
+
+def restore(run_state, checkpoint):
+    """Put a run back the way it was at the checkpoint; keys outside the simulation are left alone."""
+    buffer = io.BytesIO(zlib.decompress(checkpoint.data))
+    run_state.update(_WorldUnpickler(buffer, checkpoint.external).load())
+
+
+class CheckpointStore:
+    """
+    Checkpoints of one run in tick order, one every interval ticks starting at tick 0.
+    When they outgrow the budget every other one is dropped and the interval doubles, so a long
+    recording keeps evenly spaced checkpoints and seeks get slower instead of memory growing.
+    """
+
+    def __init__(self, interval, budget=CHECKPOINT_BUDGET, shared=()):
+        self.interval = max(1, interval)
+        self.budget = budget
+        self.shared = tuple(shared)
+        self.ticks = []
+        self.checkpoints = []
+        self.size = 0
+
+    def __len__(self):
+        return len(self.checkpoints)
+
+    def due(self, tick):
+        """True when tick should be checkpointed and is past everything stored so far."""
+        return tick % self.interval == 0 and (not self.ticks or tick > self.ticks[-1])
+
+    def add(self, run_state):
+        checkpoint = capture(run_state, self.shared)
+        self.ticks.append(checkpoint.tick)
+        self.checkpoints.append(checkpoint)
+        self.size += checkpoint.size
+        while self.size > self.budget and len(self.checkpoints) > 1:
+            self._thin()
+        return checkpoint
+
+    def _thin(self):
+        # Ticks 0, 2i, 4i... are exactly the multiples of the doubled interval.
+        self.checkpoints = self.checkpoints[::2]
+        self.ticks = [checkpoint.tick for checkpoint in self.checkpoints]
+        self.size = sum(checkpoint.size for checkpoint in self.checkpoints)
+        self.interval *= 2
+
+    def nearest(self, tick):
+        """The latest checkpoint at or before tick, or None."""
+        index = bisect_right(self.ticks, tick) - 1
+        return self.checkpoints[index] if index >= 0 else None
@@ -0,0 +1,158 @@
+import math
+import time
+
+import pygame
+
+from game import utils
+
+
+def shape_bounds(shape):
+    """Axis-aligned bounds of a collision shape, used to bucket it into the broad-phase grid."""
+    kind = shape["type"]
+    if kind == "rect":
+        return pygame.Rect(shape["rect"])
+    if kind == "circle":
+        cx, cy = shape["center"]
+        radius = shape["radius"]
+        return pygame.Rect(int(cx - radius), int(cy - radius), int(radius * 2) + 1, int(radius * 2) + 1)
+    if kind == "line":
+        (x1, y1), (x2, y2) = shape["start"], shape["end"]
+        pad = shape.get("width", 1) * 0.5 + 1
+        left, top = min(x1, x2) - pad, min(y1, y2) - pad
+        return pygame.Rect(int(left), int(top), int(abs(x2 - x1) + pad * 2) + 1, int(abs(y2 - y1) + pad * 2) + 1)
+    if kind == "swing":
+        reach = shape["length"] * 0.5 + shape["half_width"]
+        cx, cy = shape["center"]
+        return pygame.Rect(int(cx - reach), int(cy - reach), int(reach * 2) + 1, int(reach * 2) + 1)
+    raise ValueError(f"unknown collision shape {kind!r}")
+
+
+def shape_hits(shape, hitbox):
+    """Exact test of one shape against the player's hitbox."""
+    kind = shape["type"]
+    if kind == "rect":
+        return hitbox.colliderect(shape["rect"])
+    if kind == "circle":
+        # Blasts land on the player's center rather than any corner of the box.
+        cx, cy = shape["center"]
+        return math.hypot(hitbox.centerx - cx, hitbox.centery - cy) <= shape["radius"]
+    if kind == "line":
+        return utils.segment_hits_rect(shape["start"], shape["end"], shape.get("width", 1), hitbox)
+    if kind == "swing":
+        return utils.swing_hits_rect(shape["center"], shape["angle"], shape["length"], shape["half_width"], hitbox)
+    raise ValueError(f"unknown collision shape {kind!r}")
+
+
+class UniformGrid:
+    """
+    Buckets shapes by the fixed-size cells their bounds touch.
+    When a focus rect is set, only cells that rect can query are stored, so shapes far from it cost one
+    bounds check instead of a bucket insert.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.focus = None
+
+    def clear(self, focus=None):
+        self.cells.clear()
+        self.focus = self.cell_bounds(focus) if focus is not None else None
+
+    def cell_bounds(self, rect):
+        """Inclusive (left, top, right, bottom) cell coordinates covered by rect."""
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def _cell_range(self, rect):
+        left, top, right, bottom = self.cell_bounds(rect)
+        if self.focus is not None:
+            f_left, f_top, f_right, f_bottom = self.focus
+            left, top = max(left, f_left), max(top, f_top)
+            right, bottom = min(right, f_right), min(bottom, f_bottom)
+        return range(left, right + 1), range(top, bottom + 1)
+
+    def insert(self, rect, entry):
+        """Store entry in each cell rect touches; returns False when it landed in none."""
+        cols, rows = self._cell_range(rect)
+        if not cols or not rows:
+            return False
+        cells = self.cells
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+        return True
+
+    def query(self, rect):
+        """Return each entry sharing a cell with rect exactly once, in insertion order."""
+        found = {}
+        cols, rows = self._cell_range(rect)
+        for cx in cols:
+            for cy in rows:
+                for entry in self.cells.get((cx, cy), ()):
+                    found.setdefault(id(entry), entry)
+        return sorted(found.values(), key=lambda entry: entry[0])
+
+
+class CollisionStage:
+    """
+    Resolves every player collision once per simulation step.
+    Attacks and projectiles describe their live hazards through get_collision_shapes(), using the same
+    dict shapes as get_debug_hitboxes() plus a "key"; each shape that touches the player calls
+    on_player_hit(key, player) on its owner. Pooled projectiles are tested in bulk by the pool itself.
+    """
+
+    def __init__(self, cell_size=128):
+        self.grid = UniformGrid(cell_size)
+        self.player_hitbox = None
+        self.hits = []
+        self.damage_by_source = {}
+        self.stats = {"shapes": 0, "candidates": 0, "hits": 0, "seconds": 0.0}
+
+    def _record_hit(self, source, damage, position):
+        self.hits.append({"source": source, "damage": damage, "position": position})
+        self.damage_by_source[source] = self.damage_by_source.get(source, 0) + damage
+
+    def run(self, player, attacks, projectiles):
+        started = time.perf_counter()
+        self.hits = []
+        # One snapshot of the hitbox serves every test this step.
+        hitbox = player.get_hitbox()
+        self.player_hitbox = hitbox
+        self.grid.clear(focus=hitbox)
+
+        order = 0
+        for owners in (attacks, projectiles.objects):
+            for owner in owners:
+                for shape in owner.get_collision_shapes():
+                    self.grid.insert(shape_bounds(shape), (order, owner, shape))
+                    order += 1
+
+        candidates = self.grid.query(hitbox) if self.grid.cells else []
+        for _, owner, shape in candidates:
+            if not player.alive:
+                break
+            if shape_hits(shape, hitbox):
+                health_before = player.health
+                owner.on_player_hit(shape.get("key"), player)
+                # Projectiles are credited to the attack that fired them.
+                source = getattr(owner, "source", None) or type(owner).__name__
+                self._record_hit(source, health_before - player.health, hitbox.center)
+
+        if player.alive:
+            for damage, source in projectiles.collide(player, hitbox):
+                health_before = player.health
+                player.take_damage(damage)
+                self._record_hit(source or "pooled projectile", health_before - player.health, hitbox.center)
+
+        self.stats = {
+            "shapes": order,
+            "candidates": len(candidates),
+            "hits": len(self.hits),
+            "seconds": time.perf_counter() - started,
+        }
+        return self.hits
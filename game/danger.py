@@ -0,0 +1,271 @@
+import argparse
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from game import batch
+from game.env import hazard_row
+from game.replay import new_run_seed
+from game.sim import PLAYER_INPUTS
+from game.timing import SIM_HZ
+
+# Pixels per danger cell; 16 covers the largest dodge zone with a 58 x 33 grid.
+DANGER_CELL = 16
+PAPER_COLOR = (250, 248, 240)
+HEAT_COLOR = (200, 30, 30)
+
+
+class DangerField:
+    """
+    Rasterizes hazard shapes into a low-resolution occupancy grid over the dodge zone, one cell per
+    cell_size pixels, row-major from the zone's top-left. A cell is set when any hazard could touch it:
+    rects and circles are tested against the whole cell, lines and sword swings against a circle around
+    it, so the grid errs towards danger. Each shape only touches the block of cells under its bounds:
+    a rect is one slice assignment, a circle or line a few array ops over its block.
+    """
+
+    def __init__(self, area_rect, cell_size=DANGER_CELL):
+        self.area = pygame.Rect(area_rect)
+        self.cell_size = cell_size
+        self.cols = math.ceil(self.area.width / cell_size)
+        self.rows = math.ceil(self.area.height / cell_size)
+        # Cell centers in screen coordinates.
+        self.xs = self.area.left + (np.arange(self.cols) + 0.5) * cell_size
+        self.ys = self.area.top + (np.arange(self.rows) + 0.5) * cell_size
+        self.grid = np.zeros((self.rows, self.cols), dtype=bool)
+        # For turning left, top, right, bottom rows into clamped cell spans in bulk.
+        self.origin = np.array(self.area.topleft * 2, dtype=float)
+        self.limits = np.array((self.cols, self.rows) * 2)
+
+    def _span(self, low, high, origin, count):
+        """First and past-the-end cell indices covering [low, high) along one axis, clamped to the grid."""
+        first = min(count, max(0, int((low - origin) // self.cell_size)))
+        last = max(first, min(count, int(-(-(high - origin) // self.cell_size))))
+        return first, last
+
+    def _circle(self, cx, cy, radius):
+        c0, c1 = self._span(cx - radius, cx + radius, self.area.left, self.cols)
+        r0, r1 = self._span(cy - radius, cy + radius, self.area.top, self.rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+        half = self.cell_size * 0.5
+        gap_x = np.maximum(np.abs(self.xs[c0:c1] - cx) - half, 0.0)
+        gap_y = np.maximum(np.abs(self.ys[r0:r1] - cy) - half, 0.0)
+        self.grid[r0:r1, c0:c1] |= gap_y[:, None] ** 2 + gap_x[None, :] ** 2 <= radius * radius
+
+    def _segment(self, start, end, width):
+        # A cell counts when its center lies within the beam's half width plus the cell's half diagonal.
+        reach = width * 0.5 + self.cell_size * 0.7072
+        (x1, y1), (x2, y2) = start, end
+        c0, c1 = self._span(min(x1, x2) - reach, max(x1, x2) + reach, self.area.left, self.cols)
+        r0, r1 = self._span(min(y1, y2) - reach, max(y1, y2) + reach, self.area.top, self.rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        px = self.xs[c0:c1][None, :] - x1
+        py = self.ys[r0:r1][:, None] - y1
+        if length_sq <= 1e-6:
+            along = 0.0
+        else:
+            along = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0)
+        self.grid[r0:r1, c0:c1] |= (px - along * dx) ** 2 + (py - along * dy) ** 2 <= reach * reach
+
+    def _fill_rects(self, boxes):
+        """Mark an (n, 4) array of left, top, right, bottom rects: spans in one pass, then a slice each."""
+        # Cell spans as first column, first row, past-the-end column, past-the-end row.
+        spans = (boxes - self.origin) / self.cell_size
+        np.floor(spans[:, :2], out=spans[:, :2])
+        np.ceil(spans[:, 2:], out=spans[:, 2:])
+        spans = np.minimum(np.maximum(spans, 0.0), self.limits).astype(np.intp)
+        grid = self.grid
+        for c0, r0, c1, r1 in spans.tolist():
+            if c0 < c1 and r0 < r1:
+                grid[r0:r1, c0:c1] = True
+
+    def rasterize_shapes(self, shapes, boxes=None):
+        """
+        The occupancy grid of get_debug_hitboxes() shape dicts, plus an optional (n, 4) array of
+        left, top, right, bottom rects. The grid array is reused by the next call.
+        """
+        self.grid.fill(False)
+        rects = []
+        for shape in shapes:
+            rect, circle, _, x1, y1, x2, y2, thickness = hazard_row(shape)
+            if rect:
+                rects.append((x1, y1, x2, y2))
+            elif circle:
+                self._circle(x1, y1, thickness * 0.5)
+            else:
+                self._segment((x1, y1), (x2, y2), thickness)
+        if rects:
+            rects = np.array(rects, dtype=float)
+            boxes = rects if boxes is None else np.concatenate((rects, boxes))
+        if boxes is not None and len(boxes):
+            self._fill_rects(boxes)
+        return self.grid
+
+    def rasterize(self, run_state):
+        """The occupancy grid of a run's live attack shapes, telegraphs included, and projectiles."""
+        shapes = []
+        for attack in run_state["active_attacks"]:
+            shapes.extend(attack.get_debug_hitboxes())
+        pool = run_state["projectiles"]
+        for projectile in pool.objects:
+            shapes.extend(projectile.get_debug_hitboxes())
+        count = pool.count
+        boxes = None
+        if count:
+            topleft = pool.pos[:count] - pool.half[:count]
+            boxes = np.hstack((topleft, topleft + pool.size[:count]))
+        return self.rasterize_shapes(shapes, boxes)
+
+    def cell_of(self, position):
+        """(row, col) of the cell holding a screen position, or None outside the dodge zone."""
+        col = int((position[0] - self.area.left) // self.cell_size)
+        row = int((position[1] - self.area.top) // self.cell_size)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+
+class DamageHeatmap:
+    """
+    Accumulates, over any number of runs, where the player was standing when each attack class hurt
+    them, and how many ticks each cell spent under a hazard. Use it as a HeadlessGame.play monitor.
+    """
+
+    def __init__(self, area_rect, cell_size=DANGER_CELL):
+        self.field = DangerField(area_rect, cell_size)
+        self.exposure = np.zeros((self.field.rows, self.field.cols), dtype=np.int64)
+        self.damage = {}
+        self.ticks = 0
+        self.runs = 0
+
+    def update(self, run_state):
+        self.exposure += self.field.rasterize(run_state)
+        for hit in run_state["collisions"].hits:
+            cell = self.field.cell_of(hit["position"])
+            if cell is None or hit["damage"] <= 0:
+                continue
+            grid = self.damage.get(hit["source"])
+            if grid is None:
+                grid = self.damage[hit["source"]] = np.zeros_like(self.exposure)
+            grid[cell] += hit["damage"]
+        self.ticks += 1
+        return False
+
+    def merge(self, other):
+        self.exposure += other.exposure
+        for source, grid in other.damage.items():
+            if source in self.damage:
+                self.damage[source] += grid
+            else:
+                self.damage[source] = grid.copy()
+        self.ticks += other.ticks
+        self.runs += other.runs
+
+    def total_damage(self):
+        return sum(self.damage.values(), np.zeros_like(self.exposure))
+
+
+def heat_surface(grid, cell_size):
+    """grid drawn from paper white (zero) to red (its peak), one cell_size square per cell."""
+    peak = grid.max()
+    level = grid / peak if peak > 0 else np.zeros(grid.shape)
+    paper = np.array(PAPER_COLOR, dtype=float)
+    rgb = (paper + (np.array(HEAT_COLOR) - paper) * level[..., None]).astype(np.uint8)
+    surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+    rows, cols = grid.shape
+    return pygame.transform.scale(surface, (cols * cell_size, rows * cell_size))
+
+
+def write_heatmaps(folder, heatmap):
+    """exposure.png, damage.png, one damage_<Attack>.png per attack class, and the raw grids in heatmaps.npz."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    cell_size = heatmap.field.cell_size
+    total = heatmap.total_damage()
+    images = {"exposure": heatmap.exposure, "damage": total}
+    images.update((f"damage_{source}", grid) for source, grid in heatmap.damage.items())
+    for name, grid in images.items():
+        pygame.image.save(heat_surface(grid, cell_size), str(folder / f"{name}.png"))
+    np.savez_compressed(folder / "heatmaps.npz", cell_size=cell_size, ticks=heatmap.ticks, runs=heatmap.runs, **images)
+    return len(images)
+
+
+def heatmap_job(job):
+    """Play one seeded run in a batch worker and return its DamageHeatmap."""
+    game = batch.worker_game()
+    run_state = game.new_run(job["seed"])
+    for name, value in job["pen"].items():
+        setattr(run_state["pen"], name, value)
+    heatmap = DamageHeatmap(game.area_rect, job["cell_size"])
+    game.play(PLAYER_INPUTS[job["player"]](job["seed"], game.area_rect), job["seconds"], run_state, heatmap)
+    heatmap.runs = 1
+    return heatmap
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Accumulate where attacks hurt the player over many headless runs and save heatmaps")
+    parser.add_argument("--runs", type=int, default=100, help="seeded runs to play")
+    parser.add_argument("--player", choices=sorted(PLAYER_INPUTS), default="dodge", help="scripted or bot player")
+    parser.add_argument("--seconds", type=float, default=300.0, help="longest gameplay time a run may last")
+    parser.add_argument("--seed", type=int, default=None, help="seed the run seeds are drawn from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per core)")
+    parser.add_argument("--cell", type=int, default=DANGER_CELL, help="pixels per heatmap cell")
+    parser.add_argument("--out", default="heatmaps", help="folder for the images and heatmaps.npz")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="fixed gameplay simulation rate")
+    parser.add_argument("--width", type=int, default=1280, help="virtual screen width")
+    parser.add_argument("--height", type=int, default=850, help="virtual screen height")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    settings = {
+        "runs": max(1, args.runs),
+        "player": args.player,
+        "seconds": args.seconds,
+        "seed": new_run_seed() if args.seed is None else args.seed,
+        "workers": max(1, args.workers),
+        "sweep": [],
+        "size": (args.width, args.height),
+        "sim_hz": max(1, args.sim_hz),
+    }
+    print(f"seed: {settings['seed']}  runs: {settings['runs']}  workers: {settings['workers']}")
+    heatmaps = []
+
+    def on_result(heatmap):
+        if heatmaps:
+            heatmaps[0].merge(heatmap)
+        else:
+            heatmaps.append(heatmap)
+
+    started = time.perf_counter()
+    batch.run_batch(settings, on_result, heatmap_job, {"cell_size": max(1, args.cell)})
+    wall = time.perf_counter() - started
+    heatmap = heatmaps[0]
+
+    seconds = heatmap.ticks / settings["sim_hz"]
+    print(f"{heatmap.runs} runs, {seconds:.0f}s of gameplay in {wall:.1f}s")
+    print(f"hazard cover: {heatmap.exposure.mean() / max(heatmap.ticks, 1):.1%} of the dodge zone on average")
+    # A cell that takes a large share of an attack's damage points at a spot that attack makes hard to leave.
+    cell_size = heatmap.field.cell_size
+    for source, grid in sorted(heatmap.damage.items(), key=lambda item: -item[1].sum()):
+        row, col = np.unravel_index(grid.argmax(), grid.shape)
+        share = grid[row, col] / grid.sum()
+        x, y = (col + 0.5) * cell_size, (row + 0.5) * cell_size
+        print(f"{source:<20}{int(grid.sum()):>8} damage  hottest cell at ({x:.0f}, {y:.0f}) in the zone takes {share:.0%}")
+    written = write_heatmaps(args.out, heatmap)
+    print(f"wrote {written} heatmaps to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
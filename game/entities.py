@@ -0,0 +1,51 @@
+class EntityList:
+    """
+    Ordered container for live attacks or projectiles.
+    Finished entries are dropped with one stable in-place compaction pass, so cleanup stays linear
+    during dense phases and draw order is preserved. Counters feed the profiler and batch reports.
+    """
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.added = len(self.items)
+        self.removed = 0
+        self.peak = len(self.items)
+
+    def append(self, item):
+        self.items.append(item)
+        self.added += 1
+        if len(self.items) > self.peak:
+            self.peak = len(self.items)
+
+    def current(self):
+        """Iterate the entries present now; anything appended during the loop waits for the next step."""
+        items = self.items
+        for index in range(len(items)):
+            yield items[index]
+
+    def remove_where(self, predicate):
+        """Drop every entry matching predicate, keeping the survivors in their original order."""
+        items = self.items
+        write = 0
+        for item in items:
+            if not predicate(item):
+                items[write] = item
+                write += 1
+        self.removed += len(items) - write
+        del items[write:]
+
+    def clear(self):
+        self.removed += len(self.items)
+        self.items.clear()
+
+    def stats(self):
+        return {"live": len(self.items), "added": self.added, "removed": self.removed, "peak": self.peak}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
@@ -0,0 +1,188 @@
+import numpy as np
+import pygame
+
+from game.render import RenderQueue
+from game.sim import ALL_MOVES, HeadlessGame
+from game.timing import SIM_HZ
+from game.utils import point_from_angle
+
+# Action i moves the player by ALL_MOVES[i]; action 0 stands still.
+ACTION_COUNT = len(ALL_MOVES)
+# Per projectile: whether the slot is used, center and velocity relative to the player, and sprite size.
+PROJECTILE_FEATURES = ("present", "x", "y", "vx", "vy", "width", "height")
+# Per hazard: one flag per kind, then two points and a thickness relative to the player.
+# A rect is its two corners with no thickness, a circle its center twice with its diameter as thickness,
+# and lines and sword swings their end points and full width.
+HAZARD_FEATURES = ("rect", "circle", "segment", "x1", "y1", "x2", "y2", "thickness")
+PLAYER_FEATURES = ("x", "y", "vx", "vy", "health")
+PEN_FEATURES = ("x", "y", "drawing", "ramp", "elapsed")
+BACKGROUND_COLOR = (250, 248, 240)
+AREA_COLOR = (60, 60, 60)
+
+
+def hazard_row(shape):
+    """A get_debug_hitboxes() shape dict as a HAZARD_FEATURES tuple in screen coordinates."""
+    kind = shape["type"]
+    if kind == "rect":
+        left, top, width, height = shape["rect"]
+        return 1.0, 0.0, 0.0, left, top, left + width, top + height, 0.0
+    if kind == "circle":
+        cx, cy = shape["center"]
+        return 0.0, 1.0, 0.0, cx, cy, cx, cy, shape["radius"] * 2.0
+    if kind == "line":
+        (x1, y1), (x2, y2) = shape["start"], shape["end"]
+        return 0.0, 0.0, 1.0, x1, y1, x2, y2, shape.get("width", 1)
+    if kind == "swing":
+        reach = shape["length"] * 0.5
+        x1, y1 = point_from_angle(shape["center"], shape["angle"], -reach)
+        x2, y2 = point_from_angle(shape["center"], shape["angle"], reach)
+        return 0.0, 0.0, 1.0, x1, y1, x2, y2, shape["half_width"] * 2.0
+    raise ValueError(f"unknown hazard shape {kind!r}")
+
+
+class DodgeEnv:
+    """
+    Gym-style environment over the headless game: reset(seed) starts a seeded run, step(action) plays
+    one simulation tick with one of the nine moves, and observation is a flat float32 array of the player,
+    the pen, and the nearest projectiles and attack hazards (telegraphs included); every call returns a
+    fresh array. Positions are relative to the player and scaled so the dodge zone is one unit across;
+    unused slots are zeros.
+    The reward is the gameplay time survived this step minus the share of health lost.
+    With render_mode="rgb_array", render() returns the scene as a (height, width, 3) uint8 array.
+    """
+
+    def __init__(self, size=(1280, 850), sim_hz=SIM_HZ, max_seconds=300.0, projectiles=16, hazards=16, render_mode=None, game=None):
+        self.game = game or HeadlessGame(size, sim_hz)
+        self.max_seconds = max_seconds
+        self.projectile_slots = projectiles
+        self.hazard_slots = hazards
+        self.render_mode = render_mode
+        self.render_queue = None
+        area = self.game.area_rect
+        self.scale = np.array((1.0 / area.width, 1.0 / area.height))
+        self.observation_size = (
+            len(PLAYER_FEATURES) + len(PEN_FEATURES) + projectiles * len(PROJECTILE_FEATURES) + hazards * len(HAZARD_FEATURES)
+        )
+        # Refilled in place every step; callers get copies, so kept observations never change under them.
+        self._buffer = np.zeros(self.observation_size, dtype=np.float32)
+        self.run_state = None
+
+    def reset(self, seed=None):
+        """Start a new run; returns (observation, info)."""
+        self.run_state = self.game.new_run(seed)
+        return self._observe().copy(), self._info(0)
+
+    def step(self, action):
+        """Play one tick with ALL_MOVES[action]; returns (observation, reward, terminated, truncated, info)."""
+        run_state = self.run_state
+        player = run_state["player"]
+        health_before = player.health
+        elapsed_before = run_state["elapsed_time"]
+        self.game.tick(run_state, ALL_MOVES[action])
+        damage = health_before - player.health
+        reward = run_state["elapsed_time"] - elapsed_before - damage / player.max_health
+        terminated = not player.alive
+        truncated = not terminated and run_state["elapsed_time"] >= self.max_seconds
+        return self._observe().copy(), reward, terminated, truncated, self._info(damage)
+
+    @property
+    def observation(self):
+        """A copy of the latest observation."""
+        return self._buffer.copy()
+
+    def _info(self, damage):
+        run_state = self.run_state
+        return {
+            "elapsed": run_state["elapsed_time"],
+            "health": run_state["player"].health,
+            "attacks": run_state["attack_count"],
+            "damage": damage,
+        }
+
+    def _observe(self):
+        run_state = self.run_state
+        player = run_state["player"]
+        pen = run_state["pen"]
+        area = self.game.area_rect
+        observation = self._buffer
+        observation.fill(0.0)
+        center = player.rect.center
+        step_speed = player.speed * self.game.step
+
+        observation[0:5] = (
+            (center[0] - area.left) * self.scale[0],
+            (center[1] - area.top) * self.scale[1],
+            (player.x - player.prev_x) / step_speed,
+            (player.y - player.prev_y) / step_speed,
+            player.health / player.max_health,
+        )
+        observation[5:10] = (
+            (pen.x - center[0]) * self.scale[0],
+            (pen.y - center[1]) * self.scale[1],
+            float(pen.drawing),
+            min(1.0, pen.elapsed / pen.time_to_max_speed),
+            run_state["elapsed_time"] / self.max_seconds,
+        )
+        offset = len(PLAYER_FEATURES) + len(PEN_FEATURES)
+        offset = self._observe_projectiles(run_state["projectiles"], center, offset)
+        self._observe_hazards(run_state["active_attacks"], center, offset)
+        return observation
+
+    def _observe_projectiles(self, pool, center, offset):
+        cx, cy = center
+        sx, sy = self.scale
+        count = pool.count
+        items = list(zip(pool.pos[:count].tolist(), pool.vel[:count].tolist(), pool.size[:count].tolist()))
+        for projectile in pool.objects:
+            speed = getattr(projectile, "speed", 0.0)
+            velocity = (getattr(projectile, "dx", 0.0) * speed, getattr(projectile, "dy", 0.0) * speed)
+            items.append((projectile.rect.center, velocity, projectile.rect.size))
+        ranked = []
+        for (x, y), (vx, vy), (width, height) in items:
+            x, y = x - cx, y - cy
+            gap_x = max(abs(x) - width * 0.5, 0.0)
+            gap_y = max(abs(y) - height * 0.5, 0.0)
+            row = (1.0, x * sx, y * sy, vx * sx, vy * sy, width * sx, height * sy)
+            ranked.append((gap_x * gap_x + gap_y * gap_y, len(ranked), row))
+        ranked.sort()
+        values = [value for _, _, row in ranked[: self.projectile_slots] for value in row]
+        self._buffer[offset : offset + len(values)] = values
+        return offset + self.projectile_slots * len(PROJECTILE_FEATURES)
+
+    def _observe_hazards(self, attacks, center, offset):
+        # A run rarely has more than a few dozen shapes, so plain Python beats NumPy's per-call cost here.
+        cx, cy = center
+        sx, sy = self.scale
+        ranked = []
+        for attack in attacks:
+            for shape in attack.get_debug_hitboxes():
+                rect, circle, segment, x1, y1, x2, y2, thickness = hazard_row(shape)
+                x1, y1, x2, y2 = x1 - cx, y1 - cy, x2 - cx, y2 - cy
+                pad = thickness * 0.5
+                # Distance from the player to the shape's bounding box; the list index keeps ties in attack order.
+                gap_x = max(min(x1, x2) - pad, -max(x1, x2) - pad, 0.0)
+                gap_y = max(min(y1, y2) - pad, -max(y1, y2) - pad, 0.0)
+                row = (rect, circle, segment, x1 * sx, y1 * sy, x2 * sx, y2 * sy, thickness * sx)
+                ranked.append((gap_x * gap_x + gap_y * gap_y, len(ranked), row))
+        ranked.sort()
+        values = [value for _, _, row in ranked[: self.hazard_slots] for value in row]
+        self._buffer[offset : offset + len(values)] = values
+        return offset + self.hazard_slots * len(HAZARD_FEATURES)
+
+    def render(self):
+        """The current frame as an RGB array when render_mode is "rgb_array", else None."""
+        if self.render_mode != "rgb_array" or self.run_state is None:
+            return None
+        surface = self.game.screen
+        if self.render_queue is None:
+            self.render_queue = RenderQueue(surface.get_rect())
+        surface.fill(BACKGROUND_COLOR)
+        pygame.draw.rect(surface, AREA_COLOR, self.game.area_rect, 2)
+        run_state = self.run_state
+        run_state["pen"].draw(self.render_queue)
+        for attack in run_state["active_attacks"]:
+            attack.draw(self.render_queue)
+        run_state["projectiles"].draw(self.render_queue)
+        run_state["player"].draw(self.render_queue)
+        self.render_queue.flush(surface)
+        return pygame.surfarray.array3d(surface).transpose(1, 0, 2)
@@ -1,15 +1,28 @@
+import time
+
+# Taken before any other import so --trace-startup can report how long module imports took.
+STARTUP_STARTED = time.perf_counter()
+
 import argparse
 import json
-import os
 import random
-import sys
 from datetime import datetime
 from pathlib import Path
 
 import pygame
 
-from game.player import Player
-from game.pen import Pen
+from game import simulation
+from game.assets.loader import PLAYER_ICON_SIZE, load_asset, load_attack_assets
+from game.attacks.registry import ATTACK_TYPES
+from game.persistence import PersistenceWorker, get_data_dir
+from game.player import read_movement_keys
+from game.profiler import NULL_PROFILER, FrameProfiler
+from game.render import RenderQueue, SpriteAtlas
+from game.replay import REPLAY_SUFFIX, Replay, ReplayPlayer, ReplayRecorder, new_run_seed
+from game.scores import ScoreStore
+from game.skins import SkinRegistry, load_character_surface, surface_has_ink
+from game.timing import SIM_HZ, FixedStepClock
+from game.tracing import NULL_TRACER, StartupTracer
 from game.utils import (
     INK,
     blur_surface,
@@ -19,22 +32,11 @@ from game.utils import (
     draw_panel,
     draw_paper_background,
     format_time_mmss,
-    load_scaled,
+    get_scaled,
+    invalidate_paper_background,
     recalc_geometry,
 )
 
-from game.attacks.base import AttackBase
-from game.attacks.gun import GunAttack
-from game.attacks.grenade import GrenadeAttack
-from game.attacks.sword import SwordAttack
-from game.attacks.shotgun import ShotgunAttack
-from game.attacks.mirror import MirrorAttack
-from game.attacks.sniper import SniperAttack
-from game.attacks.boomerang import BoomerangAttack
-from game.attacks.shuriken import ShurikenAttack
-from game.attacks.stuff import StuffAttack
-from game.attacks.pool import PoolAttack
-
 
 def parse_runtime_args():
     parser = argparse.ArgumentParser(description="Unchecked")
@@ -42,47 +44,70 @@ def parse_runtime_args():
     parser.add_argument("--windowed", action="store_true", help="start in a resizable window")
     parser.add_argument("--width", type=int, default=1280, help="window width when --windowed is used")
     parser.add_argument("--height", type=int, default=850, help="window height when --windowed is used")
-    return parser.parse_known_args()[0]
-
-
+    parser.add_argument("--fps", type=int, default=60, help="render frame cap, 0 renders as fast as the display allows")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="fixed gameplay simulation rate")
+    parser.add_argument("--profile", action="store_true", help="start with the frame-time profiler overlay open")
+    parser.add_argument("--trace-startup", action="store_true", help="print per-phase startup time and memory")
+    parser.add_argument("--trace-startup-json", metavar="PATH", help="also write the startup trace as JSON (implies --trace-startup)")
+    parser.add_argument("--replay", metavar="PATH", help="watch a recorded run instead of playing")
+    parser.add_argument("--seed", type=int, default=None, help="give every run this seed, so pen targets and attacks repeat")
+    args = parser.parse_known_args()[0]
+    if args.seed is not None and not 0 <= args.seed < 1 << 63:
+        parser.error("--seed must be between 0 and 2**63 - 1")
+    return args
+
+
+IMPORTS_DONE = time.perf_counter()
 runtime_args = parse_runtime_args()
+if runtime_args.trace_startup or runtime_args.trace_startup_json:
+    startup_tracer = StartupTracer(STARTUP_STARTED)
+    startup_tracer.add_phase("imports", STARTUP_STARTED, IMPORTS_DONE)
+    startup_tracer.add_phase("parse_runtime_args", IMPORTS_DONE, time.perf_counter())
+else:
+    startup_tracer = NULL_TRACER
 
-pygame.init()
+with startup_tracer.phase("pygame.init"):
+    pygame.init()
+
+# A replay is only exact at the screen size and simulation rate it was recorded with.
+replay_playback = None
+if runtime_args.replay:
+    try:
+        replay_playback = Replay.load(runtime_args.replay)
+    except (OSError, ValueError) as error:
+        raise SystemExit(f"cannot play {runtime_args.replay}: {error}")
 
 windowed_size = (max(720, runtime_args.width), max(520, runtime_args.height))
 fullscreen = not runtime_args.windowed
+sim_hz = max(1, runtime_args.sim_hz)
+if replay_playback is not None:
+    windowed_size = replay_playback.screen_size
+    fullscreen = False
+    sim_hz = replay_playback.sim_hz
 debug_hitboxes = runtime_args.debug_hitboxes
 
-if fullscreen:
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-else:
-    screen = pygame.display.set_mode(windowed_size, pygame.RESIZABLE)
-pygame.display.set_caption("Unchecked")
+with startup_tracer.phase("set_mode"):
+    if fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(windowed_size, pygame.RESIZABLE)
+    pygame.display.set_caption("Unchecked")
 clock = pygame.time.Clock()
+sim_clock = FixedStepClock(sim_hz)
+render_fps = max(0, runtime_args.fps)
+# Swapped for a FrameProfiler while the F2 overlay is open, so the timing hooks are empty calls otherwise.
+profiler = FrameProfiler() if runtime_args.profile else NULL_PROFILER
 
 screen_width, screen_height, area_rect, top_area = recalc_geometry(screen)
 
 
-def get_base_path():
-    """Resolve the correct base path for source runs and bundled executable runs."""
-    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-        return Path(sys._MEIPASS)
-    return Path(__file__).resolve().parent.parent
-
-
-def get_data_dir():
-    """Store user-created data outside the project tree."""
-    local_root = os.getenv("LOCALAPPDATA")
-    if local_root:
-        data_dir = Path(local_root) / "Unchecked"
-    else:
-        data_dir = Path.home() / ".unchecked"
-    data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir
-
-
 def get_scores_path():
     """Store scores in the user's local app-data folder instead of inside the project tree."""
+    return DATA_DIR / "scores.db"
+
+
+def get_legacy_scores_path():
+    """Top-20 JSON table used before scores moved to SQLite; imported once."""
     return DATA_DIR / "scores.json"
 
 
@@ -98,14 +123,23 @@ def get_custom_characters_dir():
     return custom_dir
 
 
-BASE_PATH = get_base_path()
+def get_replays_dir():
+    """Recorded runs, one small file per saved score."""
+    replays_dir = DATA_DIR / "replays"
+    replays_dir.mkdir(parents=True, exist_ok=True)
+    return replays_dir
+
+
 DATA_DIR = get_data_dir()
-ASSET_PATH = BASE_PATH / "game" / "assets" / "images"
+REPLAYS_DIR = get_replays_dir()
 SCORES_PATH = get_scores_path()
+LEGACY_SCORES_PATH = get_legacy_scores_path()
+SCOREBOARD_SIZE = 10
 CUSTOM_CHARACTER_PATH = get_custom_character_path()
 CUSTOM_CHARACTERS_DIR = get_custom_characters_dir()
 CUSTOM_CHARACTER_INDEX_PATH = CUSTOM_CHARACTERS_DIR / "characters.json"
-PLAYER_ICON_SIZE = (26, 26)
+# Score and character files are written off the main loop, so a slow disk never stalls a frame.
+persistence = PersistenceWorker()
 CUSTOM_CHARACTER_SIZE = (64, 64)
 CUSTOM_SKIN_PREFIX = "custom:"
 RANDOM_SKIN_NAME = "Random"
@@ -126,53 +160,29 @@ CHARACTER_COLORS = [
     ("Cyan", (58, 176, 190)),
 ]
 
-checkbox_icon = load_scaled(str(ASSET_PATH / "Checkbox.png"), PLAYER_ICON_SIZE)
-checkbox_icon_1 = load_scaled(str(ASSET_PATH / "Checkbox1.png"), PLAYER_ICON_SIZE)
-checkbox_icon_2 = load_scaled(str(ASSET_PATH / "Checkbox2.png"), PLAYER_ICON_SIZE)
-checkbox_icon_3 = load_scaled(str(ASSET_PATH / "Checkbox3.png"), PLAYER_ICON_SIZE)
-pen_img = load_scaled(str(ASSET_PATH / "pen.png"), (130, 130))
-gun_img = load_scaled(str(ASSET_PATH / "gun.png"), (110, 110))
-bullet_img = load_scaled(str(ASSET_PATH / "bullet.png"), (20, 20))
-grenade_img = load_scaled(str(ASSET_PATH / "grenade.png"), (42, 42))
-explosion_img = load_scaled(str(ASSET_PATH / "explosion.png"), (160, 160))
-sword_img = load_scaled(str(ASSET_PATH / "sword.png"), (80, 80))
-slash_img = load_scaled(str(ASSET_PATH / "slash.png"), (200, 30))
-shotgun_img = load_scaled(str(ASSET_PATH / "shotgun.png"), (150, 90))
-mirror_img = load_scaled(str(ASSET_PATH / "mirror.png"), (110, 110))
-sniper_img = load_scaled(str(ASSET_PATH / "sniper.png"), (150, 85))
-pool_ball_img = load_scaled(str(ASSET_PATH / "poolBall.png"), (42, 42))
-pool_cue_img = load_scaled(str(ASSET_PATH / "poolCue.png"), (124, 124))
-boomerang_img = load_scaled(str(ASSET_PATH / "boomerang.png"), (95, 95))
-shuriken_img = load_scaled(str(ASSET_PATH / "shuriken.png"), (78, 78))
-shuriken_projectile_img = load_scaled(str(ASSET_PATH / "shuriken.png"), (62, 62))
-stuff_img = load_scaled(str(ASSET_PATH / "stuff.png"), (120, 120))
-fireball_img = load_scaled(str(ASSET_PATH / "fireball.png"), (54, 54))
-audio_icon = load_scaled(str(ASSET_PATH / "audio.png"), (56, 56))
-settings_icon = load_scaled(str(ASSET_PATH / "settings.png"), (56, 56))
-
-AttackAssets = {
-    "gun_img": gun_img,
-    "bullet_img": bullet_img,
-    "grenade_img": grenade_img,
-    "explosion_img": explosion_img,
-    "sword_img": sword_img,
-    "slash_img": slash_img,
-    "shotgun_img": shotgun_img,
-    "mirror_img": mirror_img,
-    "sniper_img": sniper_img,
-    "boomerang_img": boomerang_img,
-    "shuriken_img": shuriken_img,
-    "shuriken_projectile_img": shuriken_projectile_img,
-    "stuff_img": stuff_img,
-    "fireball_img": fireball_img,
-    "pool_ball_img": pool_ball_img,
-    "pool_cue_img": pool_cue_img,
-}
 
-ATTACK_TYPES = [GunAttack, GrenadeAttack, SwordAttack, ShotgunAttack, MirrorAttack, SniperAttack, BoomerangAttack, ShurikenAttack, StuffAttack, PoolAttack]
-# ATTACK_TYPES = [PoolAttack]
+def load_ui_asset(key):
+    with startup_tracer.item("sprite", key):
+        return load_asset(key)
+
+
+with startup_tracer.phase("ui sprites"):
+    checkbox_icon = load_ui_asset("checkbox_icon")
+    checkbox_icon_1 = load_ui_asset("checkbox_icon_1")
+    checkbox_icon_2 = load_ui_asset("checkbox_icon_2")
+    checkbox_icon_3 = load_ui_asset("checkbox_icon_3")
+    pen_img = load_ui_asset("pen_img")
+    audio_icon = load_ui_asset("audio_icon")
+    settings_icon = load_ui_asset("settings_icon")
 
-AttackAssets["attack_classes"] = [GunAttack, GrenadeAttack, SwordAttack, ShotgunAttack, SniperAttack, BoomerangAttack, ShurikenAttack, StuffAttack, PoolAttack]
+# Attack sprites decode on first use; the home screen warms them a few milliseconds per frame.
+AttackAssets = load_attack_assets()
+ASSET_WARMUP_BUDGET = 0.004
+# Left and right arrows jump a watched replay this many seconds.
+REPLAY_SEEK_STEP = 10.0
+
+# Gameplay sprites are queued each frame and flushed in layer order; the atlas is built once sprites are loaded.
+render_queue = RenderQueue(screen.get_rect())
 
 
 def create_blank_custom_character():
@@ -194,7 +204,7 @@ def custom_id_from_skin_key(skin_key):
 
 def custom_character_has_ink(surface):
     """Return true when the custom character has at least one visible pixel."""
-    return pygame.mask.from_surface(surface).count() > 0
+    return surface_has_ink(surface)
 
 
 def sanitize_custom_character_id(name):
@@ -266,25 +276,13 @@ def load_custom_character_records():
 
 
 def save_custom_character_records():
-    """Persist the custom character index."""
-    CUSTOM_CHARACTER_INDEX_PATH.write_text(json.dumps(custom_character_records, indent=2), encoding="utf-8")
+    """Queue a write of the custom character index."""
+    persistence.write_text(CUSTOM_CHARACTER_INDEX_PATH, json.dumps(custom_character_records, indent=2))
 
 
 def load_custom_character_surface_from_path(path):
     """Load and normalize a custom character PNG."""
-    try:
-        surface = pygame.image.load(str(path)).convert_alpha()
-    except (OSError, pygame.error):
-        return None
-
-    if surface.get_size() != CUSTOM_CHARACTER_SIZE:
-        surface = pygame.transform.smoothscale(surface, CUSTOM_CHARACTER_SIZE)
-    return surface
-
-
-def make_custom_character_icon(surface):
-    """Scale the saved drawing down to the in-game player size."""
-    return pygame.transform.smoothscale(surface, PLAYER_ICON_SIZE)
+    return load_character_surface(path, CUSTOM_CHARACTER_SIZE)
 
 
 def migrate_legacy_custom_character():
@@ -313,34 +311,59 @@ BUILTIN_PLAYER_SKINS = {
     "Checkbox2": checkbox_icon_2,
     "Checkbox3": checkbox_icon_3,
 }
-PLAYER_SKINS = BUILTIN_PLAYER_SKINS.copy()
-custom_character_records = load_custom_character_records()
-custom_character_surfaces = {}
+with startup_tracer.phase("load_custom_character_records"):
+    custom_character_records = load_custom_character_records()
+# Custom character icons are read lazily (the picker loads only visible rows) and cached on disk.
+skin_registry = SkinRegistry(CUSTOM_CHARACTERS_DIR, CUSTOM_CHARACTER_SIZE, PLAYER_ICON_SIZE)
+# Every selectable skin key in picker order, rebuilt only when characters are added or removed.
+selectable_skin_keys = []
+skins_version = 0
+
+
+def refresh_selectable_skins():
+    global selectable_skin_keys, skins_version
+    custom_keys = [custom_skin_key(record["id"]) for record in custom_character_records]
+    selectable_skin_keys = [RANDOM_SKIN_NAME, *BUILTIN_PLAYER_SKINS.keys(), *custom_keys]
+    skins_version += 1
 
 
 def rebuild_player_skins():
-    """Refresh selectable player skins from built-ins plus saved custom characters."""
-    global PLAYER_SKINS, custom_character_surfaces, custom_character_records
-    PLAYER_SKINS = BUILTIN_PLAYER_SKINS.copy()
-    custom_character_surfaces = {}
-    valid_records = []
+    """Register saved custom characters with the skin registry; no drawing is read until it is shown."""
+    skin_registry.register(custom_character_records)
+    refresh_selectable_skins()
 
-    for record in custom_character_records:
-        surface = load_custom_character_surface_from_path(CUSTOM_CHARACTERS_DIR / record["file"])
-        if surface is None or not custom_character_has_ink(surface):
-            continue
 
-        valid_records.append(record)
-        custom_character_surfaces[record["id"]] = surface
-        PLAYER_SKINS[custom_skin_key(record["id"])] = make_custom_character_icon(surface)
+def drop_invalid_custom_characters(character_ids):
+    """Forget characters whose PNG turned out missing or blank when their icon was first read."""
+    global custom_character_records, selected_player_skin, selected_player_icon
+    if not character_ids:
+        return
+    invalid = set(character_ids)
+    custom_character_records = [record for record in custom_character_records if record["id"] not in invalid]
+    save_custom_character_records()
+    for character_id in invalid:
+        skin_registry.remove(character_id)
+    refresh_selectable_skins()
+    if is_custom_skin_key(selected_player_skin) and custom_id_from_skin_key(selected_player_skin) in invalid:
+        selected_player_skin = "Checkbox"
+        selected_player_icon = checkbox_icon
+
 
-    if len(valid_records) != len(custom_character_records):
-        custom_character_records = valid_records
-        save_custom_character_records()
+def get_skin_icon(skin_key):
+    """The icon for a built-in or custom skin key, reading a custom one if needed; None if unusable."""
+    if is_custom_skin_key(skin_key):
+        character_id = custom_id_from_skin_key(skin_key)
+        icon = skin_registry.icon(character_id)
+        if icon is None:
+            drop_invalid_custom_characters([character_id])
+        return icon
+    return BUILTIN_PLAYER_SKINS.get(skin_key)
 
 
-migrate_legacy_custom_character()
-rebuild_player_skins()
+with startup_tracer.phase("migrate_legacy_custom_character"):
+    migrate_legacy_custom_character()
+with startup_tracer.phase("rebuild_player_skins"):
+    rebuild_player_skins()
 custom_character_draft = create_blank_custom_character()
 custom_character_name_input = ""
 editing_custom_character_id = None
@@ -364,13 +387,13 @@ def get_skin_label(skin_key):
 
 
 def get_selectable_skin_keys():
-    return [RANDOM_SKIN_NAME, *PLAYER_SKINS.keys()]
+    return selectable_skin_keys
 
 
 def get_player_icon_for_run():
     if selected_player_skin == RANDOM_SKIN_NAME:
-        return random.choice(list(PLAYER_SKINS.values()))
-    return PLAYER_SKINS.get(selected_player_skin, checkbox_icon)
+        return get_skin_icon(random.choice(selectable_skin_keys[1:])) or checkbox_icon
+    return get_skin_icon(selected_player_skin) or checkbox_icon
 
 
 def select_player_skin(skin_key):
@@ -380,34 +403,18 @@ def select_player_skin(skin_key):
         selected_player_skin = RANDOM_SKIN_NAME
         selected_player_icon = checkbox_icon
         return True
-    if skin_key not in PLAYER_SKINS:
+    icon = get_skin_icon(skin_key)
+    if icon is None:
         return False
     selected_player_skin = skin_key
-    selected_player_icon = PLAYER_SKINS[skin_key]
+    selected_player_icon = icon
     return True
 
 
-def sort_scores(scores):
-    """Order runs by survival time first and attack count second."""
-    return sorted(scores, key=lambda item: (item.get("time", 0.0), item.get("attacks", 0)), reverse=True)
-
-
-def load_scores():
-    """Load saved runs from disk, tolerating a missing or malformed file."""
-    if not SCORES_PATH.exists():
-        return []
-    try:
-        data = json.loads(SCORES_PATH.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return []
-    if not isinstance(data, list):
-        return []
-    return sort_scores([item for item in data if isinstance(item, dict)])
-
-
-def save_scores(scores):
-    """Persist the score table to disk."""
-    SCORES_PATH.write_text(json.dumps(sort_scores(scores)[:20], indent=2), encoding="utf-8")
+def refresh_scores():
+    """Re-read the scoreboard rows after a run has been saved."""
+    global scores
+    scores = score_store.top(SCOREBOARD_SIZE)
 
 
 def bounded_int(value, min_value, max_value):
@@ -521,6 +528,10 @@ def build_characters_modal_layout():
         )
         row_y += row_height + row_gap
 
+    # Custom characters on screen, then the page below, so the icon reader stays a page ahead of scrolling.
+    window = skin_keys[scroll: scroll + visible_count * 2]
+    icon_ids = [custom_id_from_skin_key(skin_key) for skin_key in window if is_custom_skin_key(skin_key)]
+
     return {
         "modal": modal,
         "rows": rows,
@@ -529,9 +540,22 @@ def build_characters_modal_layout():
         "max_scroll": max_scroll,
         "total": len(skin_keys),
         "visible_count": visible_count,
+        "icon_ids": icon_ids,
     }
 
 
+characters_modal_layout_cache = {"key": None, "layout": None}
+
+
+def get_characters_modal_layout():
+    """The picker layout, rebuilt only when the screen, scroll position or character list changes."""
+    key = (screen_width, screen_height, character_list_scroll, skins_version)
+    if characters_modal_layout_cache["key"] != key:
+        characters_modal_layout_cache["layout"] = build_characters_modal_layout()
+        characters_modal_layout_cache["key"] = key
+    return characters_modal_layout_cache["layout"]
+
+
 def build_draw_character_layout():
     """Create the named custom-character drawing surface and controls."""
     modal = build_home_modal_rect(width_ratio=0.58, height_ratio=0.80, min_width=560, min_height=610)
@@ -613,7 +637,7 @@ def build_save_modal_layout():
         0,
         0,
         bounded_int(screen_width * 0.34, 320, screen_width - 72),
-        bounded_int(screen_height * 0.25, 210, screen_height - 72),
+        bounded_int(screen_height * 0.30, 250, screen_height - 72),
     )
     modal.center = (screen_width // 2, int(screen_height * 0.54))
     input_height = bounded_int(54 * scale, 44, 54)
@@ -626,18 +650,26 @@ def build_save_modal_layout():
 
 def create_run_state():
     """Create a fresh run state for gameplay or retry."""
-    return {
-        "player": Player(get_player_icon_for_run(), screen_width, screen_height),
-        "pen": Pen(pen_img, top_area),
-        "active_attacks": [],
-        "projectiles": [],
-        "elapsed_time": 0.0,
-        "attack_count": 0,
-        "snapshot": None,
-        "result": None,
-        "score_saved": False,
-        "name_input": "",
-    }
+    if replay_playback is not None:
+        seed = replay_playback.seed
+    elif runtime_args.seed is not None:
+        seed = runtime_args.seed
+    else:
+        seed = new_run_seed()
+    screen_size = (screen_width, screen_height)
+    state = simulation.create_run_state(get_player_icon_for_run(), pen_img, screen_size, top_area, seed=seed)
+    state.update(
+        {
+            "snapshot": None,
+            "result": None,
+            # A watched replay is not a new score.
+            "score_saved": replay_playback is not None,
+            "replay": ReplayRecorder(seed, sim_hz, screen_size),
+            "replay_input": ReplayPlayer(replay_playback, step_replay_tick, shared=(AttackAssets,)) if replay_playback is not None else None,
+            "name_input": "",
+        }
+    )
+    return state
 
 
 def refresh_screen_layout(new_screen):
@@ -645,15 +677,21 @@ def refresh_screen_layout(new_screen):
     global screen, screen_width, screen_height, area_rect, top_area
     screen = new_screen
     screen_width, screen_height, area_rect, top_area = recalc_geometry(screen)
+    invalidate_paper_background()
+    render_queue.set_bounds(screen.get_rect())
 
     if "run_state" not in globals():
         return
 
     run_state["snapshot"] = None
+    if game_state == "playing":
+        # Moving the player and pen mid-run is not something the recorded input can reproduce.
+        run_state["replay"].invalid = True
     run_state["player"].on_resize(screen_width, screen_height)
     run_state["pen"].top_area = top_area
     run_state["pen"].rect.clamp_ip(top_area)
     run_state["pen"].x, run_state["pen"].y = run_state["pen"].rect.center
+    run_state["pen"].prev_x, run_state["pen"].prev_y = run_state["pen"].x, run_state["pen"].y
 
 
 def set_mouse_visibility(mode):
@@ -664,7 +702,12 @@ def set_mouse_visibility(mode):
 def begin_run():
     """Start a new run from either the menu or retry."""
     global game_state, run_state
+    # Anything the home screen did not get to warm is decoded now rather than mid-run.
+    AttackAssets.load_all()
+    if render_queue.atlas is None:
+        render_queue.atlas = SpriteAtlas({**AttackAssets.loaded, "pen_img": pen_img})
     run_state = create_run_state()
+    sim_clock.reset()
     game_state = "playing"
     set_mouse_visibility(game_state)
 
@@ -701,7 +744,9 @@ def open_custom_character_record(character_id):
 
     record = get_custom_character_record(character_id) if character_id else None
     if record:
-        custom_character_draft = custom_character_surfaces.get(character_id, create_blank_custom_character()).copy()
+        # A save of this drawing may still be queued; let it land before reading the file back.
+        persistence.flush()
+        custom_character_draft = skin_registry.load_surface(record["file"]) or create_blank_custom_character()
         custom_character_name_input = record["name"]
     else:
         custom_character_draft = create_blank_custom_character()
@@ -768,91 +813,132 @@ def save_custom_character():
         character_id = record["id"]
         record["name"] = name[:MAX_CHARACTER_NAME_LENGTH]
 
-    try:
-        pygame.image.save(custom_character_draft, str(CUSTOM_CHARACTERS_DIR / record["file"]))
-    except (OSError, pygame.error):
-        if created_record:
-            custom_character_records.remove(record)
-        show_toast("Save failed")
-        return
-
+    file_name = record["file"]
+    persistence.save_surface(
+        CUSTOM_CHARACTERS_DIR / file_name,
+        custom_character_draft,
+        done="Character saved",
+        on_done=lambda: skin_registry.mark_saved(file_name),
+        on_failed=lambda: forget_unsaved_custom_character(character_id, file_name),
+    )
     save_custom_character_records()
-    rebuild_player_skins()
+    selected_player_icon = skin_registry.update(record, custom_character_draft)
     selected_player_skin = custom_skin_key(character_id)
-    selected_player_icon = PLAYER_SKINS.get(selected_player_skin, checkbox_icon)
+    if created_record:
+        refresh_selectable_skins()
     editing_custom_character_id = character_id
     home_modal = "characters"
     drawing_custom_character = False
     custom_draw_last_point = None
-    show_toast("Character saved")
 
 
 def delete_custom_character(character_id):
     """Delete a saved custom character and remove it from the character picker."""
-    global custom_character_records, selected_player_skin, selected_player_icon
     record = get_custom_character_record(character_id)
     if record is None:
         return
 
-    try:
-        (CUSTOM_CHARACTERS_DIR / record["file"]).unlink(missing_ok=True)
-    except OSError:
-        pass
+    persistence.delete(CUSTOM_CHARACTERS_DIR / record["file"], done="Character deleted")
+    forget_custom_character(character_id)
+
+
+def forget_unsaved_custom_character(character_id, file_name):
+    """After a failed PNG write: a character with no file on disk must not stay in the index."""
+    if not (CUSTOM_CHARACTERS_DIR / file_name).exists():
+        forget_custom_character(character_id)
+
 
+def forget_custom_character(character_id):
+    """Drop a character from the index and the picker, falling back to the default skin if it was selected."""
+    global custom_character_records, selected_player_skin, selected_player_icon, editing_custom_character_id
     custom_character_records = [item for item in custom_character_records if item["id"] != character_id]
     save_custom_character_records()
-    rebuild_player_skins()
+    skin_registry.remove(character_id)
+    refresh_selectable_skins()
 
     if selected_player_skin == custom_skin_key(character_id):
         selected_player_skin = "Checkbox"
-        selected_player_icon = PLAYER_SKINS[selected_player_skin]
-    show_toast("Character deleted")
+        selected_player_icon = checkbox_icon
+    if editing_custom_character_id == character_id:
+        editing_custom_character_id = None
 
 
-def get_best_time(scores):
-    """Return the best saved survival time."""
-    if not scores:
-        return 0.0
-    return max(item.get("time", 0.0) for item in scores)
+def get_personal_best(name):
+    """Best saved run for the name being typed, looked up once per distinct name."""
+    name = name.strip() or "Anonymous"
+    cached = run_state.get("personal_best")
+    if cached is None or cached[0] != name:
+        cached = run_state["personal_best"] = (name, score_store.personal_best(name))
+    return cached[1]
 
 
-def register_attack(attack):
-    """Add a spawned attack to the active list and count it toward the run total."""
-    run_state["active_attacks"].append(attack)
-    run_state["attack_count"] += 1
+def save_current_score():
+    """Append the current run using the typed name, then return to the home screen."""
+    if not run_state["result"]:
+        return
 
+    item = {
+        "name": run_state["name_input"].strip() or "Anonymous",
+        "time": run_state["result"]["time"],
+        "attacks": run_state["result"]["attacks"],
+        "saved_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    recorder = run_state["replay"]
+    if not recorder.invalid:
+        item["replay"] = f"{datetime.now():%Y%m%d-%H%M%S}-{recorder.seed:016x}{REPLAY_SUFFIX}"
+        persistence.write_bytes(REPLAYS_DIR / item["replay"], recorder.to_bytes(), failed="Replay save failed")
+    # Inserts are appends, so they are never coalesced with one another.
+    persistence.call(None, score_store.add, item, done="Score saved", on_done=refresh_scores)
+    run_state["score_saved"] = True
+    return_home()
 
-def spawn_attack():
-    """Spawn a random attack from the pen's current draw position."""
-    attack_cls = random.choice(ATTACK_TYPES)
-    attack = attack_cls(run_state["pen"].get_rect(), run_state["player"].get_rect(), AttackAssets)
-    register_attack(attack)
 
+def step_replay_tick(state, move):
+    """Advance a watched replay by one tick while seeking, without drawing."""
+    return simulation.step_run(state, sim_clock.step, area_rect, ATTACK_TYPES, AttackAssets, move=move)
 
-def save_current_score():
-    """Persist the current run using the typed name, then return to the home screen."""
-    global scores
-    if not run_state["result"]:
-        return
 
-    name = run_state["name_input"].strip() or "Anonymous"
-    scores.append(
-        {
-            "name": name,
-            "time": run_state["result"]["time"],
-            "attacks": run_state["result"]["attacks"],
-            "saved_at": datetime.now().isoformat(timespec="seconds"),
+def seek_replay(seconds):
+    """Jump a watched replay by seconds of gameplay, from its nearest checkpoint."""
+    # Scrubbing works while paused too: the seek simulates unpaused and the pause carries over.
+    paused = run_state["clock"].paused
+    run_state["clock"].paused = False
+    run_state["replay_input"].seek(run_state, run_state["ticks"] + round(seconds * sim_hz))
+    run_state["clock"].paused = paused
+    sim_clock.reset()
+
+
+def step_run(dt):
+    """Advance gameplay by one fixed simulation step."""
+    global game_state
+    if run_state["clock"].paused:
+        return
+    replay_input = run_state["replay_input"]
+    move = read_movement_keys() if replay_input is None else replay_input.next_move(run_state)
+    if move is None:
+        return_home("Replay finished")
+        return
+    if not simulation.step_run(run_state, dt, area_rect, ATTACK_TYPES, AttackAssets, move=move, profiler=profiler):
+        return
+    run_state["replay"].record(move)
+
+    if not run_state["player"].alive:
+        run_state["replay"].finish(run_state["elapsed_time"], run_state["attack_count"])
+        run_state["result"] = {
+            "time": run_state["elapsed_time"],
+            "attacks": run_state["attack_count"],
+            "new_high_score": run_state["elapsed_time"] > score_store.best_time(),
+            "standing": score_store.standing(run_state["elapsed_time"], run_state["attack_count"]),
         }
-    )
-    scores = sort_scores(scores)
-    save_scores(scores)
-    run_state["score_saved"] = True
-    return_home("Score saved")
+        game_state = "game_over"
+        run_state["snapshot"] = None
+        set_mouse_visibility(game_state)
 
 
-def draw_game_scene(surface):
+def draw_game_scene(surface, alpha=1.0):
     """Render the gameplay screen and the left-side run stats."""
     draw_paper_background(surface, area_rect, top_area)
+    profiler.lap("background")
     draw_hand_text(surface, "Pencil lane", top_area.x, top_area.y - 28, size=24)
     draw_hand_text(surface, "Dodge zone", area_rect.x, area_rect.y - 28, size=24)
 
@@ -877,15 +963,19 @@ def draw_game_scene(surface):
         bold=True,
     )
     draw_health_bar(surface, health_panel.x + 16, health_panel.y + 46, run_state["player"].health, run_state["player"].max_health, width=240)
+    profiler.lap("hud")
 
-    run_state["pen"].draw(surface)
+    run_state["pen"].draw(render_queue, alpha)
     for attack in run_state["active_attacks"]:
-        attack.draw(surface)
-    for proj in run_state["projectiles"]:
-        proj.draw(surface)
-    run_state["player"].draw(surface)
+        attack.draw(render_queue)
+    run_state["projectiles"].draw(render_queue, alpha)
+    run_state["player"].draw(render_queue, alpha)
+    render_queue.flush(surface)
+    profiler.lap("draw")
     if debug_hitboxes:
         draw_debug_hitboxes(surface)
+    if run_state["clock"].paused:
+        draw_panel(surface, pygame.Rect(screen_width // 2 - 90, 24, 180, 54), fill=(255, 252, 245, 200), center_label=True, label="Paused", label_size=30)
 
 
 def draw_home(surface):
@@ -938,7 +1028,9 @@ def draw_home(surface):
 
 def draw_characters_modal(surface):
     """Show selectable built-in, random, and saved custom skins."""
-    layout = build_characters_modal_layout()
+    drop_invalid_custom_characters(skin_registry.poll())
+    layout = get_characters_modal_layout()
+    skin_registry.request(layout["icon_ids"])
     modal = layout["modal"]
     shade = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
     shade.fill((255, 255, 255, 70))
@@ -958,8 +1050,15 @@ def draw_characters_modal(surface):
             pygame.draw.rect(surface, INK, preview_rect, 2, border_radius=4)
             draw_hand_text(surface, "?", preview_rect.centerx, preview_rect.centery, size=28, center=True, bold=True)
         else:
-            preview = pygame.transform.scale(PLAYER_SKINS[skin_key], (preview_size, preview_size))
-            surface.blit(preview, preview_rect)
+            if is_custom_skin_key(skin_key):
+                icon = skin_registry.peek(custom_id_from_skin_key(skin_key))
+            else:
+                icon = BUILTIN_PLAYER_SKINS[skin_key]
+            if icon is None:
+                # Placeholder until the background reader delivers this row's icon.
+                pygame.draw.rect(surface, (226, 222, 212), preview_rect, border_radius=4)
+            else:
+                surface.blit(get_scaled(icon, (preview_size, preview_size)), preview_rect)
 
         text_y = row_rect.y + max(8, (row_rect.height - 28) // 2)
         text_right = row["edit"].x - 10 if row["edit"] else row_rect.right - 64
@@ -1040,7 +1139,7 @@ def draw_scoreboard_modal(surface):
     draw_panel(surface, modal, fill=(255, 252, 245, 235))
     draw_hand_text(surface, "Score board", modal.centerx, modal.y + 34, size=36, center=True, bold=True)
 
-    top_scores = scores[:10]
+    top_scores = scores[:SCOREBOARD_SIZE]
     if not top_scores:
         draw_hand_text(surface, "No saved scores yet.", modal.centerx, modal.centery, size=26, center=True)
         return
@@ -1081,6 +1180,10 @@ def draw_game_over_overlay(surface):
 
     draw_hand_text(surface, f"Time  {format_time_mmss(run_state['result']['time'])}", layout["modal"].x + 36, layout["modal"].y + 144, size=30, max_width=layout["modal"].width - 72)
     draw_hand_text(surface, f"Attacks  {run_state['result']['attacks']}", layout["modal"].x + 36, layout["modal"].y + 184, size=30, max_width=layout["modal"].width - 72)
+    standing = run_state["result"]["standing"]
+    if standing["total"]:
+        standing_text = f"Rank {standing['rank']} of {standing['total'] + 1}, better than {standing['percentile']:.0f}% of runs"
+        draw_hand_text(surface, standing_text, layout["modal"].x + 36, layout["modal"].y + 222, size=24, color=(95, 90, 80), max_width=layout["modal"].width - 72)
 
     draw_panel(surface, layout["save"], center_label=True, label="Save score", label_size=24)
     draw_panel(surface, layout["retry"], center_label=True, label="Retry", label_size=28)
@@ -1100,6 +1203,9 @@ def draw_save_modal(surface):
     entry_text = run_state["name_input"] or "Type your name"
     entry_color = (35, 34, 30) if run_state["name_input"] else (120, 112, 100)
     draw_hand_text(surface, entry_text, layout["input"].x + 14, layout["input"].y + 12, size=28, color=entry_color)
+    best = get_personal_best(run_state["name_input"])
+    best_text = f"Best for {best['name']}  {format_time_mmss(best['time'])}" if best else "First run under this name"
+    draw_hand_text(surface, best_text, layout["modal"].centerx, layout["input"].bottom + 18, size=22, center=True, color=(95, 90, 80), max_width=layout["modal"].width - 52)
     draw_panel(surface, layout["save"], center_label=True, label="Save", label_size=26)
 
 
@@ -1177,37 +1283,134 @@ def draw_debug_hitboxes(surface):
         for entry in attack.get_debug_hitboxes():
             draw_debug_hitbox_entry(surface, entry, DEBUG_COLORS["attack"])
 
-    for projectile in run_state["projectiles"]:
-        if not hasattr(projectile, "get_debug_hitboxes"):
-            continue
-        for entry in projectile.get_debug_hitboxes():
-            draw_debug_hitbox_entry(surface, entry, DEBUG_COLORS["projectile"])
+    for entry in run_state["projectiles"].get_debug_hitboxes():
+        draw_debug_hitbox_entry(surface, entry, DEBUG_COLORS["projectile"])
 
     indicator = pygame.Rect(screen_width - 166, 18, 142, 34)
     draw_panel(surface, indicator, fill=(255, 252, 245, 170), center_label=True, label="F3 Hitboxes", label_size=18)
 
 
-scores = load_scores()
+PROFILER_COLORS = {
+    "events": (120, 120, 120),
+    "player": (35, 170, 95),
+    "pen": (70, 125, 240),
+    "attacks": (215, 135, 35),
+    "projectiles": (225, 70, 55),
+    "collisions": (180, 65, 210),
+    "background": (160, 140, 100),
+    "hud": (90, 160, 170),
+    "draw": (200, 90, 140),
+    "overlay": (150, 150, 190),
+    "flip": (60, 60, 60),
+}
+
+
+def profiler_counts():
+    """Live counts shown beside the frame-time breakdown."""
+    counts = {
+        "attacks": len(run_state["active_attacks"]),
+        "projectiles": len(run_state["projectiles"]),
+        "pooled": run_state["projectiles"].count,
+    }
+    collision_stats = run_state["collisions"].stats
+    counts["shapes"] = collision_stats["shapes"]
+    counts["candidates"] = collision_stats["candidates"]
+    return counts
+
+
+def draw_profiler_overlay(surface):
+    """Draw the rolling frame-time graph, percentiles and per-section averages."""
+    summary = profiler.summary
+    panel = pygame.Rect(screen_width - 336, screen_height - 324, 312, 300)
+    draw_panel(surface, panel, fill=(255, 252, 245, 215))
+    draw_hand_text(surface, "F2 Profiler", panel.x + 14, panel.y + 8, size=20, bold=True)
+    if summary is None:
+        return
+
+    # Frame intervals against a 0-50 ms scale, with the 60 FPS budget marked.
+    graph = pygame.Rect(panel.x + 14, panel.y + 38, panel.width - 28, 70)
+    pygame.draw.rect(surface, (235, 230, 220), graph)
+    scale_ms = 50.0
+    budget_y = graph.bottom - int(graph.height * (1000.0 / 60.0) / scale_ms)
+    pygame.draw.line(surface, (90, 160, 90), (graph.left, budget_y), (graph.right, budget_y), 1)
+    frames = profiler.recent_frames()
+    if len(frames) > 1:
+        step = graph.width / (profiler.history - 1)
+        points = [
+            (graph.left + int(index * step), graph.bottom - int(graph.height * min(ms, scale_ms) / scale_ms))
+            for index, ms in enumerate(frames.tolist())
+        ]
+        pygame.draw.lines(surface, (190, 45, 45), False, points, 1)
+
+    y = graph.bottom + 6
+    draw_hand_text(
+        surface,
+        f"p50 {summary['p50']:.1f}  p95 {summary['p95']:.1f}  p99 {summary['p99']:.1f} ms",
+        panel.x + 14,
+        y,
+        size=18,
+    )
+    y += 22
+    draw_hand_text(surface, f"work {summary['work']:.2f} ms / frame", panel.x + 14, y, size=18)
+    y += 24
+
+    column_x = (panel.x + 14, panel.x + 164)
+    for index, (name, ms) in enumerate(summary["sections"]):
+        x = column_x[index % 2]
+        row_y = y + (index // 2) * 20
+        pygame.draw.rect(surface, PROFILER_COLORS.get(name, INK), (x, row_y + 5, 8, 8))
+        draw_hand_text(surface, f"{name} {ms:.2f}", x + 14, row_y, size=16)
+    y += ((len(summary["sections"]) + 1) // 2) * 20 + 6
+
+    counts = summary["counts"]
+    if counts:
+        text = "  ".join(f"{name} {value}" for name, value in counts.items())
+        draw_hand_text(surface, text, panel.x + 14, y, size=16, max_width=panel.width - 28)
+
+
+def finish_startup_trace(first_frame_started):
+    """Close the startup trace once the first frame is on screen, print it, and stop tracing."""
+    global startup_tracer
+    startup_tracer.add_phase("first frame", first_frame_started, time.perf_counter())
+    startup_tracer.finish()
+    print(startup_tracer.report())
+    if runtime_args.trace_startup_json:
+        startup_tracer.write_json(runtime_args.trace_startup_json)
+    startup_tracer = NULL_TRACER
+
+
+with startup_tracer.phase("load_scores"):
+    # Every saved run lives in SQLite; the old top-20 JSON is imported the first time it is opened.
+    score_store = ScoreStore(SCORES_PATH, legacy_json=LEGACY_SCORES_PATH)
+    scores = score_store.top(SCOREBOARD_SIZE)
 game_state = "home"
 selected_player_skin = "Checkbox"
-selected_player_icon = PLAYER_SKINS[selected_player_skin]
+selected_player_icon = checkbox_icon
 audio_muted = False
 home_modal = None
 character_list_scroll = 0
 drawing_custom_character = False
 custom_draw_last_point = None
-run_state = create_run_state()
+with startup_tracer.phase("create_run_state"):
+    run_state = create_run_state()
 toast_message = ""
 toast_timer = 0.0
+if replay_playback is not None:
+    begin_run()
 set_mouse_visibility(game_state)
 
+first_frame_started = time.perf_counter()
 running = True
 while running:
-    dt = clock.tick(60) / 1000.0
+    # Rendering runs at its own cap; gameplay below only ever advances in fixed sim_clock steps.
+    dt = clock.tick(render_fps) / 1000.0
+    profiler.begin_frame()
     if toast_timer > 0.0:
         toast_timer = max(0.0, toast_timer - dt)
         if toast_timer <= 0.0:
             toast_message = ""
+    for message in persistence.poll():
+        show_toast(message)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -1237,6 +1440,16 @@ while running:
             elif event.key == pygame.K_F3:
                 debug_hitboxes = not debug_hitboxes
 
+            elif event.key == pygame.K_F2:
+                profiler = NULL_PROFILER if profiler.enabled else FrameProfiler()
+                profiler.begin_frame()
+
+            elif game_state == "playing" and event.key == pygame.K_p:
+                run_state["clock"].paused = not run_state["clock"].paused
+
+            elif game_state == "playing" and run_state["replay_input"] is not None and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                seek_replay(REPLAY_SEEK_STEP if event.key == pygame.K_RIGHT else -REPLAY_SEEK_STEP)
+
             elif game_state == "home" and home_modal == "draw_character" and event.key == pygame.K_RETURN:
                 save_custom_character()
 
@@ -1273,7 +1486,7 @@ while running:
 
         elif event.type == pygame.MOUSEWHEEL:
             if game_state == "home" and home_modal == "characters":
-                layout = build_characters_modal_layout()
+                layout = get_characters_modal_layout()
                 character_list_scroll = int(clamp(character_list_scroll - event.y, 0, layout["max_scroll"]))
 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -1305,7 +1518,7 @@ while running:
                         save_custom_character()
 
                 elif home_modal == "characters":
-                    character_layout = build_characters_modal_layout()
+                    character_layout = get_characters_modal_layout()
                     modal = character_layout["modal"]
                     if not modal.collidepoint(mouse_pos):
                         home_modal = None
@@ -1353,50 +1566,38 @@ while running:
                 if save_layout["save"].collidepoint(mouse_pos):
                     save_current_score()
 
+    profiler.lap("events")
     if game_state == "playing":
-        run_state["elapsed_time"] += dt
-        run_state["player"].update(dt, area_rect)
-        run_state["pen"].update(dt)
-
-        if run_state["pen"].ready_to_attack():
-            spawn_attack()
-            run_state["pen"].pick_new_target()
-
-        for attack in run_state["active_attacks"][:]:
-            spawned = attack.update(dt, run_state["projectiles"], run_state["player"]) or []
-            for obj in spawned:
-                if isinstance(obj, AttackBase):
-                    register_attack(obj)
-                else:
-                    run_state["projectiles"].append(obj)
-            if attack.finished:
-                run_state["active_attacks"].remove(attack)
-
-        for proj in run_state["projectiles"][:]:
-            proj.update(dt, run_state["player"])
-            if not proj.active or not run_state["player"].alive:
-                run_state["projectiles"].remove(proj)
-
-        if not run_state["player"].alive:
-            best_time = get_best_time(scores)
-            run_state["result"] = {
-                "time": run_state["elapsed_time"],
-                "attacks": run_state["attack_count"],
-                "new_high_score": run_state["elapsed_time"] > best_time,
-            }
-            game_state = "game_over"
-            run_state["snapshot"] = None
-            set_mouse_visibility(game_state)
+        for _ in range(sim_clock.advance(dt)):
+            step_run(sim_clock.step)
+            if game_state != "playing":
+                break
 
     if game_state == "home":
+        AttackAssets.warm(ASSET_WARMUP_BUDGET)
         draw_home(screen)
     else:
-        draw_game_scene(screen)
+        interpolating = game_state == "playing" and not run_state["clock"].paused
+        draw_game_scene(screen, sim_clock.alpha if interpolating else 1.0)
         if game_state in ("game_over", "save_score"):
             draw_game_over_overlay(screen)
             if game_state == "save_score":
                 draw_save_modal(screen)
 
+    if profiler.enabled:
+        profiler.lap("draw")
+        draw_profiler_overlay(screen)
+        profiler.lap("overlay")
     pygame.display.flip()
-
+    profiler.lap("flip")
+    profiler.end_frame(dt, profiler_counts() if profiler.enabled else None)
+    if startup_tracer.enabled:
+        finish_startup_trace(first_frame_started)
+
+# Write everything still queued before exiting, then let the icon cache see the final files.
+persistence.close()
+persistence.poll()
+score_store.close()
+skin_registry.close()
+skin_registry.flush()
 pygame.quit()
@@ -1,14 +1,18 @@
 import math
-import random
 import pygame
 
+from game.render import LAYER_PEN
+from game.rng import UNSEEDED_RANDOM
+
 
 class Pen:
-    def __init__(self, image, top_area):
+    def __init__(self, image, top_area, rng=None):
         self.image = image
         self.rect = image.get_rect(center=top_area.center)
         self.x = float(self.rect.centerx)
         self.y = float(self.rect.centery)
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.top_area = top_area
 
         # The pen starts slower and ramps over a full three-minute run before reaching top speed.
@@ -20,14 +24,17 @@ class Pen:
         self.drawing = False
         self.ready_flag = False
         self.elapsed = 0.0
+        # Targets come from the gameplay stream; the scribble is drawn once per rendered frame, so it uses the cosmetic one.
+        self.rng = rng or UNSEEDED_RANDOM
 
         self.pick_new_target()
 
     def pick_new_target(self):
-        self.target_x = random.uniform(self.top_area.left, self.top_area.right)
-        self.target_y = random.uniform(self.top_area.top, self.top_area.bottom)
+        self.target_x = self.rng.gameplay.uniform(self.top_area.left, self.top_area.right)
+        self.target_y = self.rng.gameplay.uniform(self.top_area.top, self.top_area.bottom)
 
     def update(self, dt):
+        self.prev_x, self.prev_y = self.x, self.y
         self.elapsed += dt
         progress = min(1.0, self.elapsed / self.time_to_max_speed)
         speed = self.base_speed + (self.max_speed - self.base_speed) * progress
@@ -63,18 +70,24 @@ class Pen:
     def get_rect(self):
         return self.rect
 
-    def draw(self, surface):
+    def draw(self, queue, alpha=1.0):
+        center = (
+            int(self.prev_x + (self.x - self.prev_x) * alpha),
+            int(self.prev_y + (self.y - self.prev_y) * alpha),
+        )
+
         # a light scribble circle while "drawing"
         if self.drawing:
             scribble = pygame.Surface((90, 90), pygame.SRCALPHA)
+            cosmetic = self.rng.cosmetic
             for _ in range(12):
-                ox, oy = random.randint(-6, 6), random.randint(-6, 6)
+                ox, oy = cosmetic.randint(-6, 6), cosmetic.randint(-6, 6)
                 pygame.draw.ellipse(
                     scribble,
                     (30, 30, 30, 60),
                     (20 + ox, 20 + oy, 50, 50),
                     2,
                 )
-            surface.blit(scribble, scribble.get_rect(center=self.rect.center))
+            queue.submit(scribble, scribble.get_rect(center=center), layer=LAYER_PEN)
 
-        surface.blit(self.image, self.rect)
+        queue.submit(self.image, self.image.get_rect(center=center), layer=LAYER_PEN)
@@ -0,0 +1,140 @@
+import io
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+
+import pygame
+
+# What a failed job may raise; anything else is a bug and is left to surface.
+WRITE_ERRORS = (OSError, ValueError, pygame.error, sqlite3.Error)
+
+
+def get_data_dir():
+    """Store user-created data outside the project tree."""
+    local_root = os.getenv("LOCALAPPDATA")
+    if local_root:
+        data_dir = Path(local_root) / "Unchecked"
+    else:
+        data_dir = Path.home() / ".unchecked"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def write_atomic(path, data):
+    """Write bytes to path through a temp file in the same folder, so readers never see a half-written file."""
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+
+
+def encode_png(surface):
+    """PNG bytes for a surface; safe off the main thread as long as nothing else draws on the surface."""
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, "image.png")
+    return buffer.getvalue()
+
+
+class PersistenceWorker:
+    """
+    One background thread for the game's disk writes.
+    Jobs are keyed by the file they touch; a job queued while an older one for the same file is still
+    waiting replaces it in place, so rapid saves of one file cost one write. Jobs submitted with call()
+    and no key, such as appending a row, are never coalesced. Each job may carry a toast
+    for success and one for failure, and an optional callback for each; poll() hands these back on the main thread.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.busy = False
+        self.wake = threading.Condition()
+        self.results = queue.SimpleQueue()
+        self.closing = False
+        self.thread = None
+        self.stats = {"queued": 0, "coalesced": 0, "written": 0, "failed": 0}
+
+    def _submit(self, path, job):
+        with self.wake:
+            # A fresh object never matches a queued key.
+            key = object() if path is None else str(path)
+            if key in self.jobs:
+                self.stats["coalesced"] += 1
+            self.jobs[key] = job
+            self.stats["queued"] += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._work, name="persistence", daemon=True)
+                self.thread.start()
+            self.wake.notify_all()
+
+    def write_bytes(self, path, data, done=None, failed="Save failed", on_done=None, on_failed=None):
+        self._submit(path, (write_atomic, (path, data), done, failed, on_done, on_failed))
+
+    def write_text(self, path, text, done=None, failed="Save failed", on_done=None, on_failed=None):
+        self.write_bytes(path, text.encode("utf-8"), done=done, failed=failed, on_done=on_done, on_failed=on_failed)
+
+    def save_surface(self, path, surface, done=None, failed="Save failed", on_done=None, on_failed=None):
+        """Queue a PNG save of a snapshot of surface; the caller may keep drawing on the original."""
+        snapshot = surface.copy()
+        self._submit(path, (lambda target: write_atomic(target, encode_png(snapshot)), (path,), done, failed, on_done, on_failed))
+
+    def call(self, key, function, *args, done=None, failed="Save failed", on_done=None, on_failed=None):
+        """Queue function(*args) on the worker; jobs sharing a key coalesce, a key of None never does."""
+        self._submit(key, (function, args, done, failed, on_done, on_failed))
+
+    def delete(self, path, done=None, failed=None, on_done=None, on_failed=None):
+        self._submit(path, (lambda target: Path(target).unlink(missing_ok=True), (path,), done, failed, on_done, on_failed))
+
+    def _work(self):
+        while True:
+            with self.wake:
+                while not self.jobs and not self.closing:
+                    self.wake.wait()
+                if not self.jobs:
+                    return
+                key = next(iter(self.jobs))
+                function, args, done, failed, on_done, on_failed = self.jobs.pop(key)
+                self.busy = True
+            try:
+                function(*args)
+            except WRITE_ERRORS:
+                self.results.put((failed, on_failed))
+                ok = False
+            else:
+                self.results.put((done, on_done))
+                ok = True
+            with self.wake:
+                self.busy = False
+                self.stats["written" if ok else "failed"] += 1
+                self.wake.notify_all()
+
+    def poll(self):
+        """Main thread: run finished jobs' callbacks and return their toast messages, oldest first."""
+        messages = []
+        while True:
+            try:
+                message, on_done = self.results.get_nowait()
+            except queue.Empty:
+                return messages
+            if on_done is not None:
+                on_done()
+            if message:
+                messages.append(message)
+
+    def flush(self, timeout=None):
+        """Block until every queued job has been written; returns False if the timeout ran out first."""
+        with self.wake:
+            return self.wake.wait_for(lambda: not self.jobs and not self.busy, timeout)
+
+    def close(self, timeout=5.0):
+        """Write what is still queued, then stop the thread."""
+        with self.wake:
+            self.closing = True
+            self.wake.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
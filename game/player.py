@@ -1,5 +1,19 @@
 import pygame
 
+from game import utils
+from game.render import LAYER_PLAYER
+
+
+def read_movement_keys():
+    keys = pygame.key.get_pressed()
+    move_x = (1 if keys[pygame.K_RIGHT] or keys[pygame.K_d] else 0) - (
+        1 if keys[pygame.K_LEFT] or keys[pygame.K_a] else 0
+    )
+    move_y = (1 if keys[pygame.K_DOWN] or keys[pygame.K_s] else 0) - (
+        1 if keys[pygame.K_UP] or keys[pygame.K_w] else 0
+    )
+    return move_x, move_y
+
 
 class Player:
     def __init__(self, image, screen_w, screen_h):
@@ -7,6 +21,11 @@ class Player:
         self.rect = image.get_rect()
         self.rect.centerx = screen_w // 2
         self.rect.bottom = screen_h - 50
+        # Float position keeps movement speed independent of the step size; the rect is its rounded copy.
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.health = 100
         self._max_health = 100
         self.speed = 420  # units per second
@@ -26,25 +45,29 @@ class Player:
     def get_hitbox(self):
         return self.rect.inflate(-8, -8)
 
-    def update(self, dt, area_rect):
-        keys = pygame.key.get_pressed()
-        move_x = (1 if keys[pygame.K_RIGHT] or keys[pygame.K_d] else 0) - (
-            1 if keys[pygame.K_LEFT] or keys[pygame.K_a] else 0
-        )
-        move_y = (1 if keys[pygame.K_DOWN] or keys[pygame.K_s] else 0) - (
-            1 if keys[pygame.K_UP] or keys[pygame.K_w] else 0
-        )
+    def _sync_rect(self):
+        self.rect.x = round(self.x)
+        self.rect.y = round(self.y)
+
+    def update(self, dt, area_rect, move=None):
+        """Move by the given (x, y) direction in -1..1, or by the keyboard when move is None."""
+        self.prev_x, self.prev_y = self.x, self.y
+        move_x, move_y = move if move is not None else read_movement_keys()
         if move_x or move_y:
             length = (move_x**2 + move_y**2) ** 0.5 or 1.0
-            self.rect.x += int((move_x / length) * self.speed * dt)
-            self.rect.y += int((move_y / length) * self.speed * dt)
+            self.x += (move_x / length) * self.speed * dt
+            self.y += (move_y / length) * self.speed * dt
 
-        self.rect.clamp_ip(area_rect)
+        self.x = utils.clamp(self.x, area_rect.left, area_rect.right - self.rect.width)
+        self.y = utils.clamp(self.y, area_rect.top, area_rect.bottom - self.rect.height)
+        self._sync_rect()
 
     def on_resize(self, screen_w, screen_h):
         # keep the player roughly at the same relative place (near bottom center)
         self.rect.centerx = screen_w // 2
         self.rect.bottom = min(self.rect.bottom, screen_h - 40)
+        self.x, self.y = float(self.rect.x), float(self.rect.y)
+        self.prev_x, self.prev_y = self.x, self.y
 
     def take_damage(self, amount):
         if not self.alive:
@@ -54,5 +77,7 @@ class Player:
             self.health = 0
             self.alive = False
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def draw(self, queue, alpha=1.0):
+        x = utils.lerp(self.prev_x, self.x, alpha)
+        y = utils.lerp(self.prev_y, self.y, alpha)
+        queue.submit(self.image, (round(x), round(y)), layer=LAYER_PLAYER)
@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+
+
+class NullProfiler:
+    """Stand-in used while the overlay is off; every hook is an empty method."""
+
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, section):
+        pass
+
+    def end_frame(self, frame_dt, counts=None):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """
+    Lap-based frame timer.
+    Each lap(section) charges the time since the previous lap to that section, so the main loop and
+    step_run only mark where one stage ends. History is kept for a rolling graph and percentiles.
+    """
+
+    enabled = True
+
+    SECTIONS = (
+        "events",
+        "player",
+        "pen",
+        "attacks",
+        "projectiles",
+        "collisions",
+        "background",
+        "hud",
+        "draw",
+        "overlay",
+        "flip",
+    )
+
+    def __init__(self, history=240, summary_interval=0.25):
+        self.history = history
+        self.frame_ms = np.zeros(history)
+        self.work_ms = np.zeros(history)
+        self.section_ms = {name: np.zeros(history) for name in self.SECTIONS}
+        self.frames = 0
+        self.current = {}
+        self.last = time.perf_counter()
+        self.frame_start = self.last
+        self.counts = {}
+
+        # The overlay reads a summary refreshed a few times a second, so its text is not re-rendered every frame.
+        self.summary_interval = summary_interval
+        self.summary_age = summary_interval
+        self.summary = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.last = self.frame_start = time.perf_counter()
+
+    def lap(self, section):
+        now = time.perf_counter()
+        self.current[section] = self.current.get(section, 0.0) + (now - self.last)
+        self.last = now
+
+    def end_frame(self, frame_dt, counts=None):
+        """Store this frame's interval, work time and per-section laps in the rolling history."""
+        slot = self.frames % self.history
+        self.frame_ms[slot] = frame_dt * 1000.0
+        self.work_ms[slot] = (self.last - self.frame_start) * 1000.0
+        for name, column in self.section_ms.items():
+            column[slot] = self.current.get(name, 0.0) * 1000.0
+        self.frames += 1
+        self.counts = counts or {}
+
+        self.summary_age += frame_dt
+        if self.summary_age >= self.summary_interval:
+            self.summary_age = 0.0
+            self.summary = self._summarize()
+
+    def recent_frames(self):
+        """Frame intervals in milliseconds, oldest first."""
+        filled = min(self.frames, self.history)
+        if filled < self.history:
+            return self.frame_ms[:filled]
+        slot = self.frames % self.history
+        return np.concatenate((self.frame_ms[slot:], self.frame_ms[:slot]))
+
+    def _summarize(self):
+        filled = min(self.frames, self.history)
+        if filled == 0:
+            return None
+        p50, p95, p99 = np.percentile(self.frame_ms[:filled], (50, 95, 99))
+        sections = [(name, float(column[:filled].mean())) for name, column in self.section_ms.items()]
+        return {
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "work": float(self.work_ms[:filled].mean()),
+            "sections": sections,
+            "counts": dict(self.counts),
+        }
@@ -1,8 +1,12 @@
-import pygame
+from game.render import LAYER_PROJECTILES
+from game.timing import WALL_CLOCK
 
 
 class ProjectileBase:
-    def __init__(self, x, y, dx, dy, speed, image, damage, lifetime=2000):
+    # Class name of the attack that fired it, filled in by ProjectilePool; damage is credited to it.
+    source = None
+
+    def __init__(self, x, y, dx, dy, speed, image, damage, lifetime=2000, clock=None):
         self.x = x
         self.y = y
         self.dx = dx
@@ -12,7 +16,10 @@ class ProjectileBase:
         self.damage = damage
 
         self.rect = self.image.get_rect(center=(x, y))
-        self.spawn_time = pygame.time.get_ticks()
+        self.prev_x = x
+        self.prev_y = y
+        self.clock = clock or WALL_CLOCK
+        self.spawn_time = self.clock.get_ticks()
         self.lifetime = lifetime
         self.active = True
 
@@ -28,19 +35,25 @@ class ProjectileBase:
             }
         ]
 
+    def get_collision_shapes(self):
+        if not self.active:
+            return []
+        return [{"type": "rect", "rect": self.get_hitbox(), "key": None}]
+
+    def on_player_hit(self, key, player):
+        player.take_damage(self.damage)
+        self.active = False
+
     def update(self, dt, player):
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.dx * self.speed * dt
         self.y += self.dy * self.speed * dt
         self.rect.center = (self.x, self.y)
 
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
-            self.active = False
-            return
-
-        hitbox = player.get_hitbox() if hasattr(player, "get_hitbox") else player.rect
-        if self.get_hitbox().colliderect(hitbox):
-            player.take_damage(self.damage)
+        if self.clock.get_ticks() - self.spawn_time > self.lifetime:
             self.active = False
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, queue, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        queue.submit(self.image, self.image.get_rect(center=(int(x), int(y))), layer=LAYER_PROJECTILES)
@@ -0,0 +1,208 @@
+import numpy as np
+
+from game.entities import EntityList
+from game.render import LAYER_PROJECTILES
+from game.timing import WALL_CLOCK
+
+
+class ProjectilePool:
+    """
+    Every projectile in a run.
+    Straight-line projectiles (classes with pooled = True) are stored as NumPy columns and moved,
+    expired, collided and drawn in bulk. Anything with custom behaviour stays a ProjectileBase object.
+    """
+
+    COLUMNS = ("pos", "prev", "vel", "speed", "damage", "spawn_time", "lifetime", "sprite", "size", "half", "source")
+
+    def __init__(self, clock=None, capacity=64):
+        self.clock = clock or WALL_CLOCK
+        self.count = 0
+        self._allocate(capacity)
+
+        # Sprites are shared by index so a burst of identical bullets points at one surface.
+        self.sprites = []
+        self.sprite_lookup = {}
+        # Name of the attack whose update is running; projectiles added meanwhile are credited to it.
+        self.current_source = None
+        self.sources = []
+        self.source_lookup = {}
+
+        self.objects = EntityList()
+        self.peak = 0
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.spawn_time = np.zeros(capacity, dtype=np.int64)
+        self.lifetime = np.zeros(capacity, dtype=np.int64)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+        # Sprite width/height and pygame's center offset (size // 2) per row, so bounds need no lookup.
+        self.size = np.zeros((capacity, 2), dtype=np.int64)
+        self.half = np.zeros((capacity, 2), dtype=np.int64)
+        self.source = np.zeros(capacity, dtype=np.int32)
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self.COLUMNS}
+        self._allocate(self.capacity * 2)
+        for name, column in old.items():
+            getattr(self, name)[: self.count] = column[: self.count]
+
+    def _sprite_index(self, image):
+        index = self.sprite_lookup.get(image)
+        if index is None:
+            index = len(self.sprites)
+            self.sprites.append(image)
+            self.sprite_lookup[image] = index
+        return index
+
+    def _source_index(self, source):
+        index = self.source_lookup.get(source)
+        if index is None:
+            index = len(self.sources)
+            self.sources.append(source)
+            self.source_lookup[source] = index
+        return index
+
+    def spawn(self, x, y, dx, dy, speed, damage, lifetime, image, spawn_time=None):
+        """Add one straight-line projectile to the packed arrays."""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.pos[i] = self.prev[i] = (x, y)
+        self.vel[i] = (dx * speed, dy * speed)
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.spawn_time[i] = self.clock.get_ticks() if spawn_time is None else spawn_time
+        self.lifetime[i] = lifetime
+        self.sprite[i] = self._sprite_index(image)
+        width, height = image.get_size()
+        self.size[i] = (width, height)
+        self.half[i] = (width // 2, height // 2)
+        self.source[i] = self._source_index(self.current_source)
+        self.count += 1
+        self._track_peak()
+
+    def append(self, projectile):
+        """Accept a projectile from an attack, packing it when its motion is a plain straight line."""
+        if getattr(projectile, "pooled", False):
+            self.spawn(
+                projectile.x,
+                projectile.y,
+                projectile.dx,
+                projectile.dy,
+                projectile.speed,
+                projectile.damage,
+                projectile.lifetime,
+                projectile.image,
+                projectile.spawn_time,
+            )
+        else:
+            if projectile.source is None:
+                projectile.source = self.current_source
+            self.objects.append(projectile)
+            self._track_peak()
+
+    def _track_peak(self):
+        live = self.count + len(self.objects)
+        if live > self.peak:
+            self.peak = live
+
+    def clear(self):
+        self.count = 0
+        self.objects.clear()
+
+    def __len__(self):
+        return self.count + len(self.objects)
+
+    def stats(self):
+        return {"live": len(self), "pooled": self.count, "objects": len(self.objects), "peak": self.peak}
+
+    def _topleft(self, pos):
+        """Match pygame.Rect(center=...) rounding so pooled hitboxes line up with the old per-object rects."""
+        return np.floor(pos + 0.5).astype(np.int64) - self.half[: len(pos)]
+
+    def _keep(self, keep):
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[: self.count][keep]
+        self.count = kept
+
+    def update(self, dt, player):
+        """Move everything one step and drop expired pooled rows; hits are resolved by the collision stage."""
+        for projectile in self.objects.current():
+            projectile.update(dt, player)
+
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        self.prev[:n] = pos
+        pos += self.vel[:n] * dt
+        self._keep((self.clock.get_ticks() - self.spawn_time[:n]) <= self.lifetime[:n])
+
+    def collide(self, player, hitbox):
+        """Test every pooled row against the hitbox at once and return (damage, source) for each row that hit."""
+        n = self.count
+        if n == 0:
+            return []
+
+        topleft = self._topleft(self.pos[:n])
+        hits = ((topleft < hitbox.bottomright) & (topleft + self.size[:n] > hitbox.topleft)).all(axis=1)
+        if not hits.any():
+            return []
+        damages = self.damage[:n][hits].tolist()
+        sources = [self.sources[index] for index in self.source[:n][hits].tolist()]
+        self._keep(~hits)
+        return list(zip(damages, sources))
+
+    def remove_finished(self, player):
+        """Drop inactive projectile objects, or everything once the player is dead."""
+        if player.alive:
+            self.objects.remove_where(lambda projectile: not projectile.active)
+        else:
+            self.clear()
+
+    def get_debug_hitboxes(self):
+        entries = []
+        for projectile in self.objects:
+            entries.extend(projectile.get_debug_hitboxes())
+
+        topleft = self._topleft(self.pos[: self.count])
+        for (left, top), size in zip(topleft.tolist(), self.size[: self.count].tolist()):
+            entries.append({"type": "rect", "rect": (left, top, *size), "label": "projectile"})
+        return entries
+
+    def draw(self, queue, alpha=1.0):
+        n = self.count
+        if n:
+            pos = self.prev[:n] + (self.pos[:n] - self.prev[:n]) * alpha
+            topleft = pos.astype(np.int64) - self.half[:n]
+            # Cull the whole pool against the queue's bounds in one vectorized test.
+            bounds = queue.bounds
+            bottomright = topleft + self.size[:n]
+            visible = np.flatnonzero(
+                (topleft[:, 0] < bounds.right)
+                & (topleft[:, 1] < bounds.bottom)
+                & (bottomright[:, 0] > bounds.left)
+                & (bottomright[:, 1] > bounds.top)
+            )
+            queue.stats["culled"] += n - len(visible)
+            sprites = self.sprites
+            queue.submit_many(
+                [
+                    (sprites[index], tuple(corner))
+                    for index, corner in zip(self.sprite[visible].tolist(), topleft[visible].tolist())
+                ],
+                layer=LAYER_PROJECTILES,
+            )
+
+        for projectile in self.objects:
+            projectile.draw(queue, alpha)
@@ -8,8 +8,8 @@ from game.projectiles.base import ProjectileBase
 class ShurikenProjectile(ProjectileBase):
     """A spinning projectile that gently curves toward the player's current position until it leaves the screen."""
 
-    def __init__(self, x, y, dx, dy, image, speed=520, damage=10):
-        super().__init__(x, y, dx, dy, speed, image, damage, lifetime=10000)
+    def __init__(self, x, y, dx, dy, image, speed=520, damage=10, clock=None):
+        super().__init__(x, y, dx, dy, speed, image, damage, lifetime=10000, clock=clock)
 
         # Store a clean base sprite because each frame re-renders the spin from the original image.
         self.base_image = image
@@ -32,11 +32,12 @@ class ShurikenProjectile(ProjectileBase):
         return (angle_deg + 180.0) % 360.0 - 180.0
 
     def update(self, dt, player):
-        """Curve the shuriken slightly toward the player, spin it, and remove it once it leaves the screen."""
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
+        """Curve the shuriken slightly toward the player, spin it, and retire it once it leaves the screen."""
+        if self.clock.get_ticks() - self.spawn_time > self.lifetime:
             self.active = False
             return
 
+        self.prev_x, self.prev_y = self.x, self.y
         desired = pygame.Vector2(player.get_rect().centerx - self.x, player.get_rect().centery - self.y)
         if desired.length_squared() > 1e-6:
             desired_angle = math.degrees(math.atan2(desired.y, desired.x))
@@ -51,15 +52,9 @@ class ShurikenProjectile(ProjectileBase):
         self.y += self.dy * self.speed * dt
 
         self.spin_angle = (self.spin_angle + self.spin_speed * dt) % 360.0
-        self.image = pygame.transform.rotate(self.base_image, -self.spin_angle)
+        self.image = utils.get_rotated(self.base_image, -self.spin_angle)
         self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
 
-        hitbox = player.get_hitbox() if hasattr(player, "get_hitbox") else player.rect
-        if self.get_hitbox().colliderect(hitbox):
-            player.take_damage(self.damage)
-            self.active = False
-            return
-
         screen_rect = pygame.display.get_surface().get_rect()
         margin = 80
         if (
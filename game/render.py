@@ -0,0 +1,135 @@
+import pygame
+
+# Draw order of the gameplay scene, lowest first; entries within a layer keep their submit order.
+LAYER_PEN = 10
+LAYER_ATTACKS = 20
+LAYER_PROJECTILES = 30
+LAYER_PLAYER = 40
+
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 2
+
+
+class SpriteAtlas:
+    """
+    Static sprites shelf-packed into one surface.
+    regions maps each source surface to its sub-rect, so draws of an unrotated sprite can read from the atlas.
+    """
+
+    def __init__(self, sprites, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+        self.regions = {}
+        self.keys = {}
+        placements = []
+        x = y = shelf_height = 0
+
+        # Tallest first keeps each shelf tight; ties keep the manifest order stable.
+        ordered = sorted(sprites.items(), key=lambda item: -item[1].get_height())
+        for key, sprite in ordered:
+            if sprite in self.regions:
+                continue
+            w, h = sprite.get_size()
+            if x + w > width and x > 0:
+                x = 0
+                y += shelf_height + padding
+                shelf_height = 0
+            rect = pygame.Rect(x, y, w, h)
+            placements.append((sprite, rect))
+            self.regions[sprite] = rect
+            self.keys[key] = rect
+            x += w + padding
+            shelf_height = max(shelf_height, h)
+
+        self.surface = pygame.Surface((width, max(1, y + shelf_height)), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        for sprite, rect in placements:
+            # RGBA_MAX over a cleared surface copies pixels exactly instead of alpha-blending them.
+            self.surface.blit(sprite, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def region(self, key):
+        return self.keys[key]
+
+    def __contains__(self, sprite):
+        return sprite in self.regions
+
+
+class RenderQueue:
+    """
+    Collects the gameplay scene's draws for one frame and flushes them layer by layer with Surface.blits.
+    Sprites that are fully off-screen are dropped at submit time. Primitive drawing (lines, circles)
+    goes through submit_call so it keeps its place between the sprites of the same layer.
+    """
+
+    def __init__(self, bounds, atlas=None):
+        self.bounds = pygame.Rect(bounds)
+        self.atlas = atlas
+        self.layers = {}
+        self.stats = {"submitted": 0, "culled": 0, "batches": 0, "calls": 0, "atlas": 0}
+
+    def set_bounds(self, bounds):
+        self.bounds = pygame.Rect(bounds)
+
+    def _layer(self, layer):
+        entries = self.layers.get(layer)
+        if entries is None:
+            entries = self.layers[layer] = []
+        return entries
+
+    def submit(self, source, dest, layer=LAYER_ATTACKS, area=None):
+        """Queue a blit of source at dest (a position or rect), reading from the atlas when it holds source."""
+        self.stats["submitted"] += 1
+        if area is None:
+            width, height = source.get_size()
+        else:
+            width, height = area[2], area[3]
+        x, y = dest[0], dest[1]
+        bounds = self.bounds
+        if x >= bounds.right or y >= bounds.bottom or x + width <= bounds.left or y + height <= bounds.top:
+            self.stats["culled"] += 1
+            return
+
+        if area is None and self.atlas is not None:
+            region = self.atlas.regions.get(source)
+            if region is not None:
+                self.stats["atlas"] += 1
+                self._layer(layer).append((self.atlas.surface, (x, y), region))
+                return
+        if area is None:
+            self._layer(layer).append((source, (x, y)))
+        else:
+            self._layer(layer).append((source, (x, y), area))
+
+    def submit_many(self, entries, layer=LAYER_PROJECTILES):
+        """Queue (source, position) pairs the caller has already culled against bounds."""
+        self.stats["submitted"] += len(entries)
+        self._layer(layer).extend(entries)
+
+    def submit_call(self, function, *args, layer=LAYER_ATTACKS):
+        """Queue function(target, *args), e.g. pygame.draw.line, at this point in the layer."""
+        self._layer(layer).append((None, function, args))
+
+    def flush(self, target):
+        """Draw every queued layer in order onto target and empty the queue."""
+        stats = self.stats
+        for layer in sorted(self.layers):
+            entries = self.layers[layer]
+            batch = []
+            for entry in entries:
+                if entry[0] is None:
+                    if batch:
+                        target.blits(batch, doreturn=False)
+                        stats["batches"] += 1
+                        batch = []
+                    entry[1](target, *entry[2])
+                    stats["calls"] += 1
+                else:
+                    batch.append(entry)
+            if batch:
+                target.blits(batch, doreturn=False)
+                stats["batches"] += 1
+            entries.clear()
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
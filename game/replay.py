@@ -0,0 +1,180 @@
+import random
+import struct
+import zlib
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+from game.checkpoints import CHECKPOINT_BUDGET, CHECKPOINT_INTERVAL, CheckpointStore, restore
+
+REPLAY_MAGIC = b"UNCKRPL1"
+# Version 2: runs draw from per-run RunRandom streams rather than the global random module.
+REPLAY_VERSION = 2
+# Magic, version, seed, sim rate, screen size, tick count, then the run's final time and attack count.
+REPLAY_HEADER = struct.Struct("<8sHQHHHIdI")
+# One stretch of identical input: tick count, movement bitmask.
+REPLAY_RUN = struct.Struct("<HB")
+MAX_RUN_TICKS = 0xFFFF
+REPLAY_SUFFIX = ".rpl"
+
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+
+
+def new_run_seed():
+    """A fresh 63-bit seed that does not disturb the global random stream."""
+    return random.SystemRandom().getrandbits(63)
+
+
+def encode_move(move):
+    move_x, move_y = move
+    return (
+        (MOVE_LEFT if move_x < 0 else 0)
+        | (MOVE_RIGHT if move_x > 0 else 0)
+        | (MOVE_UP if move_y < 0 else 0)
+        | (MOVE_DOWN if move_y > 0 else 0)
+    )
+
+
+def decode_move(mask):
+    move_x = (1 if mask & MOVE_RIGHT else 0) - (1 if mask & MOVE_LEFT else 0)
+    move_y = (1 if mask & MOVE_DOWN else 0) - (1 if mask & MOVE_UP else 0)
+    return move_x, move_y
+
+
+class ReplayRecorder:
+    """
+    Records a run as its RNG seed plus the movement bitmask of every simulation tick, run-length
+    encoded, so a five-minute run is a few KB. Everything else is re-simulated on playback.
+    """
+
+    def __init__(self, seed, sim_hz, screen_size):
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.screen_size = tuple(screen_size)
+        self.runs = []
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.attacks = 0
+        # Set when something outside the recorded input changed the run, such as a window resize.
+        self.invalid = False
+
+    def record(self, move):
+        mask = encode_move(move)
+        runs = self.runs
+        if runs and runs[-1][1] == mask and runs[-1][0] < MAX_RUN_TICKS:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, mask])
+        self.ticks += 1
+
+    def finish(self, elapsed, attacks):
+        self.elapsed = elapsed
+        self.attacks = attacks
+
+    def to_bytes(self):
+        width, height = self.screen_size
+        header = REPLAY_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.sim_hz, width, height, self.ticks, self.elapsed, self.attacks
+        )
+        body = b"".join(REPLAY_RUN.pack(count, mask) for count, mask in self.runs)
+        return header + zlib.compress(body, 9)
+
+
+class Replay:
+    """A recording read back from disk."""
+
+    def __init__(self, seed, sim_hz, screen_size, ticks, elapsed, attacks, runs):
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.screen_size = screen_size
+        self.ticks = ticks
+        self.elapsed = elapsed
+        self.attacks = attacks
+        self.runs = runs
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError("replay is truncated")
+        magic, version, seed, sim_hz, width, height, ticks, elapsed, attacks = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("not a replay this build can read")
+        try:
+            body = zlib.decompress(data[REPLAY_HEADER.size :])
+        except zlib.error as error:
+            raise ValueError(f"replay body is damaged: {error}") from error
+        runs = [list(run) for run in REPLAY_RUN.iter_unpack(body)]
+        if sum(count for count, _ in runs) != ticks:
+            raise ValueError("replay input does not cover every tick")
+        return cls(seed, sim_hz, (width, height), ticks, elapsed, attacks, runs)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def moves(self):
+        """The move of every recorded tick, in order."""
+        for count, mask in self.runs:
+            move = decode_move(mask)
+            for _ in range(count):
+                yield move
+
+
+class ReplayPlayer:
+    """
+    Replay input that can also seek. Moves are looked up by the run's tick rather than streamed, and
+    while the run plays forward the world is checkpointed every interval seconds of gameplay, so seeking
+    restores the nearest earlier checkpoint and re-simulates at most one interval instead of the whole run.
+    step(run_state, move) must advance the run by one tick, as simulation.step_run does.
+    """
+
+    def __init__(self, replay, step, interval=CHECKPOINT_INTERVAL, budget=CHECKPOINT_BUDGET, shared=()):
+        self.replay = replay
+        self.step = step
+        # First tick of each input run, for bisecting a tick to its move.
+        self.starts = [0, *accumulate(count for count, _ in replay.runs)][:-1]
+        self.checkpoints = CheckpointStore(round(interval * replay.sim_hz), budget, shared)
+        self.done = False
+
+    def reset(self):
+        self.done = False
+
+    def move_at(self, tick):
+        """The recorded move for tick, or None past the end of the recording."""
+        if not 0 <= tick < self.replay.ticks:
+            return None
+        return decode_move(self.replay.runs[bisect_right(self.starts, tick) - 1][1])
+
+    def next_move(self, run_state):
+        """The move for the run's next tick, checkpointing the run first when one is due."""
+        tick = run_state["ticks"]
+        if self.checkpoints.due(tick):
+            self.checkpoints.add(run_state)
+        move = self.move_at(tick)
+        if move is None:
+            self.done = True
+        return move
+
+    def seek(self, run_state, tick):
+        """
+        Bring run_state to tick, clamped to the recording. Returns how many ticks were re-simulated,
+        or None when the run cannot get there: seeking back before the first checkpoint, or a paused clock.
+        """
+        tick = max(0, min(tick, self.replay.ticks - 1))
+        current = run_state["ticks"]
+        checkpoint = self.checkpoints.nearest(tick)
+        # Playing on from where the run already is beats restoring a checkpoint behind it.
+        if checkpoint is not None and not checkpoint.tick <= current <= tick:
+            restore(run_state, checkpoint)
+        elif current > tick:
+            return None
+        self.done = False
+        simulated = 0
+        while run_state["ticks"] < tick:
+            if not self.step(run_state, self.next_move(run_state)):
+                return None
+            simulated += 1
+        return simulated
@@ -0,0 +1,27 @@
+import random
+
+
+class RunRandom:
+    """
+    A run's random streams. gameplay drives everything that changes the simulation (pen targets,
+    attack choice, attack layouts); cosmetic drives what only changes how a frame looks, so drawing
+    at a different frame rate never shifts gameplay. Both derive from one seed.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        root = random.Random(seed)
+        self.gameplay = random.Random(root.getrandbits(64))
+        self.cosmetic = random.Random(root.getrandbits(64))
+
+    def getstate(self):
+        return self.gameplay.getstate(), self.cosmetic.getstate()
+
+    def setstate(self, state):
+        gameplay, cosmetic = state
+        self.gameplay.setstate(gameplay)
+        self.cosmetic.setstate(cosmetic)
+
+
+# Fallback for objects built outside a run, such as menus or one-off previews.
+UNSEEDED_RANDOM = RunRandom()
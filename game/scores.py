@@ -0,0 +1,179 @@
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from game.persistence import get_data_dir
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    time REAL NOT NULL,
+    attacks INTEGER NOT NULL,
+    saved_at TEXT NOT NULL,
+    replay TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_rank ON runs (time DESC, attacks DESC);
+CREATE INDEX IF NOT EXISTS runs_by_name ON runs (name, time DESC, attacks DESC);
+CREATE INDEX IF NOT EXISTS runs_by_saved_at ON runs (saved_at);
+-- Run counts per tenth of a second, kept by a trigger, so ranking a run sums a few thousand buckets
+-- and scans only its own bucket's rows instead of every run ahead of it.
+CREATE TABLE IF NOT EXISTS time_buckets (bucket INTEGER PRIMARY KEY, runs INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS runs_by_bucket ON runs (CAST(time * 10 AS INTEGER), time, attacks);
+CREATE TRIGGER IF NOT EXISTS runs_count_bucket AFTER INSERT ON runs BEGIN
+    INSERT INTO time_buckets (bucket, runs) VALUES (CAST(NEW.time * 10 AS INTEGER), 1)
+    ON CONFLICT (bucket) DO UPDATE SET runs = runs + 1;
+END;
+"""
+# Leaderboard order: survival time first, attack count second.
+RANK_ORDER = "ORDER BY time DESC, attacks DESC"
+
+
+def normalize_run(item):
+    """A runs row from a saved score dict, or None when the dict is not a usable score."""
+    if not isinstance(item, dict):
+        return None
+    try:
+        run_time = max(0.0, float(item.get("time", 0.0)))
+        attacks = int(item.get("attacks", 0))
+    except (TypeError, ValueError):
+        return None
+    name = str(item.get("name") or "Anonymous")
+    saved_at = str(item.get("saved_at") or datetime.now().isoformat(timespec="seconds"))
+    replay = item.get("replay")
+    return name, run_time, attacks, saved_at, str(replay) if replay else None
+
+
+def read_json_runs(path):
+    """Runs from a scores.json style file: a list of {name, time, attacks, saved_at, replay} dicts."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [row for row in map(normalize_run, data) if row is not None]
+
+
+class ScoreStore:
+    """
+    Every saved run in one SQLite table. Rows are only ever inserted; leaderboard, personal-best and
+    percentile queries are index range scans, so they stay quick with hundreds of thousands of runs.
+    One connection is shared by the main thread (queries) and the persistence worker (inserts).
+    """
+
+    def __init__(self, path, legacy_json=None):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version == 1:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN replay TEXT")
+            if version < SCHEMA_VERSION:
+                self.connection.executescript(SCHEMA)
+            if version == 0 and legacy_json is not None and Path(legacy_json).exists():
+                # The JSON table only ever held the top 20; bring those across once.
+                self._insert_rows(read_json_runs(legacy_json))
+            if version < SCHEMA_VERSION:
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _insert_rows(self, rows):
+        self.connection.executemany("INSERT INTO runs (name, time, attacks, saved_at, replay) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def add(self, item):
+        """Append one run; item is a {name, time, attacks, saved_at} dict, optionally with its replay file name."""
+        row = normalize_run(item)
+        if row is None:
+            raise ValueError(f"not a score: {item!r}")
+        with self.lock, self.connection:
+            self._insert_rows([row])
+
+    def add_many(self, items):
+        """Append many runs in one transaction; returns how many were usable."""
+        rows = [row for row in map(normalize_run, items) if row is not None]
+        with self.lock, self.connection:
+            self._insert_rows(rows)
+        return len(rows)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def top(self, limit=10):
+        """The best runs as score dicts, best first."""
+        rows = self._query(f"SELECT name, time, attacks, saved_at, replay FROM runs {RANK_ORDER} LIMIT ?", (limit,))
+        return [
+            {"name": name, "time": run_time, "attacks": attacks, "saved_at": saved_at, "replay": replay}
+            for name, run_time, attacks, saved_at, replay in rows
+        ]
+
+    def best_time(self):
+        return self._query("SELECT MAX(time) FROM runs")[0][0] or 0.0
+
+    def personal_best(self, name):
+        """The best run saved under name, or None."""
+        rows = self._query(f"SELECT time, attacks, saved_at FROM runs WHERE name = ? {RANK_ORDER} LIMIT 1", (name,))
+        if not rows:
+            return None
+        run_time, attacks, saved_at = rows[0]
+        return {"name": name, "time": run_time, "attacks": attacks, "saved_at": saved_at}
+
+    def count(self):
+        return self._query("SELECT COALESCE(SUM(runs), 0) FROM time_buckets")[0][0]
+
+    def standing(self, run_time, attacks):
+        """
+        Where a run would place: rank 1 is the best, and percentile is the share of saved runs it beats.
+        Ties on both time and attacks count as neither ahead nor behind.
+        """
+        bucket_of = "CAST(time * 10 AS INTEGER) = CAST(? * 10 AS INTEGER)"
+        ahead, behind, total = self._query(
+            "SELECT "
+            "(SELECT COALESCE(SUM(runs), 0) FROM time_buckets WHERE bucket > CAST(? * 10 AS INTEGER)) + "
+            f"(SELECT COUNT(*) FROM runs WHERE {bucket_of} AND (time > ? OR (time = ? AND attacks > ?))), "
+            "(SELECT COALESCE(SUM(runs), 0) FROM time_buckets WHERE bucket < CAST(? * 10 AS INTEGER)) + "
+            f"(SELECT COUNT(*) FROM runs WHERE {bucket_of} AND (time < ? OR (time = ? AND attacks < ?))), "
+            "(SELECT COALESCE(SUM(runs), 0) FROM time_buckets)",
+            (run_time, run_time, run_time, run_time, attacks, run_time, run_time, run_time, run_time, attacks),
+        )[0]
+        return {
+            "rank": ahead + 1,
+            "total": total,
+            "percentile": 100.0 * behind / total if total else 100.0,
+        }
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or bulk-load the score history")
+    parser.add_argument("--db", default=None, help="score database (default: scores.db in the game's data folder)")
+    parser.add_argument("--import-json", nargs="*", default=[], metavar="FILE", help="append runs from scores.json style files")
+    parser.add_argument("--top", type=int, default=10, help="print this many of the best runs")
+    args = parser.parse_args()
+
+    store = ScoreStore(args.db or get_data_dir() / "scores.db")
+    for path in args.import_json:
+        started = time.perf_counter()
+        added = store.add_many(read_json_runs(path))
+        print(f"{path}: {added} runs in {time.perf_counter() - started:.2f}s")
+    print(f"{store.count()} runs")
+    for index, item in enumerate(store.top(args.top), start=1):
+        print(f"{index:>3}. {item['name']:<20}{item['time']:>9.2f}s{item['attacks']:>6} attacks  {item['saved_at']}  {item['replay'] or ''}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+import argparse
+import math
+import os
+import random
+import time
+
+# The headless runner never opens a real window, so pick SDL's dummy drivers before pygame loads.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game import simulation
+from game.assets.loader import ASSET_PATH, load_asset, load_attack_assets
+from game.attacks.registry import ATTACK_TYPES
+from game.checkpoints import CHECKPOINT_BUDGET, CHECKPOINT_INTERVAL
+from game.collision import shape_hits
+from game.replay import Replay, ReplayPlayer, new_run_seed
+from game.statehash import TraceChecker, WorldHasher, read_trace, write_trace
+from game.timing import SIM_HZ
+from game.utils import recalc_geometry
+
+# The nine moves a keyboard player can make, standing still first.
+ALL_MOVES = tuple((move_x, move_y) for move_x in (0, -1, 1) for move_y in (0, -1, 1))
+
+
+class IdleInput:
+    """Scripted player that never moves."""
+
+    def __init__(self, seed=None, area_rect=None):
+        pass
+
+    def reset(self):
+        pass
+
+    def next_move(self, run_state):
+        return 0, 0
+
+
+class WanderInput:
+    """Scripted player that holds a random 8-way direction for a short while, then picks another."""
+
+    def __init__(self, seed=None, area_rect=None, hold_time=0.45):
+        self.rng = random.Random(seed)
+        self.hold_time = hold_time
+        self.move = (0, 0)
+        self.next_change = 0.0
+
+    def reset(self):
+        self.next_change = 0.0
+
+    def next_move(self, run_state):
+        if run_state["elapsed_time"] >= self.next_change:
+            self.move = (self.rng.choice((-1, 0, 1)), self.rng.choice((-1, 0, 1)))
+            self.next_change = run_state["elapsed_time"] + self.hold_time
+        return self.move
+
+
+class DodgeInput:
+    """
+    Bot that looks a short way ahead along each of the nine moves and takes the one whose hitbox would
+    touch the fewest hazards: attack shapes including their telegraphs, and projectiles where they will
+    be. Between equally safe moves it keeps its current one, then heads for the middle of the dodge zone.
+    It decides every few ticks, like a player's reaction time. area_rect is the game's dodge zone.
+    """
+
+    def __init__(self, seed=None, area_rect=None, lookahead=0.2, reaction_ticks=6, margin=6):
+        if area_rect is None:
+            raise ValueError("DodgeInput needs the game's area_rect")
+        self.area = area_rect
+        self.lookahead = lookahead
+        self.reaction_ticks = reaction_ticks
+        self.margin = margin
+        self.reset()
+
+    def reset(self):
+        self.move = (0, 0)
+        self.wait = 0
+
+    def _danger(self, box, shapes, ahead, size):
+        danger = sum(1 for shape in shapes if shape_hits(shape, box))
+        if len(ahead):
+            danger += int(((ahead < box.bottomright) & (ahead + size > box.topleft)).all(axis=1).sum())
+        return danger
+
+    def next_move(self, run_state):
+        if self.wait > 0:
+            self.wait -= 1
+            return self.move
+        self.wait = self.reaction_ticks - 1
+
+        shapes = []
+        for attack in run_state["active_attacks"]:
+            shapes.extend(attack.get_debug_hitboxes())
+        pool = run_state["projectiles"]
+        for projectile in pool.objects:
+            shapes.extend(projectile.get_debug_hitboxes())
+        count = pool.count
+        ahead = pool.pos[:count] + pool.vel[:count] * self.lookahead - pool.half[:count]
+
+        player = run_state["player"]
+        reach = player.speed * self.lookahead
+        hitbox = player.get_hitbox()
+        best = None
+        for move in ALL_MOVES:
+            scale = reach / (math.hypot(*move) or 1.0)
+            box = hitbox.move(round(move[0] * scale), round(move[1] * scale)).clamp(self.area).inflate(self.margin * 2, self.margin * 2)
+            center_distance = math.hypot(box.centerx - self.area.centerx, box.centery - self.area.centery)
+            score = (self._danger(box, shapes, ahead, pool.size[:count]), move != self.move, center_distance)
+            if best is None or score < best[0]:
+                best = (score, move)
+        self.move = best[1]
+        return self.move
+
+
+# Each is built as cls(seed, area_rect).
+PLAYER_INPUTS = {
+    "idle": IdleInput,
+    "wander": WanderInput,
+    "dodge": DodgeInput,
+}
+
+
+def open_headless_display(size):
+    """Set a dummy video mode so sprites can convert and attacks can read the screen size."""
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+class HeadlessGame:
+    """The gameplay pipeline from game.main without drawing, event handling or frame pacing."""
+
+    def __init__(self, size=(1280, 850), sim_hz=SIM_HZ, attack_types=None):
+        self.screen = open_headless_display(size)
+        _, _, self.area_rect, self.top_area = recalc_geometry(self.screen)
+        self.step = 1.0 / sim_hz
+        self.attack_types = attack_types or ATTACK_TYPES
+        self.assets = load_attack_assets(ASSET_PATH)
+        self.player_image = load_asset("checkbox_icon")
+        self.pen_image = load_asset("pen_img")
+
+    def new_run(self, seed=None):
+        return simulation.create_run_state(self.player_image, self.pen_image, self.screen.get_size(), self.top_area, seed=seed)
+
+    def play(self, player_input, max_seconds, run_state=None, monitor=None):
+        """
+        Step one run until the player dies, max_seconds of gameplay time have passed, or the input runs out.
+        monitor.update(run_state) runs after every tick, e.g. to hash the world, and may return True to stop.
+        """
+        run_state = run_state or self.new_run()
+        player_input.reset()
+        while run_state["player"].alive and run_state["elapsed_time"] < max_seconds:
+            move = player_input.next_move(run_state)
+            if move is None:
+                break
+            self.tick(run_state, move)
+            if monitor is not None and monitor.update(run_state):
+                break
+        return run_state
+
+    def tick(self, run_state, move):
+        """Advance one run by a single simulation step."""
+        return simulation.step_run(run_state, self.step, self.area_rect, self.attack_types, self.assets, move)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run Unchecked headless, as fast as the CPU allows")
+    parser.add_argument("--seconds", type=float, default=120.0, help="simulated seconds to run in total")
+    parser.add_argument("--player", choices=sorted(PLAYER_INPUTS), default="wander", help="scripted player input")
+    parser.add_argument("--seed", type=int, default=None, help="seed for every run's random streams and the scripted player")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="fixed gameplay simulation rate")
+    parser.add_argument("--width", type=int, default=1280, help="virtual screen width")
+    parser.add_argument("--height", type=int, default=850, help="virtual screen height")
+    parser.add_argument("--single-run", action="store_true", help="stop when the player dies instead of starting a new run")
+    parser.add_argument("--hash", action="store_true", help="hash the world every tick and print the session's world hash")
+    parser.add_argument("--verify", action="store_true", help="play the session twice and report the first tick where the runs differ")
+    parser.add_argument("--trace-out", metavar="PATH", help="save the session's per-tick world hashes, to check a later build against")
+    parser.add_argument("--check-trace", metavar="PATH", help="replay the session a trace was saved from and report the first tick that differs")
+    parser.add_argument("--replay", metavar="PATH", help="re-simulate a recorded run and check it ends the same way")
+    parser.add_argument("--seek", type=float, nargs="*", default=[], metavar="SECONDS", help="with --replay, then seek to these gameplay times")
+    parser.add_argument("--checkpoint-interval", type=float, default=CHECKPOINT_INTERVAL, help="gameplay seconds between replay checkpoints")
+    parser.add_argument("--checkpoint-budget", type=float, default=CHECKPOINT_BUDGET / (1024 * 1024), help="MiB replay checkpoints may use")
+    return parser.parse_args()
+
+
+def play_replay(path, seek_times=(), interval=CHECKPOINT_INTERVAL, budget=CHECKPOINT_BUDGET, hash_world=False):
+    """Re-simulate a replay at its recorded screen size and rate, then time any seeks; returns a process exit code."""
+    try:
+        replay = Replay.load(path)
+    except (OSError, ValueError) as error:
+        raise SystemExit(f"cannot play {path}: {error}")
+    game = HeadlessGame(replay.screen_size, replay.sim_hz)
+    player = ReplayPlayer(replay, game.tick, interval, budget, shared=(game.assets,))
+    hasher = WorldHasher() if hash_world else None
+    started = time.perf_counter()
+    run_state = game.play(player, float("inf"), game.new_run(replay.seed), hasher)
+    wall = time.perf_counter() - started
+    matches = run_state["ticks"] == replay.ticks and run_state["attack_count"] == replay.attacks and run_state["elapsed_time"] == replay.elapsed
+    print(f"recorded: {replay.ticks} ticks  time {replay.elapsed:.3f}s  attacks {replay.attacks}")
+    print(f"replayed: {run_state['ticks']} ticks  time {run_state['elapsed_time']:.3f}s  attacks {run_state['attack_count']}  in {wall:.2f}s")
+    if hasher is not None:
+        print(f"world hash: {hasher.chain:08x}")
+    checkpoints = player.checkpoints
+    print(f"checkpoints: {len(checkpoints)} every {checkpoints.interval} ticks, {checkpoints.size / 1024:.0f} KiB")
+    for seconds in seek_times:
+        started = time.perf_counter()
+        simulated = player.seek(run_state, round(seconds * replay.sim_hz))
+        wall = time.perf_counter() - started
+        print(f"seek {seconds:.1f}s: at tick {run_state['ticks']}, {simulated} ticks re-simulated in {wall * 1000:.1f} ms")
+    print("replay matches" if matches else "replay DIVERGED")
+    pygame.quit()
+    return 0 if matches else 1
+
+
+def play_session(game, settings, monitor=None):
+    """Play back-to-back runs for settings["seconds"] of gameplay; returns the finished run states."""
+    # Each run gets its own seed, drawn from the session seed, so run N of a session is reproducible on its own.
+    run_seeds = random.Random(settings["seed"])
+    player_input = PLAYER_INPUTS[settings["player"]](settings["seed"], game.area_rect)
+    simulated = 0.0
+    runs = []
+    while simulated < settings["seconds"]:
+        run_state = game.play(player_input, settings["seconds"] - simulated, game.new_run(run_seeds.getrandbits(63)), monitor)
+        simulated += run_state["elapsed_time"]
+        runs.append(run_state)
+        # A run that ends alive either used up the time or was stopped by the monitor.
+        if settings["single_run"] or run_state["player"].alive:
+            break
+    return runs
+
+
+def check_session(game, settings, records):
+    """Play a session against recorded hashes and report the first tick that differs; returns a process exit code."""
+    checker = TraceChecker(records)
+    play_session(game, settings, checker)
+    divergence = checker.finish()
+    if divergence is None:
+        print(f"deterministic: all {checker.ticks} ticks match")
+        return 0
+    session_tick, run_tick, part = divergence
+    where = f"session tick {session_tick}"
+    if run_tick is not None:
+        where += f" (tick {run_tick} of its run, {run_tick / settings['sim_hz']:.3f}s in)"
+    print(f"DIVERGED at {where}: {part}")
+    return 1
+
+
+def main():
+    args = parse_args()
+    if args.replay:
+        return play_replay(args.replay, args.seek, args.checkpoint_interval, int(args.checkpoint_budget * 1024 * 1024), args.hash)
+    if args.check_trace:
+        try:
+            settings, records = read_trace(args.check_trace)
+        except (OSError, ValueError) as error:
+            raise SystemExit(f"cannot read {args.check_trace}: {error}")
+        game = HeadlessGame((settings["width"], settings["height"]), settings["sim_hz"])
+        code = check_session(game, settings, records)
+        pygame.quit()
+        return code
+
+    settings = {
+        "player": args.player,
+        "seed": args.seed,
+        "seconds": args.seconds,
+        "single_run": args.single_run,
+        "sim_hz": max(1, args.sim_hz),
+        "width": args.width,
+        "height": args.height,
+    }
+    if settings["seed"] is None and (args.verify or args.trace_out):
+        settings["seed"] = new_run_seed()
+        print(f"seed: {settings['seed']}")
+    game = HeadlessGame((args.width, args.height), settings["sim_hz"])
+    if args.verify:
+        hasher = WorldHasher(keep=True)
+        play_session(game, settings, hasher)
+        code = check_session(game, settings, hasher.records)
+        pygame.quit()
+        return code
+
+    if args.trace_out:
+        hasher = WorldHasher(keep=True)
+    else:
+        hasher = WorldHasher() if args.hash else None
+    started = time.perf_counter()
+    runs = play_session(game, settings, hasher)
+    wall = time.perf_counter() - started
+
+    simulated = sum(run["elapsed_time"] for run in runs)
+    ticks = sum(run["ticks"] for run in runs)
+    attacks = sum(run["attack_count"] for run in runs)
+    deaths = sum(1 for run in runs if not run["player"].alive)
+    peak_attacks = max(run["active_attacks"].peak for run in runs)
+    peak_projectiles = max(run["projectiles"].peak for run in runs)
+    print(f"runs: {len(runs)}  deaths: {deaths}  attacks: {attacks}  ticks: {ticks}")
+    print(f"peak live attacks: {peak_attacks}  peak live projectiles: {peak_projectiles}")
+    print(f"simulated: {simulated:.1f}s  wall: {wall:.2f}s  speed: {simulated / max(wall, 1e-9):.1f} sim s / wall s")
+    print(f"ticks per wall second: {ticks / max(wall, 1e-9):.0f}")
+    if hasher is not None:
+        print(f"world hash: {hasher.chain:08x}")
+    if args.trace_out:
+        write_trace(args.trace_out, settings, hasher)
+        print(f"wrote {hasher.ticks} ticks of hashes to {args.trace_out}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+from game.attacks.base import AttackBase
+from game.collision import CollisionStage
+from game.entities import EntityList
+from game.pen import Pen
+from game.player import Player
+from game.profiler import NULL_PROFILER
+from game.projectiles.pool import ProjectilePool
+from game.rng import RunRandom
+from game.timing import SimClock
+
+# Everything create_run_state builds; the whole of a run's gameplay state, which checkpoints capture.
+RUN_STATE_KEYS = (
+    "seed",
+    "player",
+    "pen",
+    "clock",
+    "rng",
+    "active_attacks",
+    "projectiles",
+    "collisions",
+    "elapsed_time",
+    "attack_count",
+    "ticks",
+)
+
+
+def create_run_state(player_image, pen_image, screen_size, top_area, seed=None):
+    """
+    Create the gameplay objects for one run, without any screen or menu state.
+    The run owns its random streams, so with a seed its pen targets and attacks repeat exactly, which replays rely on.
+    """
+    screen_width, screen_height = screen_size
+    clock = SimClock()
+    rng = RunRandom(seed)
+    return {
+        "seed": seed,
+        "player": Player(player_image, screen_width, screen_height),
+        "pen": Pen(pen_image, top_area, rng=rng),
+        "clock": clock,
+        "rng": rng,
+        "active_attacks": EntityList(),
+        "projectiles": ProjectilePool(clock),
+        "collisions": CollisionStage(),
+        "elapsed_time": 0.0,
+        "attack_count": 0,
+        "ticks": 0,
+    }
+
+
+def register_attack(run_state, attack):
+    """Add a spawned attack to the active list and count it toward the run total."""
+    run_state["active_attacks"].append(attack)
+    run_state["attack_count"] += 1
+
+
+def spawn_attack(run_state, attack_types, assets):
+    """Spawn a random attack from the pen's current draw position."""
+    attack_cls = run_state["rng"].gameplay.choice(attack_types)
+    attack = attack_cls(run_state["pen"].get_rect(), run_state["player"].get_rect(), assets, clock=run_state["clock"], rng=run_state["rng"])
+    register_attack(run_state, attack)
+    return attack
+
+
+def attack_finished(attack):
+    return attack.finished
+
+
+def step_run(run_state, dt, area_rect, attack_types, assets, move=None, profiler=NULL_PROFILER):
+    """Advance one run by a single simulation step; move overrides keyboard input when given."""
+    dt = run_state["clock"].advance(dt)
+    if dt <= 0.0:
+        return False
+
+    run_state["ticks"] += 1
+    run_state["elapsed_time"] += dt
+    run_state["player"].update(dt, area_rect, move)
+    profiler.lap("player")
+    run_state["pen"].update(dt)
+
+    if run_state["pen"].ready_to_attack():
+        spawn_attack(run_state, attack_types, assets)
+        run_state["pen"].pick_new_target()
+    profiler.lap("pen")
+
+    attacks = run_state["active_attacks"]
+    projectiles = run_state["projectiles"]
+    for attack in attacks.current():
+        # Whatever this attack fires, directly or by handing it back, is credited to it.
+        projectiles.current_source = type(attack).__name__
+        spawned = attack.update(dt, projectiles, run_state["player"]) or []
+        for obj in spawned:
+            if isinstance(obj, AttackBase):
+                register_attack(run_state, obj)
+            else:
+                projectiles.append(obj)
+    projectiles.current_source = None
+    profiler.lap("attacks")
+    run_state["projectiles"].update(dt, run_state["player"])
+    profiler.lap("projectiles")
+
+    # Every hit this step is resolved here, against one snapshot of the player's hitbox.
+    run_state["collisions"].run(run_state["player"], attacks, run_state["projectiles"])
+    attacks.remove_where(attack_finished)
+    run_state["projectiles"].remove_finished(run_state["player"])
+    profiler.lap("collisions")
+    return True
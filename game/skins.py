@@ -0,0 +1,250 @@
+import queue
+import threading
+from collections import deque
+
+import pygame
+
+from game.assets.pack import open_pack, source_signature, surface_entry, write_pack
+from game.utils import LRUCache
+
+ICON_CACHE_FILE = "icons.pack"
+# Decoded icons kept in memory; rows scrolled out of view are evicted oldest first.
+ICON_CACHE_LIMIT = 256
+
+
+def load_character_surface(path, size, convert=True):
+    """Load a custom character PNG and normalize it to the drawing size."""
+    try:
+        surface = pygame.image.load(str(path))
+        if convert:
+            surface = surface.convert_alpha()
+        if surface.get_size() != size:
+            surface = pygame.transform.smoothscale(surface, size)
+    except (OSError, ValueError, pygame.error):
+        return None
+    return surface
+
+
+def surface_has_ink(surface):
+    """Return true when the surface has at least one visible pixel."""
+    return pygame.mask.from_surface(surface).count() > 0
+
+
+class SkinRegistry:
+    """
+    Player-size icons for custom characters, keyed by character id.
+    Registering characters does no file I/O: icons are read on demand, either synchronously with icon()
+    or by a background thread for the rows the character picker asks for with request(), and only the
+    most recently used ones stay decoded. Icons are cached in a pack beside the PNGs, keyed by file name
+    and checked against the PNG's size and mtime, so unchanged characters are never decoded again.
+    """
+
+    def __init__(self, characters_dir, character_size, icon_size, cache_name=ICON_CACHE_FILE, icon_limit=ICON_CACHE_LIMIT):
+        self.characters_dir = characters_dir
+        self.character_size = character_size
+        self.icon_size = icon_size
+        self.cache_path = characters_dir / cache_name
+        # The pack is opened on first use, so startup does not parse an index it may never need.
+        self.pack = None
+        self.pack_opened = False
+        self.pack_lock = threading.Lock()
+
+        self.icons = LRUCache(icon_limit)
+        self.files = {}
+        # Icons not yet written to the cache file: file name -> write_pack entry.
+        self.fresh = {}
+        self.dirty = False
+        self.stats = {"cached": 0, "decoded": 0, "invalid": 0}
+
+        self.wanted = set()
+        self.pending = deque()
+        self.queued = set()
+        self.results = queue.SimpleQueue()
+        self.wake = threading.Condition()
+        self.worker = None
+        self.closing = False
+
+    def load_surface(self, file_name):
+        """Decode a character's full-size drawing, e.g. to edit it."""
+        return load_character_surface(self.characters_dir / file_name, self.character_size)
+
+    def make_icon(self, surface):
+        return pygame.transform.smoothscale(surface, self.icon_size)
+
+    def register(self, records):
+        """Remember which file belongs to each character; icons are read later, when first shown."""
+        for record in records:
+            self.files[record["id"]] = record["file"]
+
+    def _open_pack(self):
+        if not self.pack_opened:
+            self.pack = open_pack(self.cache_path)
+            self.pack_opened = True
+        return self.pack
+
+    def _read_icon(self, file_name):
+        """
+        Return (icon, write_pack entry or None) for one character, or (None, None) when its file is
+        missing, unreadable or blank. Safe to call off the main thread: nothing here converts to the
+        display format.
+        """
+        signature = source_signature(self.characters_dir / file_name)
+        if signature is None:
+            return None, None
+        with self.pack_lock:
+            pack = self._open_pack()
+            if pack is not None:
+                entry = pack.index.get(file_name)
+                if entry is not None and entry["source"] == signature and tuple(entry["size"]) == tuple(self.icon_size):
+                    pixels = bytes(pack.pixels(file_name))
+                    return pygame.image.frombuffer(pixels, self.icon_size, "RGBA"), None
+
+        surface = load_character_surface(self.characters_dir / file_name, self.character_size, convert=False)
+        if surface is None or not surface_has_ink(surface):
+            return None, None
+        icon = self.make_icon(surface)
+        return icon, surface_entry(file_name, icon, signature)
+
+    def _store(self, character_id, icon, entry):
+        """Main thread: convert a read icon for fast blits and keep it in the LRU."""
+        if entry is None:
+            self.stats["cached"] += 1
+        else:
+            self.fresh[entry[0]] = entry
+            self.dirty = True
+            self.stats["decoded"] += 1
+        if pygame.display.get_surface() is not None:
+            icon = icon.convert_alpha()
+        return self.icons.put(character_id, icon)
+
+    def icon(self, character_id):
+        """The icon for one character, read right away if it is not in memory; None when the file is unusable."""
+        icon = self.icons.get(character_id)
+        if icon is not None or character_id not in self.files:
+            return icon
+        icon, entry = self._read_icon(self.files[character_id])
+        if icon is None:
+            self.stats["invalid"] += 1
+            return None
+        return self._store(character_id, icon, entry)
+
+    def peek(self, character_id):
+        """The icon if it is already decoded, without reading anything."""
+        return self.icons.peek(character_id)
+
+    def request(self, character_ids):
+        """
+        Ask the background reader for these icons, in order. Only the latest request is wanted:
+        queued ids that scrolled out of view are skipped instead of read.
+        """
+        with self.wake:
+            self.wanted = set(character_ids)
+            for character_id in character_ids:
+                if character_id in self.queued or character_id not in self.files:
+                    continue
+                if character_id in self.icons:
+                    self.icons.touch(character_id)
+                    continue
+                self.pending.append((character_id, self.files[character_id]))
+                self.queued.add(character_id)
+            if self.pending:
+                if self.worker is None:
+                    self.worker = threading.Thread(target=self._work, name="skin-icons", daemon=True)
+                    self.worker.start()
+                self.wake.notify()
+
+    def _work(self):
+        while True:
+            with self.wake:
+                while not self.pending and not self.closing:
+                    self.wake.wait()
+                if self.closing:
+                    return
+                character_id, file_name = self.pending.popleft()
+                wanted = character_id in self.wanted
+                if not wanted:
+                    self.queued.discard(character_id)
+            if wanted:
+                icon, entry = self._read_icon(file_name)
+                self.results.put((character_id, file_name, icon, entry))
+
+    def poll(self):
+        """Main thread: take in icons the reader finished and return the ids whose files turned out unusable."""
+        invalid = []
+        while True:
+            try:
+                character_id, file_name, icon, entry = self.results.get_nowait()
+            except queue.Empty:
+                return invalid
+            with self.wake:
+                self.queued.discard(character_id)
+            # The character may have been deleted or redrawn while its old file was being read.
+            if self.files.get(character_id) != file_name or character_id in self.icons:
+                continue
+            if icon is None:
+                self.stats["invalid"] += 1
+                invalid.append(character_id)
+                continue
+            self._store(character_id, icon, entry)
+
+    def update(self, record, surface):
+        """Refresh one character from the drawing being saved to its file."""
+        file_name = record["file"]
+        icon = self.make_icon(surface)
+        self.icons.put(record["id"], icon)
+        self.files[record["id"]] = file_name
+        # The PNG may still be waiting to be written; mark_saved() stamps the signature once it is.
+        self.fresh[file_name] = surface_entry(file_name, icon, None)
+        self.dirty = True
+        return icon
+
+    def mark_saved(self, file_name):
+        """Record the signature of a freshly saved PNG so its cached icon matches next launch."""
+        entry = self.fresh.get(file_name)
+        if entry is not None:
+            self.fresh[file_name] = (*entry[:3], source_signature(self.characters_dir / file_name))
+
+    def remove(self, character_id):
+        file_name = self.files.pop(character_id, None)
+        self.icons.discard(character_id)
+        if file_name is not None:
+            self.fresh.pop(file_name, None)
+            self.dirty = True
+
+    def close(self):
+        """Stop the background reader; queued reads are dropped."""
+        with self.wake:
+            self.closing = True
+            self.pending.clear()
+            self.wake.notify()
+        if self.worker is not None:
+            self.worker.join(timeout=1.0)
+            self.worker = None
+
+    def flush(self):
+        """Rewrite the icon cache with every live entry, reusing unchanged pixels straight from the old pack."""
+        if not self.dirty:
+            return False
+
+        with self.pack_lock:
+            pack = self._open_pack()
+            entries = []
+            for file_name in self.files.values():
+                if file_name in self.fresh:
+                    entries.append(self.fresh[file_name])
+                elif pack is not None and file_name in pack:
+                    entry = pack.index[file_name]
+                    entries.append((file_name, entry["size"], bytes(pack.pixels(file_name)), entry["source"]))
+
+            # The old mapping must be closed before the file is replaced (Windows refuses otherwise).
+            if pack is not None:
+                pack.close()
+            try:
+                write_pack(self.cache_path, entries)
+            except OSError:
+                self.pack = open_pack(self.cache_path)
+                return False
+            self.pack = open_pack(self.cache_path)
+        self.fresh.clear()
+        self.dirty = False
+        return True
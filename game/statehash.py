@@ -0,0 +1,258 @@
+import json
+import marshal
+import struct
+import sys
+import zlib
+from array import array
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+TRACE_MAGIC = b"UNCKHSH1"
+# Magic, then the byte length of the JSON header that follows it.
+TRACE_HEADER = struct.Struct("<8sI")
+
+# Each tick's record: these digests, the live attack count, then one digest per live attack.
+COMPONENTS = ("run", "player", "pen", "projectiles")
+# References to objects owned by someone else; they are hashed once, through their owner.
+SHARED_ATTRIBUTES = frozenset({"pen_rect", "player_rect", "assets", "clock", "rng"})
+# ProjectilePool columns that are gameplay state; the rest are for drawing or follow from the sprite.
+POOL_STATE_COLUMNS = ("pos", "vel", "speed", "damage", "spawn_time", "lifetime")
+PLAIN_TYPES = (bool, int, float, str, type(None))
+PLAIN_SET = frozenset(PLAIN_TYPES)
+# marshal format 2 writes floats as raw doubles but skips the shared-reference table of later formats,
+# which more than halves the cost of dumping small tuples.
+MARSHAL_VERSION = 2
+
+
+def _plain(value):
+    """value as something marshal can write, or None for sprites, classes and other non-state objects."""
+    # Exact type checks: NumPy scalars subclass float and int but marshal refuses them.
+    kind = type(value)
+    if kind in PLAIN_SET:
+        return value
+    if kind is dict:
+        return tuple([(key, item if type(item) in PLAIN_SET else _plain(item)) for key, item in value.items()])
+    if kind is list or kind is tuple:
+        return tuple([item if type(item) in PLAIN_SET else _plain(item) for item in value])
+    if isinstance(value, (pygame.Rect, pygame.Vector2)):
+        return tuple(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return None
+
+
+def _is_state(value):
+    """True for values worth hashing: anything but sprites, classes and references to other objects."""
+    if isinstance(value, (list, tuple)):
+        return all(map(_is_state, value))
+    if isinstance(value, dict):
+        return all(map(_is_state, value.values()))
+    return isinstance(value, (*PLAIN_TYPES, pygame.Rect, pygame.Vector2, np.generic))
+
+
+def _getter(names):
+    """itemgetter that always returns a tuple, even for zero or one name."""
+    if len(names) == 1:
+        name = names[0]
+        return lambda fields: (fields[name],)
+    if not names:
+        return lambda fields: ()
+    return itemgetter(*names)
+
+
+class FieldPlan:
+    """
+    Which of an object's fields are state, sorted by how they are written, worked out from the first
+    object seen with a given class and set of attribute names: plain values go to marshal as-is, rects
+    and vectors as tuples, and containers as they are unless they hold rects or vectors.
+    Sprites, classes and references to other objects are left out.
+    """
+
+    def __init__(self, obj):
+        plain, geometry, nested = [], [], []
+        for name, value in vars(obj).items():
+            if name in SHARED_ATTRIBUTES:
+                continue
+            if type(value) in PLAIN_SET:
+                plain.append(name)
+            elif isinstance(value, (pygame.Rect, pygame.Vector2)):
+                geometry.append(name)
+            elif _is_state(value):
+                nested.append(name)
+        # The class and field names seed the crc, so an added or renamed field changes the digest too.
+        self.seed = zlib.crc32(marshal.dumps((type(obj).__name__, plain, geometry, nested), MARSHAL_VERSION))
+        self.plain = _getter(plain)
+        self.geometry = _getter(geometry)
+        self.nested = _getter(nested)
+
+    def digest(self, fields):
+        plain = self.plain(fields)
+        geometry = tuple(map(tuple, self.geometry(fields)))
+        nested = self.nested(fields)
+        try:
+            data = marshal.dumps((plain, geometry, nested), MARSHAL_VERSION)
+        except ValueError:
+            if not nested:
+                raise
+            data = marshal.dumps((plain, geometry, tuple(map(_plain, nested))), MARSHAL_VERSION)
+        return zlib.crc32(data, self.seed)
+
+
+def object_digest(obj, plans):
+    """
+    crc32 of an object's class and its own fields: positions, rects, timers, phases and flags.
+    plans caches a FieldPlan per class and attribute set; give each hasher its own, so its digests
+    depend only on the run it watches.
+    """
+    fields = vars(obj)
+    # Objects only ever gain attributes, so the count tells attribute sets of one class apart;
+    # a plan naming a field the object lacks raises KeyError and is replaced.
+    key = (type(obj), len(fields))
+    plan = plans.get(key)
+    if plan is not None:
+        try:
+            return plan.digest(fields)
+        except (KeyError, TypeError, ValueError):
+            # A field changed kind since the plan was made, e.g. from None to a rect; plan again.
+            pass
+    plan = plans[key] = FieldPlan(obj)
+    return plan.digest(fields)
+
+
+def pool_digest(pool, plans):
+    """crc32 of the live rows of the pool's gameplay columns, then each object projectile."""
+    count = pool.count
+    digest = zlib.crc32(count.to_bytes(4, "little"))
+    if count:
+        for name in POOL_STATE_COLUMNS:
+            digest = zlib.crc32(getattr(pool, name)[:count], digest)
+    for projectile in pool.objects:
+        digest = zlib.crc32(object_digest(projectile, plans).to_bytes(4, "little"), digest)
+    return digest
+
+
+def tick_record(run_state, plans):
+    """The hashes of one tick: run counters, player, pen, projectiles, then each live attack in order."""
+    attacks = run_state["active_attacks"]
+    counters = (run_state["ticks"], run_state["elapsed_time"], run_state["attack_count"], run_state["clock"].time)
+    record = array("I", (
+        zlib.crc32(marshal.dumps(counters, MARSHAL_VERSION)),
+        object_digest(run_state["player"], plans),
+        object_digest(run_state["pen"], plans),
+        pool_digest(run_state["projectiles"], plans),
+        len(attacks),
+    ))
+    record.extend([object_digest(attack, plans) for attack in attacks])
+    return record
+
+
+def split_records(records):
+    """Per-tick records from a flat trace array."""
+    ticks = []
+    offset = 0
+    fixed = len(COMPONENTS) + 1
+    while offset < len(records):
+        end = offset + fixed + records[offset + fixed - 1]
+        ticks.append(records[offset:end])
+        offset = end
+    return ticks
+
+
+def describe_divergence(expected, actual, run_state):
+    """Name the first part of a tick's record that differs, using the live run to name attacks."""
+    for index, component in enumerate(COMPONENTS):
+        if expected[index] != actual[index]:
+            return component
+    fixed = len(COMPONENTS) + 1
+    if expected[fixed - 1] != actual[fixed - 1]:
+        return f"attack count ({expected[fixed - 1]} expected, {actual[fixed - 1]} live)"
+    attacks = run_state["active_attacks"]
+    for index in range(fixed, len(actual)):
+        if expected[index] != actual[index]:
+            attack = attacks[index - fixed]
+            return f"attack {index - fixed + 1} of {len(attacks)} ({type(attack).__name__})"
+    return "nothing"
+
+
+class WorldHasher:
+    """
+    Hashes a run's world once per tick and chains the records, so one 32-bit value covers a whole
+    session. Set keep to also keep every record, for writing a trace or checking a second run against.
+    """
+
+    def __init__(self, keep=False):
+        self.chain = 0
+        self.ticks = 0
+        self.records = array("I") if keep else None
+        self.plans = {}
+
+    def update(self, run_state):
+        record = tick_record(run_state, self.plans)
+        self.chain = zlib.crc32(record, self.chain)
+        self.ticks += 1
+        if self.records is not None:
+            self.records.extend(record)
+        return False
+
+
+class TraceChecker:
+    """Compares a run against stored records tick by tick; update() returns True at the first divergence."""
+
+    def __init__(self, records):
+        self.expected = split_records(records)
+        self.ticks = 0
+        self.plans = {}
+        # (session tick, the run's own tick or None, what differed) once the run has diverged.
+        self.divergence = None
+
+    def update(self, run_state):
+        actual = tick_record(run_state, self.plans)
+        self.ticks += 1
+        if self.ticks > len(self.expected):
+            self.divergence = (self.ticks, run_state["ticks"], "run continued past the end of the trace")
+            return True
+        expected = self.expected[self.ticks - 1]
+        if expected != actual:
+            self.divergence = (self.ticks, run_state["ticks"], describe_divergence(expected, actual, run_state))
+            return True
+        return False
+
+    def finish(self):
+        """Report a session that stopped before the trace did; returns the divergence, if any."""
+        if self.divergence is None and self.ticks < len(self.expected):
+            self.divergence = (self.ticks + 1, None, "session ended before the trace")
+        return self.divergence
+
+
+def _little_endian(records):
+    if sys.byteorder == "big":
+        records = array("I", records)
+        records.byteswap()
+    return records
+
+
+def write_trace(path, settings, hasher):
+    """Save a kept hasher's records with the settings that reproduce the session."""
+    header = json.dumps({**settings, "ticks": hasher.ticks, "chain": hasher.chain}, separators=(",", ":")).encode("utf-8")
+    body = zlib.compress(_little_endian(hasher.records).tobytes(), 6)
+    Path(path).write_bytes(TRACE_HEADER.pack(TRACE_MAGIC, len(header)) + header + body)
+
+
+def read_trace(path):
+    """(settings, records) from a trace file; raises ValueError when it is not one."""
+    data = Path(path).read_bytes()
+    if len(data) < TRACE_HEADER.size:
+        raise ValueError("trace is truncated")
+    magic, header_length = TRACE_HEADER.unpack_from(data)
+    if magic != TRACE_MAGIC:
+        raise ValueError("not a hash trace")
+    header_end = TRACE_HEADER.size + header_length
+    try:
+        settings = json.loads(data[TRACE_HEADER.size : header_end])
+        records = array("I", zlib.decompress(data[header_end:]))
+    except (json.JSONDecodeError, zlib.error, ValueError) as error:
+        raise ValueError(f"trace is damaged: {error}") from error
+    return settings, _little_endian(records)
@@ -0,0 +1,62 @@
+import pygame
+
+SIM_HZ = 120
+MAX_FRAME_TIME = 0.25
+
+
+class FixedStepClock:
+    """Accumulate real frame time and hand it out as fixed-size simulation steps."""
+
+    def __init__(self, step_hz=SIM_HZ, max_frame_time=MAX_FRAME_TIME):
+        self.step = 1.0 / step_hz
+        # A long stall (window drag, breakpoint) is dropped instead of replayed as a burst of steps.
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.steps_taken = 0
+
+    def advance(self, frame_dt):
+        """Add one rendered frame's time and return how many simulation steps are now due."""
+        self.accumulator += min(max(0.0, frame_dt), self.max_frame_time)
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.steps_taken += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step left in the accumulator, used to blend between the last two states."""
+        return self.accumulator / self.step
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+class SimClock:
+    """Gameplay time owned by a run, so timers can be paused, scaled or stepped faster than real time."""
+
+    def __init__(self, time_scale=1.0):
+        self.time = 0.0
+        self.time_scale = time_scale
+        self.paused = False
+
+    def advance(self, dt):
+        """Move gameplay time forward and return the scaled step the simulation should use."""
+        if self.paused:
+            return 0.0
+        scaled = dt * self.time_scale
+        self.time += scaled
+        return scaled
+
+    def get_ticks(self):
+        """Milliseconds of gameplay time, mirroring pygame.time.get_ticks for timers and pulses."""
+        return int(self.time * 1000)
+
+
+class WallClock:
+    """Fallback for objects built outside a run, such as menus or one-off previews."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+WALL_CLOCK = WallClock()
@@ -0,0 +1,136 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module; peak RSS is simply left out there.
+    resource = None
+
+
+def peak_rss_bytes():
+    """Peak resident size of the whole process, including SDL's own allocations, where the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class NullTracer:
+    """Tracer used when --trace-startup is off; phases and items cost one empty context manager."""
+
+    enabled = False
+
+    def phase(self, name):
+        return nullcontext()
+
+    def item(self, category, name):
+        return nullcontext()
+
+    def record_item(self, category, name, seconds):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class StartupTracer:
+    """
+    Records wall time and peak Python memory for each startup phase, plus per-item timings
+    (sprite decodes, custom characters) inside them, and prints a sorted report.
+    Python memory comes from tracemalloc; peak RSS is added where the platform provides it.
+    """
+
+    enabled = True
+
+    def __init__(self, process_started=None):
+        self.process_started = process_started or time.perf_counter()
+        self.phases = []
+        self.items = []
+        self.finished_at = None
+        tracemalloc.start()
+
+    def add_phase(self, name, started, ended, peak_bytes=None):
+        """Record a phase that was timed before the tracer existed, such as module imports."""
+        self.phases.append({"name": name, "seconds": ended - started, "peak_bytes": peak_bytes})
+
+    @contextmanager
+    def phase(self, name):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases.append(
+                {
+                    "name": name,
+                    "seconds": seconds,
+                    "peak_bytes": peak - before,
+                    "retained_bytes": current - before,
+                }
+            )
+
+    @contextmanager
+    def item(self, category, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_item(category, name, time.perf_counter() - started)
+
+    def record_item(self, category, name, seconds):
+        self.items.append({"category": category, "name": name, "seconds": seconds})
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+        tracemalloc.stop()
+
+    def to_dict(self):
+        ended = self.finished_at or time.perf_counter()
+        categories = {}
+        for item in self.items:
+            summary = categories.setdefault(item["category"], {"count": 0, "seconds": 0.0})
+            summary["count"] += 1
+            summary["seconds"] += item["seconds"]
+        total = ended - self.process_started
+        return {
+            "total_seconds": total,
+            # Module-level work between the traced phases (function and constant definitions, small setup).
+            "untraced_seconds": total - sum(phase["seconds"] for phase in self.phases),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "phases": sorted(self.phases, key=lambda phase: phase["seconds"], reverse=True),
+            "item_totals": categories,
+            "items": sorted(self.items, key=lambda item: item["seconds"], reverse=True),
+        }
+
+    def report(self, top_items=15):
+        data = self.to_dict()
+        lines = [f"startup: {data['total_seconds'] * 1000:.1f} ms to first frame"]
+        if data["peak_rss_bytes"] is not None:
+            lines[0] += f", peak RSS {data['peak_rss_bytes'] / (1024 * 1024):.1f} MiB"
+
+        lines.append(f"{'phase':<34}{'ms':>10}{'py peak KiB':>14}")
+        for phase in data["phases"]:
+            peak = phase["peak_bytes"]
+            peak_text = "-" if peak is None else f"{peak / 1024:.0f}"
+            lines.append(f"{phase['name']:<34}{phase['seconds'] * 1000:>10.2f}{peak_text:>14}")
+
+        lines.append(f"{'(untraced)':<34}{data['untraced_seconds'] * 1000:>10.2f}{'-':>14}")
+
+        for category, summary in sorted(data["item_totals"].items()):
+            lines.append(f"{category}: {summary['count']} loaded in {summary['seconds'] * 1000:.2f} ms")
+        if data["items"]:
+            lines.append(f"slowest items (top {min(top_items, len(data['items']))}):")
+            for item in data["items"][:top_items]:
+                lines.append(f"  {item['category']:<10}{item['name']:<30}{item['seconds'] * 1000:>9.2f} ms")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
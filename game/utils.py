@@ -1,5 +1,7 @@
 import math
 import random
+from collections import OrderedDict
+
 import pygame
 
 # Palette tuned for a light paper theme
@@ -10,12 +12,104 @@ INK = (35, 34, 30)
 INK_MUTED = (70, 68, 60)
 
 
+class LRUCache:
+    """Small least-recently-used cache with hit/miss counters for render-side lookups."""
+
+    def __init__(self, max_entries, max_bytes=None, weigh=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.weigh = weigh
+        self.entries = OrderedDict()
+        self.weights = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key):
+        """The cached value or None, without counting a lookup or refreshing its recency."""
+        return self.entries.get(key)
+
+    def touch(self, key):
+        """Mark key as just used, if it is cached."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def put(self, key, value):
+        if key in self.entries:
+            self._discard(key)
+        self.entries[key] = value
+        if self.weigh is not None:
+            weight = self.weigh(value)
+            self.weights[key] = weight
+            self.total_bytes += weight
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes and len(self.entries) > 1)
+        ):
+            self._discard(next(iter(self.entries)))
+        return value
+
+    def _discard(self, key):
+        del self.entries[key]
+        self.total_bytes -= self.weights.pop(key, 0)
+
+    def discard(self, key):
+        if key in self.entries:
+            self._discard(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.weights.clear()
+        self.total_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+FONT_CACHE = LRUCache(64)
+TEXT_CACHE = LRUCache(512)
+
+
 def get_font(size=28, bold=False):
+    key = (size, bold)
+    font = FONT_CACHE.get(key)
+    if font is not None:
+        return font
     if not pygame.font.get_init():
         pygame.font.init()
     font = pygame.font.Font(None, size)
     font.set_bold(bold)
-    return font
+    return FONT_CACHE.put(key, font)
 
 
 def load_scaled(path, size):
@@ -23,6 +117,45 @@ def load_scaled(path, size):
     return pygame.transform.scale(im, size)
 
 
+# Sprites rotate every frame, so angles snap to this step and the rotated frames are reused.
+ROTATION_STEP = 2.0
+TRANSFORM_CACHE = LRUCache(8192, max_bytes=96 * 1024 * 1024, weigh=surface_bytes)
+
+
+def quantize_angle(angle_deg, step=None):
+    step = step or ROTATION_STEP
+    return (round(angle_deg / step) * step) % 360.0
+
+
+def get_rotated(surface, angle_deg, step=None):
+    """Return the cached rotation of surface, snapped to the rotation step."""
+    angle = quantize_angle(angle_deg, step)
+    key = ("rotate", surface, angle)
+    rotated = TRANSFORM_CACHE.get(key)
+    if rotated is None:
+        rotated = TRANSFORM_CACHE.put(key, pygame.transform.rotate(surface, angle))
+    return rotated
+
+
+def get_scaled(surface, size, smooth=False):
+    """Return a cached resize of surface so per-attack scaling does not allocate every spawn."""
+    size = (int(size[0]), int(size[1]))
+    key = ("scale", surface, size, smooth)
+    scaled = TRANSFORM_CACHE.get(key)
+    if scaled is None:
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        scaled = TRANSFORM_CACHE.put(key, scale(surface, size))
+    return scaled
+
+
+def get_flipped(surface, flip_x, flip_y):
+    key = ("flip", surface, flip_x, flip_y)
+    flipped = TRANSFORM_CACHE.get(key)
+    if flipped is None:
+        flipped = TRANSFORM_CACHE.put(key, pygame.transform.flip(surface, flip_x, flip_y))
+    return flipped
+
+
 def clamp(val, min_v, max_v):
     return max(min_v, min(max_v, val))
 
@@ -72,6 +205,24 @@ def swing_hits_rect(origin, angle_deg, length, half_width, hit_rect):
     return abs(perp) <= half_width + player_radius and -reach <= along <= reach
 
 
+def segment_hits_rect(start, end, width, hit_rect):
+    """Test a thick segment (like a beam) against a rect, counting near misses within half the width."""
+    if hit_rect.clipline((int(start[0]), int(start[1])), (int(end[0]), int(end[1]))):
+        return True
+
+    start = pygame.Vector2(start)
+    beam_vector = pygame.Vector2(end) - start
+    center = pygame.Vector2(hit_rect.center)
+    beam_length_sq = beam_vector.length_squared()
+    if beam_length_sq <= 1e-6:
+        return start.distance_to(center) <= width * 0.5
+
+    projection = clamp((center - start).dot(beam_vector) / beam_length_sq, 0.0, 1.0)
+    closest_point = start + beam_vector * projection
+    radius = max(hit_rect.width, hit_rect.height) * 0.35
+    return closest_point.distance_to(center) <= (width * 0.5) + radius
+
+
 def jitter(value, amount):
     return value + random.randint(-amount, amount)
 
@@ -121,16 +272,24 @@ def fit_font_size(text, size, max_width=None, max_height=None, min_size=12, bold
     if max_width is None and max_height is None:
         return fitted_size
 
-    while fitted_size > min_size:
-        font = get_font(fitted_size, bold=bold)
-        text_width, text_height = font.size(text)
+    def fits(candidate):
+        text_width, text_height = get_font(candidate, bold=bold).size(text)
         fits_width = max_width is None or text_width <= max_width
         fits_height = max_height is None or text_height <= max_height
-        if fits_width and fits_height:
-            break
-        fitted_size -= 1
+        return fits_width and fits_height
 
-    return fitted_size
+    if fits(fitted_size):
+        return fitted_size
+
+    # Rendered text grows with the font size, so binary search for the largest size that fits.
+    low, high = min_size, fitted_size - 1
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
 
 
 def draw_panel(surface, rect, fill=(255, 255, 255, 110), border=INK, label=None, label_size=28, center_label=False):
@@ -156,6 +315,27 @@ def draw_panel(surface, rect, fill=(255, 255, 255, 110), border=INK, label=None,
             draw_hand_text(surface, label, rect.x + 18, rect.y + 14, size=label_size, max_width=rect.width - 28)
 
 
+HAND_TEXT_OFFSETS = ((0, 0), (1, 0), (0, 1), (-1, 0))
+
+
+def render_hand_text(text, size=28, color=INK, bold=False, max_width=None, max_height=None, min_size=12):
+    """Return a cached surface with the pen-drawn offsets already composited, plus its text origin."""
+    key = (text, size, tuple(color), bold, max_width, max_height, min_size)
+    cached = TEXT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    fitted_size = fit_font_size(text, size, max_width=max_width, max_height=max_height, min_size=min_size, bold=bold)
+    base = get_font(fitted_size, bold=bold).render(text, True, color)
+
+    # Start from transparent ink so the stacked antialiased passes keep the text color.
+    composite = pygame.Surface((base.get_width() + 2, base.get_height() + 1), pygame.SRCALPHA)
+    composite.fill((*tuple(color)[:3], 0))
+    for dx, dy in HAND_TEXT_OFFSETS:
+        composite.blit(base, (dx + 1, dy))
+    return TEXT_CACHE.put(key, (composite, base.get_size()))
+
+
 def draw_hand_text(
     surface,
     text,
@@ -170,18 +350,22 @@ def draw_hand_text(
     min_size=12,
 ):
     """Render text with small repeated offsets to feel more pen-drawn than perfectly typed."""
-    size = fit_font_size(text, size, max_width=max_width, max_height=max_height, min_size=min_size, bold=bold)
-    font = get_font(size, bold=bold)
-    base = font.render(text, True, color)
-    rect = base.get_rect()
+    composite, base_size = render_hand_text(
+        text,
+        size=size,
+        color=color,
+        bold=bold,
+        max_width=max_width,
+        max_height=max_height,
+        min_size=min_size,
+    )
+    rect = pygame.Rect((0, 0), base_size)
     if center:
         rect.center = (x, y)
     else:
         rect.topleft = (x, y)
 
-    offsets = [(0, 0), (1, 0), (0, 1), (-1, 0)]
-    for dx, dy in offsets:
-        surface.blit(base, rect.move(dx, dy))
+    surface.blit(composite, (rect.x - 1, rect.y))
     return rect
 
 
@@ -201,9 +385,13 @@ def blur_surface(surface, scale=0.18):
     return pygame.transform.smoothscale(small, (width, height))
 
 
-def draw_paper_background(surface, area_rect, top_area):
+_paper_background_cache = {}
+
+
+def _render_paper_background(size, area_rect, top_area):
+    surface = pygame.Surface(size)
     surface.fill(PAPER_BG)
-    w, h = surface.get_size()
+    w, h = size
     margin = 36
 
     # notebook ruling
@@ -219,6 +407,27 @@ def draw_paper_background(surface, area_rect, top_area):
 
     draw_sketched_rect(surface, top_area, color=INK_MUTED, jitter_amount=4, passes=3, width=2)
     draw_sketched_rect(surface, area_rect, color=INK, jitter_amount=4, passes=4, width=3)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def invalidate_paper_background():
+    """Drop cached backgrounds so the next draw rebuilds them for the new screen geometry."""
+    _paper_background_cache.clear()
+
+
+def draw_paper_background(surface, area_rect, top_area):
+    """Blit the notebook page, rendering it once per (screen size, area_rect, top_area) layout."""
+    key = (surface.get_size(), tuple(area_rect), tuple(top_area))
+    background = _paper_background_cache.get(key)
+    if background is None:
+        # The home page and the game scene use different zones, so keep both layouts around.
+        if len(_paper_background_cache) >= 4:
+            _paper_background_cache.clear()
+        background = _render_paper_background(key[0], area_rect, top_area)
+        _paper_background_cache[key] = background
+    surface.blit(background, (0, 0))
 
 
 def draw_health_bar(surface, x, y, health, max_health, width=230, height=26):